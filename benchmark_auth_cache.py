@@ -0,0 +1,76 @@
+"""
+Cost of resolving the user of a JWT: a primary key query (JWTAuthentication)
+against a hit of the shared cache (CachedJWTAuthentication), which reads the
+user's version and the cached user. The database is a temporary file, the
+cache is the configured default cache (file based in a temporary directory
+unless CACHE_BACKEND is set).
+
+    python benchmark_auth_cache.py --requests 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import django
+
+
+def measure(function, requests: int) -> float:
+    """Microseconds per call"""
+
+    function()
+    started = time.perf_counter()
+    for _ in range(requests):
+        function()
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    with tempfile.TemporaryDirectory() as directory:
+        from django.conf import settings
+
+        if "CACHE_BACKEND" not in os.environ:
+            settings.CACHES["default"]["LOCATION"] = os.path.join(directory, "cache")
+        django.setup()
+
+        from django.db import connection
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from src.apps.users.models import CustomUser
+        from src.base.authentication import CachedJWTAuthentication
+
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(
+            directory, "benchmark.sqlite3"
+        )
+        connection.creation.create_test_db(verbosity=0)
+        try:
+            user = CustomUser.objects.create_user(
+                email="benchmark@example.com", password="benchmark"
+            )
+            token = AccessToken.for_user(user)
+            uncached, cached = JWTAuthentication(), CachedJWTAuthentication()
+
+            print(f"{'backend':<50}{'us/request':>12}")
+            print(
+                f"{'primary key query':<50}"
+                f"{measure(lambda: uncached.get_user(token), args.requests):>12.1f}"
+            )
+            print(
+                f"{settings.CACHES['default']['BACKEND']:<50}"
+                f"{measure(lambda: cached.get_user(token), args.requests):>12.1f}"
+            )
+        finally:
+            connection.creation.destroy_test_db(
+                connection.settings_dict["NAME"], verbosity=0
+            )
+
+
+if __name__ == "__main__":
+    main()
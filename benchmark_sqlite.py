@@ -0,0 +1,131 @@
+"""
+Mixed read/write throughput of SQLite database profiles (DATABASE_PROFILES in
+config/settings.py) with several worker processes, like gunicorn workers.
+
+A read is a "popular recipes" page plus a count, a write records a view: reads
+the recipe, inserts a view row and increments the counter in one transaction.
+Every operation ends like a request: close_old_connections() closes the
+connection unless CONN_MAX_AGE keeps it. The database is a temporary file.
+
+    python benchmark_sqlite.py --workers 4 --duration 10 --write-ratio 0.2
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from config.settings import DATABASE_PROFILES
+
+
+def create_database(name: str, recipes: int) -> None:
+    with sqlite3.connect(name) as conn:
+        conn.execute(
+            "CREATE TABLE bench_recipe "
+            "(id INTEGER PRIMARY KEY, title TEXT NOT NULL, views INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE bench_view (id INTEGER PRIMARY KEY, "
+            "recipe_id INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX bench_view_recipe ON bench_view (recipe_id)")
+        conn.executemany(
+            "INSERT INTO bench_recipe (id, title, views) VALUES (?, ?, 0)",
+            [(number, f"recipe {number}") for number in range(1, recipes + 1)],
+        )
+
+
+def run_worker(database: dict, args: argparse.Namespace, seed: int) -> tuple:
+    import django
+    from django.conf import settings
+
+    settings.configure(DATABASES={"default": database}, USE_TZ=True)
+    django.setup()
+
+    from django.db import OperationalError, close_old_connections, connection
+    from django.db.transaction import atomic
+
+    generator = random.Random(seed)
+    reads = writes = errors = 0
+    deadline = time.monotonic() + args.duration
+
+    while time.monotonic() < deadline:
+        recipe_id = generator.randint(1, args.recipes)
+        try:
+            if generator.random() < args.write_ratio:
+                with atomic(), connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT views FROM bench_recipe WHERE id = %s", [recipe_id]
+                    )
+                    cursor.execute(
+                        "INSERT INTO bench_view (recipe_id, created_at) "
+                        "VALUES (%s, %s)",
+                        [recipe_id, time.time()],
+                    )
+                    cursor.execute(
+                        "UPDATE bench_recipe SET views = views + 1 WHERE id = %s",
+                        [recipe_id],
+                    )
+                writes += 1
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT id, title, views FROM bench_recipe "
+                        "ORDER BY views DESC, id LIMIT 20"
+                    )
+                    cursor.fetchall()
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM bench_view WHERE recipe_id = %s",
+                        [recipe_id],
+                    )
+                    cursor.fetchone()
+                reads += 1
+        except OperationalError:
+            errors += 1
+        finally:
+            close_old_connections()
+
+    connection.close()
+    return reads, writes, errors
+
+
+def run_profile(profile: str, args: argparse.Namespace) -> tuple:
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, "benchmark.sqlite3")
+        create_database(name, args.recipes)
+        database = {**DATABASE_PROFILES[profile], "NAME": name}
+
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(args.workers) as pool:
+            results = pool.starmap(
+                run_worker,
+                [(database, args, seed) for seed in range(args.workers)],
+            )
+    return tuple(map(sum, zip(*results)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(DATABASE_PROFILES), metavar="PROFILE"
+    )
+    args = parser.parse_args()
+
+    print(f"{'profile':<20}{'reads/s':>10}{'writes/s':>10}{'errors':>10}")
+    for profile in args.profiles:
+        reads, writes, errors = run_profile(profile, args)
+        print(
+            f"{profile:<20}{reads / args.duration:>10.0f}"
+            f"{writes / args.duration:>10.0f}{errors:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     "src.apps.view",
     "src.apps.follow",
     "src.apps.feed",
+    "src.apps.search",
 ]
 
 MIDDLEWARE = [
@@ -80,7 +81,7 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.TokenAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "src.base.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_THROTTLE_RATES": {"reactions": "100/second"},
@@ -138,10 +139,59 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 # Database
 
-DATABASES = {
+# DATABASE_PROFILE=sqlite-production is meant for several gunicorn workers:
+# WAL lets readers run alongside a writer, writers wait for the lock instead of
+# failing with "database is locked", connections are kept between requests
+
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # KiB
+    "busy_timeout": 5000,  # ms
+    "temp_store": "MEMORY",
+}
+
+DATABASE_PROFILES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+    },
+    "sqlite-production": {
+        "ENGINE": "src.base.sqlite",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pragmas": SQLITE_PRODUCTION_PRAGMAS,
+            "transaction_mode": "IMMEDIATE",
+        },
+    },
+}
+
+DATABASES = {
+    "default": DATABASE_PROFILES[config("DATABASE_PROFILE", default="default")],
+}
+
+# Cache
+
+# Shared by all worker processes: cached users and recipe details are
+# invalidated by bumping version keys, which every worker has to see. For
+# several hosts set CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# and CACHE_LOCATION=redis://<host>:6379. The file based cache culls entries
+# over MAX_ENTRIES (300 by default), evicted version keys restart from a new
+# version, so culling only costs misses.
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=str(BASE_DIR / ".django_cache")),
+        "OPTIONS": {
+            "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=10_000, cast=int),
+        },
     }
 }
 
@@ -247,10 +297,36 @@ COMMENT_PAGE_SIZE = 10
 FEED_PAGE_SIZE = 5
 FOLLOWER_PAGE_SIZE = 10
 USER_LIST_PAGE_SIZE = 10
+SEARCH_PAGE_SIZE = 10
 
 # Variables
 
 ACTIVITY_INTERVAL = 30
+FEED_TIMELINE_SIZE = 500
+REACTIONS_BATCH_MAX_OBJECTS = 100
+COMMENT_TREE_MAX_DEPTH = 5
+INGREDIENT_CACHE_SIZE = 10_000
+INGREDIENT_CACHE_TTL = 600
+INGREDIENT_INDEX_TTL = 300
+INGREDIENT_SEARCH_MAX_NAMES = 50
+INGREDIENT_SEARCH_MAX_MISSING = 5
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_CACHED_PREFIX_LENGTH = 3
+AUTOCOMPLETE_TTL = 300
+RECIPE_DETAIL_CACHE_TTL = 600
+RECIPE_SIMILAR_COUNT = 10
+FEED_AFFINITY_TAGS = 50
+FEED_FOR_YOU_CANDIDATES = 2000
+FEED_FOR_YOU_FOLLOW_WEIGHT = 2.0
+FEED_FOR_YOU_TAG_WEIGHT = 1.0
+FEED_FOR_YOU_HALF_LIFE = 48
+USERNAME_PROBE_BATCH = 20
+AUTH_USER_CACHE_TTL = 60
+FOLLOW_SUGGESTIONS_COUNT = 20
+FOLLOW_SUGGESTIONS_TAG_AUTHORS = 50
+FOLLOW_SUGGESTIONS_MUTUAL_WEIGHT = 1.0
+FOLLOW_SUGGESTIONS_TAG_WEIGHT = 2.0
+FOLLOW_BULK_MAX_AUTHORS = 100
 
 # Shorthand
 
@@ -261,6 +337,14 @@ SHORT_BIO_SYMBOLS = 50
 
 TIME_FROM_VIEW_RECIPE = 20
 
+# Buffered recipe views
+
+VIEW_BUFFER_ENABLED = config("VIEW_BUFFER_ENABLED", default=True, cast=bool)
+VIEW_BUFFER_SIZE = 100
+VIEW_BUFFER_FLUSH_INTERVAL = 5
+VIEW_BUFFER_MAX_PENDING = 10_000
+VIEW_DEDUP_MAX_KEYS = 100_000
+
 # Regex for custom user
 
 REGEX = r"^[a-zA-Zа-яА-Я\s\-\‘\u00C0-\u017F]+$"
@@ -13,6 +13,8 @@ DATABASES = {
     }
 }
 
+VIEW_BUFFER_ENABLED = False
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
@@ -9,4 +9,5 @@ urlpatterns = [
     path("", include("src.apps.recipes.urls")),
     path("", include("src.apps.reactions.urls")),
     path("", include("src.apps.comments.urls")),
+    path("", include("src.apps.search.urls")),
 ]
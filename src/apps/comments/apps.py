@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CommentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.apps.comments"
+
+    def ready(self):
+        from . import signals  # noqa: F401
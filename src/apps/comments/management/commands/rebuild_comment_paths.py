@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.comments.services import rebuild_comment_paths
+
+
+class Command(BaseCommand):
+    """
+    Recalculate materialized paths of comments used by the threaded mode.
+
+    Should be run after loading fixtures or creating comments bypassing the API.
+    """
+
+    help = "Rebuild materialized paths of comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of comments updated per query",
+        )
+
+    def handle(self, *args, **options):
+        updated = rebuild_comment_paths(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt paths of {updated} comments"))
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:30
+
+from django.db import migrations, models
+
+
+def fill_comment_paths(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    paths = {}
+    comments = list(
+        Comment.objects.order_by("pk").only("pk", "parent_id", "path", "depth")
+    )
+    for comment in comments:
+        if comment.parent_id in paths:
+            parent_path, parent_depth = paths[comment.parent_id]
+            comment.path = f"{parent_path}{comment.parent_id:010d}/"
+            comment.depth = parent_depth + 1
+        paths[comment.pk] = (comment.path, comment.depth)
+    Comment.objects.bulk_update(comments, ["path", "depth"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0003_comment_updated_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.TextField(blank=True, db_index=True, default=""),
+        ),
+        migrations.RunPython(fill_comment_paths, migrations.RunPython.noop),
+    ]
@@ -18,6 +18,8 @@ class Comment(models.Model):
         • parent (ForeignKey): initial comment, on which a comment was made.
         • reactions (GenericRelation): reaction for a comment.
         • updated_date (DateTimeField): comment update date.
+        • path (TextField): materialized path, zero-padded ids of ancestors.
+        • depth (PositiveSmallIntegerField): nesting level, 0 for root comments.
     """
 
     author = models.ForeignKey(
@@ -34,6 +36,8 @@ class Comment(models.Model):
     parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True)
     reactions = GenericRelation(Reaction, related_query_name="comment_reactions")
     updated_date = models.DateTimeField(auto_now=True)
+    path = models.TextField(default="", blank=True, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0)
 
     def __str__(self):
         return f"{self.author.username} comment to recipe {self.recipe.slug}"
@@ -1,4 +1,4 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
 from src.apps.comments.models import Comment
 from src.apps.users.serializers import AuthorInRecipeSerializer
@@ -16,6 +16,23 @@ class CommentListSerializer(ModelSerializer):
         fields = ("id", "author", "text", "pub_date", "updated_date")
 
 
+class CommentTreeSerializer(CommentListSerializer):
+    """
+    Serializer for viewing a comment with its replies.
+    Replies grouped by parent id are passed in the "replies" context.
+    """
+
+    replies = SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = CommentListSerializer.Meta.fields + ("parent", "depth", "replies")
+
+    def get_replies(self, obj):
+        replies = self.context.get("replies", {}).get(obj.id, [])
+        return CommentTreeSerializer(replies, many=True, context=self.context).data
+
+
 class CommentCreateSerializer(ModelSerializer):
     """
     Serializer for creating and updating comments
@@ -0,0 +1,121 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Substr
+
+from .models import Comment
+
+PATH_SEGMENT_LENGTH = 10
+PATH_SEPARATOR = "/"
+
+
+def get_path_segment(comment_id: int) -> str:
+    """Zero-padded id, so that paths are sorted in the order of ids"""
+
+    return f"{comment_id:0{PATH_SEGMENT_LENGTH}d}{PATH_SEPARATOR}"
+
+
+def get_subtree_prefix(comment: Comment) -> str:
+    """Common path prefix of all replies to the comment"""
+
+    return comment.path + get_path_segment(comment.id)
+
+
+def subtree_filter(comment: Comment) -> Q:
+    """
+    Replies to the comment on all levels.
+    A range on the path is used instead of LIKE, so the index on path is used.
+    """
+
+    prefix = get_subtree_prefix(comment)
+    return Q(path__gte=prefix, path__lt=prefix[:-1] + chr(ord(PATH_SEPARATOR) + 1))
+
+
+def create_comment(
+    author, recipe, text: str, parent: Optional[Comment] = None
+) -> Comment:
+    """Create a comment with a materialized path built from its parent"""
+
+    return Comment.objects.create(
+        author=author,
+        recipe=recipe,
+        parent=parent,
+        text=text,
+        path=get_subtree_prefix(parent) if parent else "",
+        depth=parent.depth + 1 if parent else 0,
+    )
+
+
+def detach_replies(comment: Comment) -> int:
+    """
+    Cut the path of the deleted comment from its replies.
+    Direct replies become root comments, as their parent is set to null.
+    """
+
+    prefix = get_subtree_prefix(comment)
+    return Comment.objects.filter(subtree_filter(comment)).update(
+        path=Substr("path", len(prefix) + 1),
+        depth=F("depth") - comment.depth - 1,
+    )
+
+
+def get_replies(
+    queryset: QuerySet, roots: Iterable[Comment], max_depth: int
+) -> Dict[int, List[Comment]]:
+    """
+    Fetch replies up to max_depth levels below the root comments with one
+    query and group them by parent id.
+    """
+
+    roots = list(roots)
+    if not roots or max_depth < 1:
+        return {}
+
+    query = Q()
+    for root in roots:
+        query |= subtree_filter(root) & Q(depth__lte=root.depth + max_depth)
+
+    replies: Dict[int, List[Comment]] = defaultdict(list)
+    for reply in queryset.filter(query).order_by("pub_date", "id"):
+        replies[reply.parent_id].append(reply)
+    return replies
+
+
+def rebuild_comment_paths(chunk_size: int = 500) -> int:
+    """
+    Recalculate paths and depths of all comments in chunks in order of ids.
+    Parents are created before replies, so they are already rebuilt when
+    their replies are processed.
+    """
+
+    updated: int = 0
+    last_id: int = 0
+
+    while True:
+        chunk = list(
+            Comment.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .only("pk", "parent_id", "path", "depth")[:chunk_size]
+        )
+        if not chunk:
+            return updated
+
+        parents = {
+            pk: (path, depth)
+            for pk, path, depth in Comment.objects.filter(
+                pk__in={comment.parent_id for comment in chunk if comment.parent_id}
+            ).values_list("pk", "path", "depth")
+        }
+        for comment in chunk:
+            if comment.parent_id in parents:
+                parent_path, parent_depth = parents[comment.parent_id]
+                comment.path = parent_path + get_path_segment(comment.parent_id)
+                comment.depth = parent_depth + 1
+            else:
+                comment.path, comment.depth = "", 0
+            parents[comment.pk] = (comment.path, comment.depth)
+
+        Comment.objects.bulk_update(chunk, ["path", "depth"])
+        updated += len(chunk)
+        last_id = chunk[-1].pk
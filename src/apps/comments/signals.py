@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Comment
+from .services import detach_replies
+
+
+@receiver(post_delete, sender=Comment)
+def detach_deleted_comment_replies(sender, instance, **kwargs):
+    detach_replies(instance)
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
@@ -23,6 +24,7 @@ from src.base.code_text import (
     COMMENT_NOT_FOUND,
     COMMENT_SUCCESSFULLY_DELETE,
     CANT_EDIT_COMMENT,
+    INVALID_COMMENT_DEPTH,
 )
 from src.apps.comments.models import Comment
 from src.base.paginators import CommentPagination
@@ -32,7 +34,12 @@ from src.base.permissions import (
 )
 from src.base.services import get_or_none
 from src.apps.recipes.models import Recipe
-from .serializers import CommentListSerializer, CommentCreateSerializer
+from .serializers import (
+    CommentListSerializer,
+    CommentCreateSerializer,
+    CommentTreeSerializer,
+)
+from .services import create_comment, get_replies
 
 
 class CommentViewSet(
@@ -95,6 +102,36 @@ class CommentViewSet(
 
         return super(CommentViewSet, self).get_serializer_class()
 
+    def get_tree_depth(self):
+        try:
+            depth = int(
+                self.request.query_params.get("depth", settings.COMMENT_TREE_MAX_DEPTH)
+            )
+        except ValueError:
+            depth = -1
+        if depth < 0:
+            raise ValidationError(INVALID_COMMENT_DEPTH, code="invalid_depth")
+        return min(depth, settings.COMMENT_TREE_MAX_DEPTH)
+
+    def list(self, request, *args, **kwargs):
+        """Getting comments of a recipe.
+
+        With ?threaded=true a page of root comments is returned, each with
+        its replies nested up to ?depth levels (COMMENT_TREE_MAX_DEPTH at most).
+        """
+
+        if request.query_params.get("threaded") not in ("true", "1"):
+            return super().list(request, *args, **kwargs)
+
+        depth = self.get_tree_depth()
+        queryset = self.get_queryset()
+        roots = self.paginate_queryset(queryset.filter(parent__isnull=True))
+        context = self.get_serializer_context()
+        context["replies"] = get_replies(queryset, roots, depth)
+        serializer = CommentTreeSerializer(roots, many=True, context=context)
+
+        return self.get_paginated_response(serializer.data)
+
     def create(self, request, *args, **kwargs):
         """Creating a comment.
         Comment can be posted on a recipe (indicated by slug in url).
@@ -108,7 +145,7 @@ class CommentViewSet(
         serializer = serializer(data=self.request.data)
         serializer.is_valid(raise_exception=True)
         parent = get_or_none(Comment, id=serializer.data["parent"])
-        comment = Comment.objects.create(
+        comment = create_comment(
             author=request.user,
             recipe=recipe,
             parent=parent,
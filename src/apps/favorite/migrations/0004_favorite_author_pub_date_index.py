@@ -0,0 +1,19 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favorite", "0003_alter_favorite_recipe"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="favorite",
+            index=models.Index(
+                fields=["author", "-pub_date"], name="favorite_fa_author__dc02a0_idx"
+            ),
+        ),
+    ]
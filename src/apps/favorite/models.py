@@ -21,5 +21,10 @@ class Favorite(models.Model):
     )
     pub_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["author", "-pub_date"]),
+        ]
+
     def __str__(self):
         return f"{self.author.username}'s favorite recipe: {self.recipe.title}"
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FeedConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.apps.feed"
+
+    def ready(self):
+        from . import signals  # noqa: F401
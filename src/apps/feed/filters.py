@@ -1,5 +1,7 @@
 from django_filters import rest_framework as filters
 
+from .services import get_timeline_recipe_ids
+
 
 class FeedFilter(filters.FilterSet):
     username = filters.CharFilter(field_name="author", lookup_expr="username")
@@ -7,9 +9,6 @@ class FeedFilter(filters.FilterSet):
 
     def filter_by_subscription(self, queryset, name, value):
         if value == "subscriptions":
-            user = self.request.user
-            users_subscribed_to = user.follower.all().values_list(
-                "author_id", flat=True
-            )
-            return queryset.filter(author__in=users_subscribed_to)
+            recipe_ids = get_timeline_recipe_ids(self.request.user.id)
+            return queryset.filter(id__in=recipe_ids)
         return queryset
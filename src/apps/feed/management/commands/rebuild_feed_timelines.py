@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.feed.services import rebuild_timelines
+
+
+class Command(BaseCommand):
+    """
+    Rebuild precomputed subscriptions timelines from Follow and Recipe tables.
+    """
+
+    help = "Rebuild subscriptions timelines of all users"
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_timelines()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt timelines of {rebuilt} users"))
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.apps.feed.ranking import rebuild_tag_affinities
+
+
+class Command(BaseCommand):
+    """
+    Recompute tag affinities of users from favorites and reactions.
+
+    Should be run periodically (e.g. nightly), the "for you" feed only reads
+    the stored affinities.
+    """
+
+    help = "Rebuild tag affinities used by the personal feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of users whose affinities are computed at once",
+        )
+        parser.add_argument(
+            "--tags",
+            type=int,
+            default=settings.FEED_AFFINITY_TAGS,
+            help="Number of tags stored per user",
+        )
+
+    def handle(self, *args, **options):
+        stored = rebuild_tag_affinities(
+            chunk_size=options["chunk_size"], tags=options["tags"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stored {stored} tag affinities"))
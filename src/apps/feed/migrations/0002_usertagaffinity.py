@@ -0,0 +1,71 @@
+# Generated by Django 4.2.6 on 2026-10-18 20:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        (
+            "taggit",
+            "0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx",
+        ),
+        ("feed", "0001_timelineentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTagAffinity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("weight", models.FloatField()),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="taggit.tag",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "User tag affinity",
+                "verbose_name_plural": "User tag affinities",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-weight"],
+                        name="feed_userta_user_id_4f5086_idx",
+                    ),
+                    models.Index(
+                        fields=["computed_at"], name="feed_userta_compute_827fb2_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="usertagaffinity",
+            constraint=models.UniqueConstraint(
+                fields=("user", "tag"), name="unique_user_tag_affinity"
+            ),
+        ),
+    ]
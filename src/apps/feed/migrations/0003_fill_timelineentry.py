@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def fill_timelines(apps, schema_editor):
+    Follow = apps.get_model("follow", "Follow")
+    Recipe = apps.get_model("recipes", "Recipe")
+    TimelineEntry = apps.get_model("feed", "TimelineEntry")
+
+    user_ids = Follow.objects.order_by().values_list("user_id", flat=True).distinct()
+    for user_id in user_ids.iterator():
+        recipes = (
+            Recipe.objects.filter(author__following__user_id=user_id)
+            .order_by("-pub_date")
+            .values_list("id", "author_id", "pub_date")[: settings.FEED_TIMELINE_SIZE]
+        )
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    user_id=user_id,
+                    recipe_id=recipe_id,
+                    author_id=author_id,
+                    pub_date=pub_date,
+                )
+                for recipe_id, author_id, pub_date in recipes
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0002_usertagaffinity"),
+        ("follow", "0002_follow_same_follower_constraint"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
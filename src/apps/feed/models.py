@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.db import models
+
+
+class TimelineEntry(models.Model):
+    """
+    Entry of a precomputed subscriptions timeline, filled on write (fan-out)
+    when a followed author publishes a recipe.
+
+    Attrs:
+    • user (ForeignKey): owner of the timeline.
+    • recipe (ForeignKey): recipe in the timeline.
+    • author (ForeignKey): author of the recipe.
+    • pub_date (DateTimeField): recipe publication date.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="timeline"
+    )
+    recipe = models.ForeignKey(
+        "recipes.Recipe", on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Timeline entry"
+        verbose_name_plural = "Timeline entries"
+        indexes = [
+            models.Index(fields=["user", "-pub_date"]),
+            models.Index(fields=["user", "author"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "recipe"], name="unique_timeline_entry"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe_id} in timeline of {self.user_id}"
+
+
+class UserTagAffinity(models.Model):
+    """
+    Precomputed affinity of a user to a tag by tags of recipes the user
+    favorited or reacted to. Rebuilt by the `rebuild_tag_affinities`
+    management command, used to rank the "for you" feed.
+
+    Attrs:
+    • user (ForeignKey): user the affinity is computed for.
+    • tag (ForeignKey): tag of recipes.
+    • weight (FloatField): affinity relative to the strongest tag of the user.
+    • computed_at (DateTimeField): time of the rebuild that stored the row.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    tag = models.ForeignKey("taggit.Tag", on_delete=models.CASCADE, related_name="+")
+    weight = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "User tag affinity"
+        verbose_name_plural = "User tag affinities"
+        indexes = [
+            models.Index(fields=["user", "-weight"]),
+            models.Index(fields=["computed_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "tag"], name="unique_user_tag_affinity"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ~ {self.tag_id}: {self.weight:.3f}"
@@ -0,0 +1,214 @@
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import QuerySet
+from django.utils import timezone
+from taggit.models import TaggedItem
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from src.apps.recipes.similarity import (
+    build_interaction_matrix,
+    compress,
+    expand_rows,
+    load_pairs,
+    top_per_group,
+)
+from .models import UserTagAffinity
+from .services import get_timeline_recipe_ids
+
+
+def get_recipe_tags():
+    return TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Recipe)
+    )
+
+
+def rebuild_tag_affinities(
+    chunk_size: int = 1000, tags: int = settings.FEED_AFFINITY_TAGS
+) -> int:
+    """
+    Recompute tag affinities of all users in chunks of chunk_size users.
+
+    The affinity of a user to a tag is the sum of interaction weights of the
+    recipes with the tag, divided by the strongest affinity of the user. Only
+    the top tags of every user are upserted, rows of the previous rebuild that
+    were not refreshed are deleted. Returns the number of stored rows.
+    """
+
+    computed_at = timezone.now()
+    matrix = build_interaction_matrix()
+    tagged = load_pairs(get_recipe_tags(), ("object_id", "tag_id"), 5000)
+
+    # recipe → tags rows aligned with the columns of the matrix
+    tagged = tagged[np.isin(tagged[:, 0], matrix.recipe_ids)]
+    recipe_indptr, recipe_tags, _ = compress(
+        np.searchsorted(matrix.recipe_ids, tagged[:, 0]),
+        tagged[:, 1],
+        np.ones(len(tagged)),
+        len(matrix.recipe_ids),
+    )
+    strongest = np.zeros(len(matrix.user_ids))
+    stored: int = 0
+
+    for start in range(0, len(matrix.user_ids), chunk_size):
+        stop = min(start + chunk_size, len(matrix.user_ids))
+        lengths, positions = expand_rows(matrix.user_indptr, np.arange(start, stop))
+        users = np.repeat(np.arange(start, stop), lengths)
+        weights = matrix.user_weights[positions]
+
+        lengths, positions = expand_rows(recipe_indptr, matrix.user_recipes[positions])
+        users = np.repeat(users, lengths)
+        weights = np.repeat(weights, lengths)
+        tag_ids = recipe_tags[positions]
+
+        offset = tag_ids.max(initial=0) + 1
+        cells, cell_index = np.unique(users * offset + tag_ids, return_inverse=True)
+        affinities = np.bincount(cell_index, weights, minlength=len(cells))
+        users, tag_ids = np.divmod(cells, offset)
+        np.maximum.at(strongest, users, affinities)
+        affinities /= strongest[users]
+
+        top = top_per_group(users, affinities, tags)
+        UserTagAffinity.objects.bulk_create(
+            [
+                UserTagAffinity(
+                    user_id=user_id,
+                    tag_id=tag_id,
+                    weight=weight,
+                    computed_at=computed_at,
+                )
+                for user_id, tag_id, weight in zip(
+                    matrix.user_ids[users[top]].tolist(),
+                    tag_ids[top].tolist(),
+                    affinities[top].tolist(),
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "tag"],
+            update_fields=["weight", "computed_at"],
+        )
+        stored += len(top)
+
+    UserTagAffinity.objects.filter(computed_at__lt=computed_at).delete()
+    return stored
+
+
+def get_candidate_ids(
+    user_id: int, tag_ids: List[int], limit: int = settings.FEED_FOR_YOU_CANDIDATES
+) -> List[int]:
+    """
+    At most limit candidate recipes of the "for you" feed: the subscriptions
+    timeline, then the latest recipes with the user's top tags, then the latest
+    recipes to fill the rest.
+    """
+
+    candidates = dict.fromkeys(get_timeline_recipe_ids(user_id)[:limit])
+    if tag_ids and len(candidates) < limit:
+        candidates.update(
+            dict.fromkeys(
+                get_recipe_tags()
+                .filter(tag_id__in=tag_ids)
+                .order_by("-object_id")
+                .values_list("object_id", flat=True)
+                .distinct()[: limit - len(candidates)]
+            )
+        )
+    if len(candidates) < limit:
+        candidates.update(
+            dict.fromkeys(
+                Recipe.objects.order_by("-pub_date").values_list("id", flat=True)[
+                    :limit
+                ]
+            )
+        )
+    return list(candidates)[:limit]
+
+
+def rank_for_you(user_id: int, now: Optional[datetime] = None) -> List[int]:
+    """
+    Ids of candidate recipes ordered by the "for you" score:
+
+        (1 + FOLLOW_WEIGHT * followed + TAG_WEIGHT * affinity) * 0.5 ** (age / half life)
+
+    where affinity is the sum of the user's affinities to the recipe tags.
+    Recipes of the user are excluded.
+    """
+
+    now = now or timezone.now()
+    affinity = dict(
+        UserTagAffinity.objects.filter(user_id=user_id)
+        .order_by("-weight")
+        .values_list("tag_id", "weight")[: settings.FEED_AFFINITY_TAGS]
+    )
+    candidate_ids = get_candidate_ids(user_id, list(affinity))
+    rows = list(
+        Recipe.objects.filter(id__in=candidate_ids)
+        .exclude(author_id=user_id)
+        .order_by("id")
+        .values_list("id", "author_id", "pub_date")
+    )
+    if not rows:
+        return []
+
+    recipe_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    author_ids = np.array([row[1] for row in rows], dtype=np.int64)
+    published = np.array([row[2].timestamp() for row in rows])
+    ages = np.maximum(now.timestamp() - published, 0) / 3600
+    followed = np.isin(
+        author_ids,
+        np.fromiter(
+            Follow.objects.filter(user_id=user_id).values_list("author_id", flat=True),
+            np.int64,
+        ),
+    )
+
+    tag_scores = np.zeros(len(rows))
+    if affinity:
+        tagged = np.array(
+            get_recipe_tags()
+            .filter(object_id__in=recipe_ids.tolist(), tag_id__in=list(affinity))
+            .values_list("object_id", "tag_id"),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        affinity_tags = np.array(sorted(affinity), dtype=np.int64)
+        affinity_weights = np.array([affinity[tag_id] for tag_id in sorted(affinity)])
+        tag_scores = np.bincount(
+            np.searchsorted(recipe_ids, tagged[:, 0]),
+            affinity_weights[np.searchsorted(affinity_tags, tagged[:, 1])],
+            minlength=len(rows),
+        )
+
+    scores = (
+        1
+        + settings.FEED_FOR_YOU_FOLLOW_WEIGHT * followed
+        + settings.FEED_FOR_YOU_TAG_WEIGHT * tag_scores
+    ) * 0.5 ** (ages / settings.FEED_FOR_YOU_HALF_LIFE)
+    return recipe_ids[np.lexsort((-recipe_ids, -scores))].tolist()
+
+
+class RankedRecipes:
+    """
+    Recipes in the given order of ids, sliced by the paginator.
+    Only the recipes of the requested page are fetched from the queryset.
+    """
+
+    def __init__(self, recipe_ids: List[int], queryset: QuerySet):
+        self.recipe_ids = recipe_ids
+        self.queryset = queryset
+
+    def count(self) -> int:
+        return len(self.recipe_ids)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, page: slice) -> List[Recipe]:
+        recipe_ids = self.recipe_ids[page]
+        if not recipe_ids:
+            return []
+        recipes = self.queryset.in_bulk(recipe_ids)
+        return [recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes]
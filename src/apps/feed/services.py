@@ -0,0 +1,105 @@
+from typing import Iterable, List
+
+from django.db.transaction import atomic
+
+from config.settings import FEED_TIMELINE_SIZE
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from .models import TimelineEntry
+
+
+def _timeline_entries(user_ids: Iterable[int], recipes: Iterable[Recipe]) -> list:
+    return [
+        TimelineEntry(
+            user_id=user_id,
+            recipe_id=recipe.id,
+            author_id=recipe.author_id,
+            pub_date=recipe.pub_date,
+        )
+        for user_id in user_ids
+        for recipe in recipes
+    ]
+
+
+def fan_out_recipe(recipe: Recipe, batch_size: int = 1000) -> None:
+    """Push a new recipe into timelines of all followers of its author"""
+
+    follower_ids = Follow.objects.filter(author_id=recipe.author_id).values_list(
+        "user_id", flat=True
+    )
+    TimelineEntry.objects.bulk_create(
+        _timeline_entries(follower_ids.iterator(), [recipe]),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+
+
+def backfill_timeline(user_id: int, author_id: int) -> None:
+    """Add latest recipes of a new followed author to the user's timeline"""
+
+    recipes = (
+        Recipe.objects.filter(author_id=author_id)
+        .only("id", "author_id", "pub_date")
+        .order_by("-pub_date")[:FEED_TIMELINE_SIZE]
+    )
+    TimelineEntry.objects.bulk_create(
+        _timeline_entries([user_id], recipes), ignore_conflicts=True
+    )
+    trim_timeline(user_id)
+
+
+def remove_author_from_timeline(user_id: int, author_id: int) -> None:
+    """Remove recipes of an unfollowed author from the user's timeline"""
+
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+def trim_timeline(user_id: int) -> None:
+    """Keep only FEED_TIMELINE_SIZE latest entries in the user's timeline"""
+
+    cutoff = (
+        TimelineEntry.objects.filter(user_id=user_id)
+        .order_by("-pub_date")
+        .values_list("pub_date", flat=True)[FEED_TIMELINE_SIZE - 1 : FEED_TIMELINE_SIZE]
+        .first()
+    )
+    if cutoff is not None:
+        TimelineEntry.objects.filter(user_id=user_id, pub_date__lt=cutoff).delete()
+
+
+def get_timeline_recipe_ids(user_id: int) -> List[int]:
+    """
+    Return ids of latest recipes in the user's timeline. The timeline is
+    trimmed lazily, when it outgrows FEED_TIMELINE_SIZE.
+    """
+
+    recipe_ids = list(
+        TimelineEntry.objects.filter(user_id=user_id)
+        .order_by("-pub_date")
+        .values_list("recipe_id", flat=True)[: FEED_TIMELINE_SIZE + 1]
+    )
+    if len(recipe_ids) > FEED_TIMELINE_SIZE:
+        trim_timeline(user_id)
+    return recipe_ids[:FEED_TIMELINE_SIZE]
+
+
+def rebuild_timelines() -> int:
+    """
+    Rebuild timelines of all users from Follow, returns number of users.
+    Runs in one transaction, so readers never see emptied timelines.
+    """
+
+    rebuilt = 0
+    with atomic():
+        TimelineEntry.objects.all().delete()
+        user_ids = Follow.objects.values_list("user_id", flat=True).distinct()
+        for user_id in user_ids.iterator():
+            author_ids = Follow.objects.filter(user_id=user_id).values_list(
+                "author_id", flat=True
+            )
+            recipes = Recipe.objects.filter(author_id__in=author_ids).order_by(
+                "-pub_date"
+            )[:FEED_TIMELINE_SIZE]
+            TimelineEntry.objects.bulk_create(_timeline_entries([user_id], recipes))
+            rebuilt += 1
+    return rebuilt
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from .services import backfill_timeline, fan_out_recipe, remove_author_from_timeline
+
+
+@receiver(post_save, sender=Recipe)
+def fan_out_published_recipe(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        fan_out_recipe(instance)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_followed_author(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        backfill_timeline(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def remove_unfollowed_author(sender, instance, **kwargs):
+    remove_author_from_timeline(instance.user_id, instance.author_id)
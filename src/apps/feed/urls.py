@@ -1,8 +1,9 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import FeedUserList
+from .views import FeedUserList, ForYouFeedList
 
 router = DefaultRouter()
 router.register(r"feed", FeedUserList, basename="feed")
+router.register(r"feed/for-you", ForYouFeedList, basename="feed-for-you")
 
 urlpatterns = router.urls
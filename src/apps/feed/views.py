@@ -1,16 +1,13 @@
-from datetime import datetime, timedelta
-
-from django.db.models import Count, F, Q, Prefetch
-from django.utils.timezone import make_aware
+from django.db.models import F, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets, mixins
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
-from config.settings import ACTIVITY_INTERVAL
 from src.apps.favorite.models import Favorite
 from src.apps.recipes.models import Recipe
-from src.base.paginators import FeedPagination
+from src.base.paginators import FeedPagination, ForYouPagination
 from .filters import FeedFilter
+from .ranking import RankedRecipes, rank_for_you
 from .serializers import FeedSerializer
 
 
@@ -30,15 +27,12 @@ class FeedUserList(mixins.ListModelMixin, viewsets.GenericViewSet):
     def get_queryset(self):
         """
         Get all posts with sorting by activity_count, filtering by subs and
-        username
+        username. Counters come from RecipeStats with an inner join, so
+        ?ordering=-activity_count is an index range scan over RecipeStats.
         """
 
-        last_month_start = make_aware(
-            datetime.now() - timedelta(days=ACTIVITY_INTERVAL)
-        )
-
         queryset = (
-            Recipe.objects.all()
+            Recipe.objects.filter(stats__isnull=False)
             .only(
                 "id",
                 "title",
@@ -69,27 +63,11 @@ class FeedUserList(mixins.ListModelMixin, viewsets.GenericViewSet):
                 ),
             )
             .annotate(
-                latest_comments_count=Count(
-                    "comments",
-                    filter=Q(comments__pub_date__gte=last_month_start),
-                    distinct=True,
-                ),
-                latest_views_count=Count(
-                    "views",
-                    filter=Q(views__created_at__gte=last_month_start),
-                    distinct=True,
-                ),
-                latest_reactions_count=Count(
-                    "reactions",
-                    filter=Q(reactions__pub_date__gte=last_month_start),
-                    distinct=True,
-                ),
-                comments_count=Count("comments", distinct=True),
-                views_count=Count("views", distinct=True),
-                reactions_count=Count("reactions", distinct=True),
-                activity_count=F("latest_comments_count")
-                + F("latest_views_count")
-                + F("latest_reactions_count"),
+                comments_count=F("stats__comments_count"),
+                views_count=F("stats__views_count"),
+                reactions_count=F("stats__reactions_count"),
+                activity_count=F("stats__activity_count"),
+                stats_id=F("stats__recipe_id"),
             )
         )
         return queryset
@@ -105,3 +83,29 @@ class FeedUserList(mixins.ListModelMixin, viewsets.GenericViewSet):
         else:
             self.permission_classes = [AllowAny]
         return super(FeedUserList, self).get_permissions()
+
+
+class ForYouFeedList(FeedUserList):
+    """
+    Personal feed ranked by follows of the user, the user's affinity to recipe
+    tags and recency
+    """
+
+    pagination_class = ForYouPagination
+    filter_backends = []
+
+    def get_permissions(self):
+        self.permission_classes = [IsAuthenticated]
+        return super(FeedUserList, self).get_permissions()
+
+    def list(self, request, *args, **kwargs):
+        """Getting a page of the personal feed.
+
+        Tag affinities are precomputed by the `rebuild_tag_affinities` command.
+        """
+
+        results = RankedRecipes(rank_for_you(request.user.id), self.get_queryset())
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
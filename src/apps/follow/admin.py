@@ -1,8 +1,14 @@
 from django.contrib import admin
 
-from .models import Follow
+from .models import Follow, FollowSuggestion
 
 
 @admin.register(Follow)
 class FollowAdmin(admin.ModelAdmin):
     list_display = ["author", "user"]
+
+
+@admin.register(FollowSuggestion)
+class FollowSuggestionAdmin(admin.ModelAdmin):
+    list_display = ["user", "suggested_user", "score", "mutual_count", "computed_at"]
+    raw_id_fields = ["user", "suggested_user"]
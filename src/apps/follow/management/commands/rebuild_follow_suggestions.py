@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.apps.follow.suggestions import rebuild_follow_suggestions
+
+
+class Command(BaseCommand):
+    """
+    Recompute "who to follow" suggestions from the follow graph and tag
+    affinities of users.
+
+    Should be run periodically (e.g. nightly, after rebuild_tag_affinities),
+    the suggestions endpoint only reads the stored rows.
+    """
+
+    help = "Rebuild who to follow suggestions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of users whose suggestions are computed at once",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=settings.FOLLOW_SUGGESTIONS_COUNT,
+            help="Number of suggestions stored per user",
+        )
+
+    def handle(self, *args, **options):
+        stored = rebuild_follow_suggestions(
+            chunk_size=options["chunk_size"], limit=options["limit"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stored {stored} suggestions"))
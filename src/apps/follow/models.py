@@ -40,3 +40,47 @@ class Follow(models.Model):
 
     def __str__(self):
         return f"{self.user} подписан на {self.author}"
+
+
+class FollowSuggestion(models.Model):
+    """
+    Precomputed "who to follow" suggestion. Rebuilt by the
+    `rebuild_follow_suggestions` management command from the follow graph
+    and tag affinities of users.
+
+    Attrs:
+    • user (ForeignKey): user the suggestion is computed for.
+    • suggested_user (ForeignKey): author suggested to follow.
+    • score (FloatField): rank of the suggestion, higher is better.
+    • mutual_count (PositiveIntegerField): count of authors the user follows,
+      who follow the suggested author.
+    • computed_at (DateTimeField): time of the rebuild that stored the row.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="follow_suggestions",
+    )
+    suggested_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    score = models.FloatField()
+    mutual_count = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Follow suggestion"
+        verbose_name_plural = "Follow suggestions"
+        indexes = [
+            models.Index(fields=["user", "-score"]),
+            models.Index(fields=["computed_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "suggested_user"], name="unique_follow_suggestion"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} → {self.suggested_user_id}: {self.score:.3f}"
@@ -1,8 +1,7 @@
 from django.conf import settings
 from rest_framework import serializers
 
-from src.base.code_text import ALREADY_SUBSCRIBED_TO_THIS_AUTHOR
-from src.apps.follow.models import Follow
+from src.apps.follow.models import Follow, FollowSuggestion
 from src.apps.users.models import CustomUser
 
 
@@ -22,6 +21,7 @@ class UserFollowerSerializer(serializers.ModelSerializer):
 class FollowListSerializer(serializers.ModelSerializer):
     author = UserFollowerSerializer()
     subscribers_count = serializers.IntegerField()
+    subscriptions_count = serializers.IntegerField()
 
     class Meta:
         model = Follow
@@ -29,19 +29,35 @@ class FollowListSerializer(serializers.ModelSerializer):
             "id",
             "author",
             "subscribers_count",
+            "subscriptions_count",
         )
 
 
 class FollowerListSerializer(serializers.ModelSerializer):
     user = UserFollowerSerializer()
     subscribers_count = serializers.IntegerField()
+    subscriptions_count = serializers.IntegerField()
 
     class Meta:
         model = Follow
-        fields = ("id", "user", "subscribers_count")
+        fields = ("id", "user", "subscribers_count", "subscriptions_count")
+
+
+class FollowSuggestionSerializer(serializers.ModelSerializer):
+    suggested_user = UserFollowerSerializer()
+    subscribers_count = serializers.IntegerField()
+
+    class Meta:
+        model = FollowSuggestion
+        fields = ("suggested_user", "subscribers_count", "mutual_count", "score")
 
 
 class FollowCreateSerializer(serializers.ModelSerializer):
+    """
+    Request body of subscribe and unsubscribe for the schema, the author is
+    validated by SubscribeViewSet
+    """
+
     author = serializers.SlugRelatedField(
         slug_field="username", queryset=CustomUser.objects.all()
     )
@@ -59,21 +75,3 @@ class FollowCreateSerializer(serializers.ModelSerializer):
         )
         model = Follow
         extra_kwargs = {"created_at": {"read_only": True}}
-
-    def validate(self, data):
-        user = self.context["request"].user
-        author = data.get("author")
-
-        if not CustomUser.objects.filter(username=author).exists():
-            raise serializers.ValidationError({"message": "Автор не найден"})
-
-        if user == author:
-            raise serializers.ValidationError("Нельзя подписаться на самого себя.")
-
-        if Follow.objects.filter(user=user, author=author).exists():
-            raise serializers.ValidationError(
-                ALREADY_SUBSCRIBED_TO_THIS_AUTHOR,
-                code="already_subscribed_to_author",
-            )
-
-        return data
@@ -0,0 +1,76 @@
+from typing import Iterable, List
+
+from django.db import connection
+from django.db.transaction import atomic
+from django.utils import timezone
+
+from src.apps.feed.services import backfill_timeline, remove_author_from_timeline
+from src.apps.users.models import CustomUser
+from src.apps.users.services import update_follow_stats
+from .models import Follow
+
+
+def _placeholders(values: list) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def follow_authors(user_id: int, usernames: Iterable[str]) -> List[int]:
+    """
+    Subscribe the user to authors with the given usernames with a single
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING statement. Unknown
+    usernames, the user and existing subscriptions are skipped.
+
+    No Follow instance is saved, so post_save receivers do not run and the
+    timeline and counters are updated here. Returns ids of new authors.
+    """
+
+    usernames = list(dict.fromkeys(usernames))
+    if not usernames:
+        return []
+
+    follow_table = connection.ops.quote_name(Follow._meta.db_table)
+    user_table = connection.ops.quote_name(CustomUser._meta.db_table)
+    created_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    with atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {follow_table} (user_id, author_id, created_at) "
+            f"SELECT %s, id, %s FROM {user_table} "
+            f"WHERE username IN ({_placeholders(usernames)}) AND id <> %s "
+            "ON CONFLICT (user_id, author_id) DO NOTHING RETURNING author_id",
+            [user_id, created_at, *usernames, user_id],
+        )
+        author_ids = [row[0] for row in cursor.fetchall()]
+
+        update_follow_stats(user_id, author_ids, 1)
+        for author_id in author_ids:
+            backfill_timeline(user_id, author_id)
+    return author_ids
+
+
+def unfollow_authors(user_id: int, usernames: Iterable[str]) -> List[int]:
+    """
+    Unsubscribe the user from authors with the given usernames with a single
+    DELETE ... RETURNING statement, updates the timeline and counters like
+    follow_authors. Returns ids of authors the user was subscribed to.
+    """
+
+    usernames = list(dict.fromkeys(usernames))
+    if not usernames:
+        return []
+
+    follow_table = connection.ops.quote_name(Follow._meta.db_table)
+    user_table = connection.ops.quote_name(CustomUser._meta.db_table)
+    with atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {follow_table} WHERE user_id = %s AND author_id IN "
+            f"(SELECT id FROM {user_table} "
+            f"WHERE username IN ({_placeholders(usernames)})) "
+            "RETURNING author_id",
+            [user_id, *usernames],
+        )
+        author_ids = [row[0] for row in cursor.fetchall()]
+
+        update_follow_stats(user_id, author_ids, -1)
+        for author_id in author_ids:
+            remove_author_from_timeline(user_id, author_id)
+    return author_ids
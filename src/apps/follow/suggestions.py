@@ -0,0 +1,225 @@
+from typing import NamedTuple, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from src.apps.feed.models import UserTagAffinity
+from src.apps.feed.ranking import get_recipe_tags
+from src.apps.recipes.models import RecipeStats
+from src.apps.recipes.similarity import (
+    compress,
+    expand_rows,
+    load_pairs,
+    top_per_group,
+)
+from .models import Follow, FollowSuggestion
+
+
+class FollowGraph(NamedTuple):
+    """
+    Follow graph and popular authors of tags over a common index of users,
+    stored in CSR layout.
+
+    Attrs:
+    • user_ids (ndarray): user id of every index.
+    • follow_indptr, follow_authors (ndarray): authors followed by every user.
+    • affinity_indptr, affinity_tags, affinity_weights (ndarray): tag
+      affinities of every user, tags are rows of the tag arrays.
+    • tag_indptr, tag_authors, tag_popularity (ndarray): popular authors of
+      every tag and their popularity relative to the top author of the tag.
+    """
+
+    user_ids: np.ndarray
+    follow_indptr: np.ndarray
+    follow_authors: np.ndarray
+    affinity_indptr: np.ndarray
+    affinity_tags: np.ndarray
+    affinity_weights: np.ndarray
+    tag_indptr: np.ndarray
+    tag_authors: np.ndarray
+    tag_popularity: np.ndarray
+
+
+def get_tag_authors(
+    chunk_size: int = 5000, authors: int = settings.FOLLOW_SUGGESTIONS_TAG_AUTHORS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The most popular authors of every tag: popularity of an author is the
+    count of favorites of the author's recipes with the tag, relative to the
+    top author of the tag. Returns tag ids, author ids and popularities.
+    """
+
+    favorited = load_pairs(
+        RecipeStats.objects.filter(favorites_count__gt=0),
+        ("recipe_id", "recipe__author_id", "favorites_count"),
+        chunk_size,
+    )
+    tagged = load_pairs(get_recipe_tags(), ("object_id", "tag_id"), chunk_size)
+    tagged = tagged[np.isin(tagged[:, 0], favorited[:, 0])]
+    recipes = favorited[np.searchsorted(favorited[:, 0], tagged[:, 0])]
+
+    offset = recipes[:, 1].max(initial=0) + 1
+    cells, cell_index = np.unique(
+        tagged[:, 1] * offset + recipes[:, 1], return_inverse=True
+    )
+    popularity = np.bincount(cell_index, recipes[:, 2], minlength=len(cells))
+    tag_ids, author_ids = np.divmod(cells, offset)
+
+    top = top_per_group(tag_ids, popularity, authors)
+    tag_ids, author_ids, popularity = tag_ids[top], author_ids[top], popularity[top]
+    _, tag_starts, tag_index = np.unique(
+        tag_ids, return_index=True, return_inverse=True
+    )
+    return tag_ids, author_ids, popularity / popularity[tag_starts][tag_index]
+
+
+def build_follow_graph(chunk_size: int = 5000) -> FollowGraph:
+    """
+    Load follows, tag affinities of users and popular authors of tags into
+    integer CSR arrays indexed by users.
+    """
+
+    edges = load_pairs(Follow.objects.all(), ("user_id", "author_id"), chunk_size)
+    affinities = load_pairs(
+        UserTagAffinity.objects.all(),
+        ("user_id", "tag_id", "weight"),
+        chunk_size,
+        np.float64,
+    )
+    tag_ids, author_ids, popularity = get_tag_authors(chunk_size)
+
+    affinities = affinities[np.isin(affinities[:, 1], tag_ids)]
+    affinity_users = affinities[:, 0].astype(np.int64)
+    affinity_tag_ids = affinities[:, 1].astype(np.int64)
+
+    user_ids = np.unique(np.concatenate([edges.ravel(), affinity_users, author_ids]))
+    tags, tag_index = np.unique(tag_ids, return_inverse=True)
+
+    follow_indptr, follow_authors, _ = compress(
+        np.searchsorted(user_ids, edges[:, 0]),
+        np.searchsorted(user_ids, edges[:, 1]),
+        np.ones(len(edges)),
+        len(user_ids),
+    )
+    affinity_indptr, affinity_tags, affinity_weights = compress(
+        np.searchsorted(user_ids, affinity_users),
+        np.searchsorted(tags, affinity_tag_ids),
+        affinities[:, 2],
+        len(user_ids),
+    )
+    tag_indptr, tag_authors, tag_popularity = compress(
+        tag_index, np.searchsorted(user_ids, author_ids), popularity, len(tags)
+    )
+    return FollowGraph(
+        user_ids,
+        follow_indptr,
+        follow_authors,
+        affinity_indptr,
+        affinity_tags,
+        affinity_weights,
+        tag_indptr,
+        tag_authors,
+        tag_popularity,
+    )
+
+
+def compute_suggestions(
+    graph: FollowGraph, rows: np.ndarray, limit: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top suggestions for the given rows of users, scored as
+
+        MUTUAL_WEIGHT * mutual + TAG_WEIGHT * sum(affinity * popularity)
+
+    where mutual is the count of followed authors, who follow the candidate
+    (friends of friends), and the sum runs over the user's tags the candidate
+    is a popular author of. Users themselves and authors they already follow
+    are skipped. Returns user ids, suggested ids, scores and mutual counts.
+    """
+
+    size = len(graph.user_ids)
+
+    lengths, positions = expand_rows(graph.follow_indptr, rows)
+    users = np.repeat(rows, lengths)
+    followed = graph.follow_authors[positions]
+    followed_cells = users * size + followed
+
+    lengths, positions = expand_rows(graph.follow_indptr, followed)
+    mutual_cells = np.repeat(users, lengths) * size + graph.follow_authors[positions]
+
+    lengths, positions = expand_rows(graph.affinity_indptr, rows)
+    users = np.repeat(rows, lengths)
+    weights = graph.affinity_weights[positions]
+    lengths, positions = expand_rows(graph.tag_indptr, graph.affinity_tags[positions])
+    tag_cells = np.repeat(users, lengths) * size + graph.tag_authors[positions]
+    tag_scores = np.repeat(weights, lengths) * graph.tag_popularity[positions]
+
+    cells, cell_index = np.unique(
+        np.concatenate([mutual_cells, tag_cells]), return_inverse=True
+    )
+    mutual = np.bincount(cell_index[: len(mutual_cells)], minlength=len(cells))
+    scores = settings.FOLLOW_SUGGESTIONS_MUTUAL_WEIGHT * mutual
+    scores = scores + settings.FOLLOW_SUGGESTIONS_TAG_WEIGHT * np.bincount(
+        cell_index[len(mutual_cells) :], tag_scores, minlength=len(cells)
+    )
+    users, candidates = np.divmod(cells, size)
+
+    allowed = (users != candidates) & ~np.isin(cells, followed_cells)
+    users, candidates = users[allowed], candidates[allowed]
+    scores, mutual = scores[allowed], mutual[allowed]
+
+    top = top_per_group(users, scores, limit)
+    return (
+        graph.user_ids[users[top]],
+        graph.user_ids[candidates[top]],
+        scores[top],
+        mutual[top],
+    )
+
+
+def rebuild_follow_suggestions(
+    chunk_size: int = 1000, limit: int = settings.FOLLOW_SUGGESTIONS_COUNT
+) -> int:
+    """
+    Recompute "who to follow" suggestions of all users, who follow someone or
+    have tag affinities, in chunks of chunk_size users and upsert the top
+    suggestions into FollowSuggestion, rows of the previous rebuild that were
+    not refreshed are deleted. Returns the number of stored rows.
+    """
+
+    computed_at = timezone.now()
+    graph = build_follow_graph()
+    rows = np.flatnonzero(
+        (np.diff(graph.follow_indptr) > 0) | (np.diff(graph.affinity_indptr) > 0)
+    )
+    stored: int = 0
+
+    for start in range(0, len(rows), chunk_size):
+        user_ids, suggested_ids, scores, mutual = compute_suggestions(
+            graph, rows[start : start + chunk_size], limit
+        )
+        FollowSuggestion.objects.bulk_create(
+            [
+                FollowSuggestion(
+                    user_id=user_id,
+                    suggested_user_id=suggested_id,
+                    score=score,
+                    mutual_count=mutual_count,
+                    computed_at=computed_at,
+                )
+                for user_id, suggested_id, score, mutual_count in zip(
+                    user_ids.tolist(),
+                    suggested_ids.tolist(),
+                    scores.tolist(),
+                    mutual.tolist(),
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "suggested_user"],
+            update_fields=["score", "mutual_count", "computed_at"],
+        )
+        stored += len(user_ids)
+
+    FollowSuggestion.objects.filter(computed_at__lt=computed_at).delete()
+    return stored
@@ -1,7 +1,12 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from src.apps.follow.views import FollowViewSet, FollowerViewSet, SubscribeViewSet
+from src.apps.follow.views import (
+    FollowViewSet,
+    FollowerViewSet,
+    FollowSuggestionViewSet,
+    SubscribeViewSet,
+)
 
 router = DefaultRouter()
 router.register(
@@ -14,6 +19,7 @@ router.register(
     FollowerViewSet,
     basename="subscribers",
 )
+router.register(r"suggestions", FollowSuggestionViewSet, basename="suggestions")
 
 urlpatterns = [
     path("subscribe/", SubscribeViewSet.as_view({"post": "create"}), name="subscribe"),
@@ -22,6 +28,11 @@ urlpatterns = [
         SubscribeViewSet.as_view({"delete": "destroy"}),
         name="unsubscribe",
     ),
+    path(
+        "subscribe/bulk/",
+        SubscribeViewSet.as_view({"post": "bulk_create", "delete": "bulk_destroy"}),
+        name="subscribe-bulk",
+    ),
 ]
 
 urlpatterns += router.urls
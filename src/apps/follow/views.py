@@ -1,4 +1,9 @@
-from django.db.models import Count
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import ListModelMixin
 from rest_framework.permissions import IsAuthenticated
@@ -18,13 +23,19 @@ from src.base.code_text import (
     SUCCESSFUL_ATTEMPT_ON_AUTHOR,
     NOT_FOLLOWING_THIS_USER,
     SUCCESSFUL_UNSUBSCRIBE_FROM_THE_AUTHOR,
+    ALREADY_SUBSCRIBED_TO_THIS_AUTHOR,
+    CANNOT_SUBSCRIBE_TO_YOURSELF,
+    INVALID_AUTHORS_LIST,
+    TOO_MANY_AUTHORS,
 )
-from src.apps.follow.models import Follow
+from src.apps.follow.models import Follow, FollowSuggestion
 from src.apps.follow.serializers import (
     FollowListSerializer,
     FollowerListSerializer,
     FollowCreateSerializer,
+    FollowSuggestionSerializer,
 )
+from src.apps.follow.services import follow_authors, unfollow_authors
 from src.apps.users.models import CustomUser
 from src.base.paginators import FollowerPagination
 
@@ -40,7 +51,10 @@ class FollowViewSet(GenericViewSet, ListModelMixin):
         return (
             Follow.objects.filter(user__username=username)
             .select_related("author")
-            .annotate(subscribers_count=Count("author__following"))
+            .annotate(
+                subscribers_count=Coalesce(F("author__stats__followers_count"), 0),
+                subscriptions_count=Coalesce(F("author__stats__following_count"), 0),
+            )
             .order_by("-created_at")
         )
 
@@ -68,7 +82,10 @@ class FollowerViewSet(GenericViewSet, ListModelMixin):
         return (
             Follow.objects.filter(author__username=username)
             .select_related("user")
-            .annotate(subscribers_count=Count("user__following"))
+            .annotate(
+                subscribers_count=Coalesce(F("user__stats__followers_count"), 0),
+                subscriptions_count=Coalesce(F("user__stats__following_count"), 0),
+            )
             .order_by("-created_at")
         )
 
@@ -85,6 +102,43 @@ class FollowerViewSet(GenericViewSet, ListModelMixin):
         return self.get_paginated_response(serializer.data)
 
 
+class FollowSuggestionViewSet(GenericViewSet, ListModelMixin):
+    """
+    "Who to follow" suggestions of the current user, precomputed by the
+    `rebuild_follow_suggestions` command. Authors the user has followed since
+    the last rebuild and inactive or banned users are skipped.
+    """
+
+    serializer_class = FollowSuggestionSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = None
+    swagger_tags = ["subscriptions"]
+
+    def get_queryset(self):
+        user = self.request.user
+        return (
+            FollowSuggestion.objects.filter(
+                user=user,
+                suggested_user__is_active=True,
+                suggested_user__is_banned=False,
+            )
+            .exclude(
+                Exists(
+                    Follow.objects.filter(user=user, author=OuterRef("suggested_user"))
+                )
+            )
+            .select_related("suggested_user")
+            .annotate(
+                subscribers_count=Coalesce(
+                    F("suggested_user__stats__followers_count"), 0
+                )
+            )
+            .order_by("-score", "suggested_user_id")[
+                : settings.FOLLOW_SUGGESTIONS_COUNT
+            ]
+        )
+
+
 class SubscribeViewSet(ModelViewSet):
     serializer_class = FollowCreateSerializer
     permission_classes = [IsAuthenticated]
@@ -95,14 +149,35 @@ class SubscribeViewSet(ModelViewSet):
     def get_queryset(self):
         return Follow.objects.filter(user=self.request.user)
 
+    def get_author_username(self) -> Optional[str]:
+        author = self.request.data.get("author")
+        return author if isinstance(author, str) and author else None
+
     def create(self, request, *args, **kwargs):
-        author = request.data.get("author")
-        if not author:
+        """
+        Subscribe with a single insert, the reason of a failure is looked up
+        only when nothing was inserted
+        """
+
+        author = self.get_author_username()
+        if author is None:
             return Response(data=AUTHOR_IS_MISSING, status=HTTP_400_BAD_REQUEST)
 
-        if not CustomUser.objects.filter(username=request.data.get("author")).exists():
-            return Response(data=AUTHOR_NOT_FOUND, status=HTTP_404_NOT_FOUND)
-        super().create(request, *args, **kwargs)
+        if not follow_authors(request.user.id, [author]):
+            author_id = (
+                CustomUser.objects.filter(username=author)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if author_id is None:
+                return Response(data=AUTHOR_NOT_FOUND, status=HTTP_404_NOT_FOUND)
+            if author_id == request.user.id:
+                return Response(
+                    data=CANNOT_SUBSCRIBE_TO_YOURSELF, status=HTTP_400_BAD_REQUEST
+                )
+            return Response(
+                data=ALREADY_SUBSCRIBED_TO_THIS_AUTHOR, status=HTTP_400_BAD_REQUEST
+            )
 
         return Response(
             data=SUCCESSFUL_ATTEMPT_ON_AUTHOR,
@@ -110,19 +185,64 @@ class SubscribeViewSet(ModelViewSet):
         )
 
     def destroy(self, request, *args, **kwargs):
-        author = request.data.get("author")
-        queryset = Follow.objects.filter(
-            user=self.request.user, author__username=author
-        )
+        author = self.get_author_username()
+        if author is None:
+            return Response(data=AUTHOR_IS_MISSING, status=HTTP_400_BAD_REQUEST)
 
-        if not queryset.exists():
+        if not unfollow_authors(request.user.id, [author]):
             return Response(
                 data=NOT_FOLLOWING_THIS_USER,
                 status=HTTP_404_NOT_FOUND,
             )
 
-        queryset.delete()
         return Response(
             data=SUCCESSFUL_UNSUBSCRIBE_FROM_THE_AUTHOR,
             status=HTTP_204_NO_CONTENT,
         )
+
+    def get_bulk_usernames(self) -> list:
+        usernames = self.request.data.get("authors")
+        if (
+            not isinstance(usernames, list)
+            or not usernames
+            or not all(isinstance(username, str) for username in usernames)
+        ):
+            raise ValidationError(INVALID_AUTHORS_LIST, code="invalid_authors")
+        if len(usernames) > settings.FOLLOW_BULK_MAX_AUTHORS:
+            raise ValidationError(TOO_MANY_AUTHORS, code="too_many_authors")
+        return usernames
+
+    def get_bulk_response(self, usernames: list, author_ids: list) -> Response:
+        """Usernames of the changed subscriptions in the order of the request"""
+
+        changed = set(
+            CustomUser.objects.filter(id__in=author_ids).values_list(
+                "username", flat=True
+            )
+        )
+        return Response(
+            {"authors": [username for username in usernames if username in changed]}
+        )
+
+    def bulk_create(self, request, *args, **kwargs):
+        """
+        Subscribe to a list of authors (e.g. imported contacts) with a single
+        insert. Unknown authors, the user and existing subscriptions are
+        skipped, the response lists the new subscriptions.
+        """
+
+        usernames = self.get_bulk_usernames()
+        return self.get_bulk_response(
+            usernames, follow_authors(request.user.id, usernames)
+        )
+
+    def bulk_destroy(self, request, *args, **kwargs):
+        """
+        Unsubscribe from a list of authors with a single delete, the response
+        lists the removed subscriptions
+        """
+
+        usernames = self.get_bulk_usernames()
+        return self.get_bulk_response(
+            usernames, unfollow_authors(request.user.id, usernames)
+        )
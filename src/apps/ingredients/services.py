@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Type
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model
+
+from .models import Ingredient, Unit
+
+
+class NameIdCache:
+    """
+    Bounded process-local LRU cache of object ids by unique name.
+
+    A name mapped to None is a negative entry: the name was looked up and was
+    not found. Ids of created objects are cached only after commit, so a rolled
+    back insert never leaves a stale id. Entries expire after ttl seconds,
+    so objects deleted by other processes are not referenced for long.
+
+    Attrs:
+    • max_size (int): maximum number of cached names.
+    • ttl (float): seconds after which an entry expires.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Cached ids of names, names missing in the cache are left out"""
+
+        now = time.monotonic()
+        found: Dict[str, Optional[int]] = {}
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(name)
+                if entry is None:
+                    continue
+                if entry[1] <= now:
+                    del self._entries[name]
+                    continue
+                self._entries.move_to_end(name)
+                found[name] = entry[0]
+        return found
+
+    def set_many(self, ids: Dict[str, Optional[int]]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for name, object_id in ids.items():
+                self._entries[name] = (object_id, expires_at)
+                self._entries.move_to_end(name)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, names: Optional[Iterable[str]] = None) -> None:
+        """Drop entries of names, all entries by default"""
+
+        with self._lock:
+            if names is None:
+                self._entries.clear()
+                return
+            for name in names:
+                self._entries.pop(name, None)
+
+
+ingredient_ids = NameIdCache(
+    settings.INGREDIENT_CACHE_SIZE, settings.INGREDIENT_CACHE_TTL
+)
+unit_ids = NameIdCache(settings.INGREDIENT_CACHE_SIZE, settings.INGREDIENT_CACHE_TTL)
+NAME_CACHES: Dict[Type[Model], NameIdCache] = {
+    Ingredient: ingredient_ids,
+    Unit: unit_ids,
+}
+
+
+def get_ids(
+    model: Type[Model], names: Iterable[str], remember_missing: bool = False
+) -> Dict[str, int]:
+    """
+    Ids of existing objects with the given names.
+
+    Only names never seen by the process are looked up in the database.
+    With remember_missing names that were not found are remembered as
+    negative entries, so only callers that create the missing objects
+    should use it: a negative entry hides objects created by other processes.
+    """
+
+    cache: NameIdCache = NAME_CACHES[model]
+    names = set(names)
+    cached = cache.get_many(names)
+    ids: Dict[str, int] = {
+        name: object_id for name, object_id in cached.items() if object_id is not None
+    }
+
+    unknown = names - cached.keys()
+    if unknown:
+        found = dict(model.objects.filter(name__in=unknown).values_list("name", "id"))
+        if remember_missing:
+            cache.set_many({name: None for name in unknown - found.keys()})
+        if found:
+            transaction.on_commit(lambda: cache.set_many(found))
+        ids.update(found)
+    return ids
+
+
+def get_or_create_ids(model: Type[Model], names: Iterable[str]) -> Dict[str, int]:
+    """
+    Ids of objects with the given names, missing objects are created.
+
+    Names with a negative entry are inserted without a lookup, insert
+    conflicts with parallel requests are ignored and the ids are read back.
+    """
+
+    names = set(names)
+    ids: Dict[str, int] = get_ids(model, names, remember_missing=True)
+
+    missing = names - ids.keys()
+    if missing:
+        model.objects.bulk_create(
+            [model(name=name) for name in missing], ignore_conflicts=True
+        )
+        created = dict(model.objects.filter(name__in=missing).values_list("name", "id"))
+        transaction.on_commit(lambda: NAME_CACHES[model].set_many(created))
+        ids.update(created)
+    return ids
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Ingredient, Unit
+from .services import NAME_CACHES
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=Unit)
+def invalidate_saved_name(sender, instance, created, **kwargs):
+    """
+    Drop the negative entry of an inserted name.
+    The old name of a renamed object is unknown, so the cache is cleared.
+    """
+
+    NAME_CACHES[sender].invalidate([instance.name] if created else None)
+
+
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=Unit)
+def invalidate_deleted_name(sender, instance, **kwargs):
+    NAME_CACHES[sender].invalidate([instance.name])
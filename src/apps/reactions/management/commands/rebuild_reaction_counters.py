@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.reactions.services import rebuild_reaction_counters
+
+
+class Command(BaseCommand):
+    """
+    Recount per-emoji reaction counters from Reaction table.
+    """
+
+    help = "Rebuild per-emoji reaction counters"
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_reaction_counters()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} reaction counters"))
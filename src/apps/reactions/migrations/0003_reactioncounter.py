@@ -0,0 +1,58 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("reactions", "0002_alter_reaction_content_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReactionCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "emoji",
+                    models.CharField(
+                        choices=[
+                            ("Like", "Like"),
+                            ("Dislike", "Dislike"),
+                            ("Angry_Face", "Angry Face"),
+                            ("Heart", "Heart"),
+                            ("Fire", "Fire"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="reactioncounter",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "emoji"),
+                name="unique_reaction_counter",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def fill_reaction_counters(apps, schema_editor):
+    Reaction = apps.get_model("reactions", "Reaction")
+    ReactionCounter = apps.get_model("reactions", "ReactionCounter")
+    counts = (
+        Reaction.objects.filter(is_deleted=False, content_type__isnull=False)
+        .order_by()
+        .values("content_type_id", "object_id", "emoji")
+        .annotate(count=Count("pk"))
+    )
+    ReactionCounter.objects.all().delete()
+    ReactionCounter.objects.bulk_create(
+        (ReactionCounter(**row) for row in counts.iterator()), batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reactions", "0003_reactioncounter"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_reaction_counters, migrations.RunPython.noop),
+    ]
@@ -57,3 +57,31 @@ class Reaction(models.Model):
 
     def __str__(self):
         return f"{self.emoji} reaction by {self.author.username}"
+
+
+class ReactionCounter(models.Model):
+    """
+    Count of active reactions of one emoji on an object
+
+    Attrs:
+    • content_type (ForeignKey): model of an object on which reactions were made.
+    • object_id (PositiveIntegerField): id of an object on which reactions were made.
+    • emoji (CharField(choices)): emoji of reactions.
+    • count (PositiveIntegerField): count of active reactions.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    emoji = models.CharField(choices=EmojyChoice.choices, max_length=10)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "emoji"],
+                name="unique_reaction_counter",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.emoji} reactions on {self.object_id}"
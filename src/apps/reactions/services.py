@@ -0,0 +1,99 @@
+from collections import defaultdict
+from typing import Iterable
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+
+from .models import Reaction, ReactionCounter
+
+
+def shift_reaction_counter(
+    content_type_id: int, object_id: int, emoji: str, delta: int
+) -> None:
+    """
+    Atomically shift the count of emoji reactions on an object by delta.
+    A missing counter is recounted from the saved reactions on increments.
+    """
+
+    counter = ReactionCounter.objects.filter(
+        content_type_id=content_type_id, object_id=object_id, emoji=emoji
+    )
+    if counter.update(count=Greatest(F("count") + delta, Value(0))) or delta < 0:
+        return
+
+    count = Reaction.objects.filter(
+        content_type_id=content_type_id,
+        object_id=object_id,
+        emoji=emoji,
+        is_deleted=False,
+    ).count()
+    try:
+        with transaction.atomic():
+            ReactionCounter.objects.create(
+                content_type_id=content_type_id,
+                object_id=object_id,
+                emoji=emoji,
+                count=count,
+            )
+    except IntegrityError:
+        counter.update(count=F("count") + delta)
+
+
+def get_reaction_delta(instance: Reaction, created: bool) -> int:
+    """Change of active reactions count made by saving a reaction"""
+
+    if created:
+        return 0 if instance.is_deleted else 1
+
+    stored_is_deleted = getattr(instance, "_stored_is_deleted", None)
+    if stored_is_deleted is None or stored_is_deleted == instance.is_deleted:
+        return 0
+    return -1 if instance.is_deleted else 1
+
+
+def rebuild_reaction_counters() -> int:
+    """Recount all reaction counters, returns the number of counters"""
+
+    counts = (
+        Reaction.objects.filter(is_deleted=False, content_type__isnull=False)
+        .order_by()
+        .values("content_type_id", "object_id", "emoji")
+        .annotate(count=Count("pk"))
+    )
+    with transaction.atomic():
+        ReactionCounter.objects.all().delete()
+        counters = ReactionCounter.objects.bulk_create(
+            (ReactionCounter(**row) for row in counts.iterator()), batch_size=1000
+        )
+    return len(counters)
+
+
+def count_reactions_on_many(content_type: ContentType, object_ids: Iterable[int]):
+    """Count reactions by emoji on many objects of one content type"""
+
+    counts = defaultdict(dict)
+    counters = ReactionCounter.objects.filter(
+        content_type=content_type, object_id__in=object_ids, count__gt=0
+    ).values_list("object_id", "emoji", "count")
+    for object_id, emoji, count in counters:
+        counts[object_id][emoji] = count
+    return counts
+
+
+def show_user_reactions_on_many(
+    user, content_type: ContentType, object_ids: Iterable[int]
+):
+    """Show reactions of the user on many objects of one content type"""
+
+    user_reactions = defaultdict(list)
+    if user.is_authenticated:
+        reactions = Reaction.objects.filter(
+            content_type=content_type,
+            object_id__in=object_ids,
+            author=user,
+        ).values_list("object_id", "emoji", "id")
+        for object_id, emoji, reaction_id in reactions:
+            user_reactions[object_id].append({"type": emoji, "id": reaction_id})
+    return user_reactions
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Reaction
+from .services import get_reaction_delta, shift_reaction_counter
+
+
+@receiver(pre_save, sender=Reaction)
+def remember_reaction_state(sender, instance, raw=False, **kwargs):
+    """Remember stored is_deleted to detect soft delete and restore"""
+
+    if instance.pk and not raw:
+        instance._stored_is_deleted = (
+            Reaction.objects.filter(pk=instance.pk)
+            .values_list("is_deleted", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Reaction)
+def count_saved_reaction(sender, instance, created, raw=False, **kwargs):
+    delta = get_reaction_delta(instance, created)
+    if delta and not raw and instance.content_type_id:
+        shift_reaction_counter(
+            instance.content_type_id, instance.object_id, instance.emoji, delta
+        )
+
+
+@receiver(post_delete, sender=Reaction)
+def count_deleted_reaction(sender, instance, **kwargs):
+    if not instance.is_deleted and instance.content_type_id:
+        shift_reaction_counter(
+            instance.content_type_id, instance.object_id, instance.emoji, -1
+        )
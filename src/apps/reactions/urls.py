@@ -1,6 +1,10 @@
 from rest_framework.routers import DefaultRouter
 
-from src.apps.reactions.views import RecipeReactionViewSet, CommentReactionViewSet
+from src.apps.reactions.views import (
+    BatchReactionViewSet,
+    RecipeReactionViewSet,
+    CommentReactionViewSet,
+)
 
 router = DefaultRouter()
 router.register(
@@ -13,5 +17,6 @@ router.register(
     CommentReactionViewSet,
     basename="comment-reactions",
 )
+router.register(r"reactions", BatchReactionViewSet, basename="batch-reactions")
 
 urlpatterns = router.urls
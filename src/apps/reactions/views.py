@@ -3,16 +3,20 @@ from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404
 
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import (
     ListModelMixin,
     CreateModelMixin,
     DestroyModelMixin,
 )
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from config.settings import REACTIONS_BATCH_MAX_OBJECTS
 from src.base.code_text import (
+    INVALID_ID_FORMAT,
+    TOO_MANY_REACTION_OBJECTS,
     REACTION_ALREADY_SET,
     SUCCESSFUL_RATED_IT,
     SUCCESSFUL_LIKED_THE_RECIPE,
@@ -22,6 +26,10 @@ from src.base.code_text import (
 )
 from src.base.throttling import ScopedOnePerThreeSecsThrottle
 from src.apps.reactions.models import Reaction
+from src.apps.reactions.services import (
+    count_reactions_on_many,
+    show_user_reactions_on_many,
+)
 from src.apps.reactions.serializers import (
     RecipeReactionsListSerializer,
     ReactionCreateSerializer,
@@ -150,3 +158,61 @@ class CommentReactionViewSet(ReactionViewSet):
         reaction.is_deleted = True
         reaction.save()
         return Response(REACTION_CANCELLED, status=status.HTTP_204_NO_CONTENT)
+
+
+class BatchReactionViewSet(GenericViewSet):
+    """
+    Reactions on many recipes and comments in one request.
+
+    Query params:
+    • recipes (str): comma separated recipe slugs.
+    • comments (str): comma separated comment ids.
+    """
+
+    permission_classes = [AllowAny]
+    swagger_tags = ["Reactions"]
+
+    def get_query_list(self, name):
+        value = self.request.query_params.get(name, "")
+        return [item for item in value.split(",") if item]
+
+    def get_reactions(self, model, objects):
+        """Reactions of objects by key, with one query per content type"""
+
+        content_type = ContentType.objects.get_for_model(model)
+        object_ids = list(objects.values())
+        counts = count_reactions_on_many(content_type, object_ids)
+        user_reactions = show_user_reactions_on_many(
+            self.request.user, content_type, object_ids
+        )
+        return {
+            key: {
+                "reactions": counts.get(object_id, {}),
+                "user_reactions": user_reactions.get(object_id, []),
+            }
+            for key, object_id in objects.items()
+        }
+
+    def list(self, request, *args, **kwargs):
+        slugs = self.get_query_list("recipes")
+        try:
+            comment_ids = [int(item) for item in self.get_query_list("comments")]
+        except ValueError:
+            raise ValidationError(INVALID_ID_FORMAT, code="invalid_id")
+
+        if len(slugs) + len(comment_ids) > REACTIONS_BATCH_MAX_OBJECTS:
+            raise ValidationError(TOO_MANY_REACTION_OBJECTS, code="too_many_objects")
+
+        recipes = dict(Recipe.objects.filter(slug__in=slugs).values_list("slug", "id"))
+        comments = {
+            str(comment_id): comment_id
+            for comment_id in Comment.objects.filter(id__in=comment_ids).values_list(
+                "id", flat=True
+            )
+        }
+        return Response(
+            {
+                "recipes": self.get_reactions(Recipe, recipes),
+                "comments": self.get_reactions(Comment, comments),
+            }
+        )
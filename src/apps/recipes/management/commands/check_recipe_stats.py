@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.recipes.services import (
+    find_inconsistent_recipe_stats,
+    rebuild_recipe_stats,
+)
+
+
+class Command(BaseCommand):
+    """
+    Compare stored recipe counters with a recount and optionally repair them.
+    """
+
+    help = "Check consistency of denormalized recipe counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of recipes recounted per query",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild counters of inconsistent recipes",
+        )
+
+    def handle(self, *args, **options):
+        recipe_ids = find_inconsistent_recipe_stats(chunk_size=options["chunk_size"])
+        if not recipe_ids:
+            self.stdout.write(self.style.SUCCESS("Recipe counters are consistent"))
+            return
+
+        self.stdout.write(
+            self.style.WARNING(
+                f"Inconsistent counters of {len(recipe_ids)} recipes: "
+                f"{', '.join(map(str, recipe_ids[:100]))}"
+            )
+        )
+        if options["fix"]:
+            rebuild_recipe_stats(recipe_ids, chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS("Inconsistent counters rebuilt"))
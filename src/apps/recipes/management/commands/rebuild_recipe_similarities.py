@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.apps.recipes.similarity import rebuild_recipe_similarities
+
+
+class Command(BaseCommand):
+    """
+    Recompute similar recipes from favorites and reactions.
+
+    Should be run periodically (e.g. nightly), the similar recipes endpoint
+    only reads the stored neighbours.
+    """
+
+    help = "Rebuild similar recipes by co-favorites and co-reactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of recipes whose neighbours are computed at once",
+        )
+        parser.add_argument(
+            "--neighbours",
+            type=int,
+            default=settings.RECIPE_SIMILAR_COUNT,
+            help="Number of neighbours stored per recipe",
+        )
+
+    def handle(self, *args, **options):
+        stored = rebuild_recipe_similarities(
+            chunk_size=options["chunk_size"], neighbours=options["neighbours"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stored {stored} similar recipes"))
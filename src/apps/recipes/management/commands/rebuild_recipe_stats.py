@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.recipes.services import rebuild_recipe_stats
+
+
+class Command(BaseCommand):
+    """
+    Recount (backfill) recipe counters and statistics used by the feed.
+
+    Should be run periodically (e.g. daily) so that activity older than
+    ACTIVITY_INTERVAL leaves activity_count, and after loading fixtures.
+    """
+
+    help = "Rebuild materialized recipe statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of recipes recounted per query",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_recipe_stats(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats of {rebuilt} recipes"))
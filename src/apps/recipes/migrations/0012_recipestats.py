@@ -0,0 +1,47 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0011_alter_recipe_cooking_time"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeStats",
+            fields=[
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="recipes.recipe",
+                    ),
+                ),
+                ("comments_count", models.PositiveIntegerField(default=0)),
+                ("views_count", models.PositiveIntegerField(default=0)),
+                ("reactions_count", models.PositiveIntegerField(default=0)),
+                ("latest_comments_count", models.PositiveIntegerField(default=0)),
+                ("latest_views_count", models.PositiveIntegerField(default=0)),
+                ("latest_reactions_count", models.PositiveIntegerField(default=0)),
+                ("activity_count", models.PositiveIntegerField(default=0)),
+                ("rebuilt_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Recipe stats",
+                "verbose_name_plural": "Recipe stats",
+                "indexes": [
+                    models.Index(
+                        fields=["activity_count", "recipe"],
+                        name="recipes_rec_activit_a045b2_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0012_recipestats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipestats",
+            name="favorites_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.6 on 2026-10-18 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0013_recipestats_favorites_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeSlugCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("base_slug", models.SlugField(max_length=255, unique=True)),
+                ("last_number", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Recipe slug counter",
+                "verbose_name_plural": "Recipe slug counters",
+            },
+        ),
+    ]
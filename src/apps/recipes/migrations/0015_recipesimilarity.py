@@ -0,0 +1,65 @@
+# Generated by Django 4.2.6 on 2026-10-18 20:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0014_recipeslugcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarities",
+                        to="recipes.recipe",
+                    ),
+                ),
+                (
+                    "similar_recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to",
+                        to="recipes.recipe",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Recipe similarity",
+                "verbose_name_plural": "Recipe similarities",
+                "indexes": [
+                    models.Index(
+                        fields=["recipe", "-score"],
+                        name="recipes_rec_recipe__e0d610_idx",
+                    ),
+                    models.Index(
+                        fields=["computed_at"], name="recipes_rec_compute_d5ef4a_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipesimilarity",
+            constraint=models.UniqueConstraint(
+                fields=("recipe", "similar_recipe"), name="unique_recipe_similarity"
+            ),
+        ),
+    ]
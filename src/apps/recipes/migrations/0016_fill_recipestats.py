@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.utils import timezone
+
+
+def fill_recipe_stats(apps, schema_editor):
+    Recipe = apps.get_model("recipes", "Recipe")
+    RecipeStats = apps.get_model("recipes", "RecipeStats")
+    Comment = apps.get_model("comments", "Comment")
+    ViewRecipes = apps.get_model("view", "ViewRecipes")
+    Reaction = apps.get_model("reactions", "Reaction")
+    Favorite = apps.get_model("favorite", "Favorite")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    def count_by(queryset, field):
+        return dict(queryset.order_by().values_list(field).annotate(count=Count("pk")))
+
+    threshold = timezone.now() - timedelta(days=settings.ACTIVITY_INTERVAL)
+    reactions = Reaction.objects.filter(
+        content_type__in=ContentType.objects.filter(
+            app_label="recipes", model="recipe"
+        ),
+        is_deleted=False,
+    )
+    comments = count_by(Comment.objects.all(), "recipe_id")
+    views = count_by(ViewRecipes.objects.all(), "recipe_id")
+    reactions_total = count_by(reactions, "object_id")
+    favorites = count_by(Favorite.objects.all(), "recipe_id")
+    latest_comments = count_by(
+        Comment.objects.filter(pub_date__gte=threshold), "recipe_id"
+    )
+    latest_views = count_by(
+        ViewRecipes.objects.filter(created_at__gte=threshold), "recipe_id"
+    )
+    latest_reactions = count_by(reactions.filter(pub_date__gte=threshold), "object_id")
+
+    now = timezone.now()
+    RecipeStats.objects.bulk_create(
+        [
+            RecipeStats(
+                recipe_id=recipe_id,
+                comments_count=comments.get(recipe_id, 0),
+                views_count=views.get(recipe_id, 0),
+                reactions_count=reactions_total.get(recipe_id, 0),
+                favorites_count=favorites.get(recipe_id, 0),
+                latest_comments_count=latest_comments.get(recipe_id, 0),
+                latest_views_count=latest_views.get(recipe_id, 0),
+                latest_reactions_count=latest_reactions.get(recipe_id, 0),
+                activity_count=latest_comments.get(recipe_id, 0)
+                + latest_views.get(recipe_id, 0)
+                + latest_reactions.get(recipe_id, 0),
+                rebuilt_at=now,
+            )
+            for recipe_id in Recipe.objects.filter(stats__isnull=True).values_list(
+                "pk", flat=True
+            )
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0015_recipesimilarity"),
+        ("comments", "0004_comment_path"),
+        ("view", "0004_remove_viewrecipes_unique_view"),
+        ("reactions", "0003_reactioncounter"),
+        ("favorite", "0004_favorite_author_pub_date_index"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_recipe_stats, migrations.RunPython.noop),
+    ]
@@ -96,3 +96,106 @@ class Category(models.Model):
         index_together = ["name", "slug"]
         verbose_name = "Category"
         verbose_name_plural = "Categories"
+
+
+class RecipeStats(models.Model):
+    """
+    Recipe engagement counters and activity statistics, materialized from
+    comments, views, reactions and favorites. Kept up to date by signals,
+    rebuilt by the `rebuild_recipe_stats` and verified by the
+    `check_recipe_stats` management commands.
+
+    Attrs:
+    • recipe (OneToOneField): recipe the statistics belong to.
+    • comments_count (PositiveIntegerField): all-time count of comments.
+    • views_count (PositiveIntegerField): all-time count of views.
+    • reactions_count (PositiveIntegerField): all-time count of reactions.
+    • favorites_count (PositiveIntegerField): count of users who favorited a recipe.
+    • latest_comments_count (PositiveIntegerField): comments in the activity interval.
+    • latest_views_count (PositiveIntegerField): views in the activity interval.
+    • latest_reactions_count (PositiveIntegerField): reactions in the activity interval.
+    • activity_count (PositiveIntegerField): sum of the latest counters.
+    • rebuilt_at (DateTimeField): last time the statistics were fully recounted.
+    """
+
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    comments_count = models.PositiveIntegerField(default=0)
+    views_count = models.PositiveIntegerField(default=0)
+    reactions_count = models.PositiveIntegerField(default=0)
+    favorites_count = models.PositiveIntegerField(default=0)
+    latest_comments_count = models.PositiveIntegerField(default=0)
+    latest_views_count = models.PositiveIntegerField(default=0)
+    latest_reactions_count = models.PositiveIntegerField(default=0)
+    activity_count = models.PositiveIntegerField(default=0)
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["activity_count", "recipe"]),
+        ]
+        verbose_name = "Recipe stats"
+        verbose_name_plural = "Recipe stats"
+
+    def __str__(self):
+        return f"Stats of {self.recipe_id}"
+
+
+class RecipeSlugCounter(models.Model):
+    """
+    Counter of slugs allocated for a base slug (slugified title). The n-th
+    recipe with the same base slug gets the slug "<base_slug>_<n>".
+
+    Attrs:
+    • base_slug (SlugField): slugified recipe title.
+    • last_number (PositiveIntegerField): number of the last allocated slug.
+    """
+
+    base_slug = models.SlugField(max_length=255, unique=True)
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Recipe slug counter"
+        verbose_name_plural = "Recipe slug counters"
+
+    def __str__(self):
+        return f"{self.base_slug}: {self.last_number}"
+
+
+class RecipeSimilarity(models.Model):
+    """
+    Precomputed neighbour of a recipe by users who favorited or reacted to both
+    recipes. Rebuilt by the `rebuild_recipe_similarities` management command.
+
+    Attrs:
+    • recipe (ForeignKey): recipe the neighbour is computed for.
+    • similar_recipe (ForeignKey): neighbour recipe.
+    • score (FloatField): cosine similarity of the recipes.
+    • computed_at (DateTimeField): time of the rebuild that stored the row.
+    """
+
+    recipe = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name="similarities"
+    )
+    similar_recipe = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name="similar_to"
+    )
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipe", "similar_recipe"], name="unique_recipe_similarity"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["recipe", "-score"]),
+            models.Index(fields=["computed_at"]),
+        ]
+        verbose_name = "Recipe similarity"
+        verbose_name_plural = "Recipe similarities"
+
+    def __str__(self):
+        return f"{self.recipe_id} ~ {self.similar_recipe_id}: {self.score:.3f}"
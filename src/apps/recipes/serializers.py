@@ -12,6 +12,7 @@ from taggit.serializers import TagListSerializerField, TagList
 from config.settings import SHORT_RECIPE_SYMBOLS
 from src.apps.ingredients.serializers import IngredientInRecipeSerializer
 from src.apps.recipes.models import Recipe, Category
+from src.apps.recipes.services import allocate_recipe_slug
 from src.apps.users.serializers import AuthorInRecipeSerializer
 from src.base.code_text import (
     RECIPE_CAN_BE_EDIT_WITHIN_FIRST_DAY,
@@ -19,7 +20,6 @@ from src.base.code_text import (
 from src.base.services import (
     shorten_text,
     create_ingredients_in_recipe,
-    create_recipe_slug,
 )
 
 
@@ -115,7 +115,7 @@ class BaseRecipeSerializer(ModelSerializer):
             data["short_text"] = shorten_text(data["full_text"], SHORT_RECIPE_SYMBOLS)
 
         if "title" in data:
-            data = create_recipe_slug(Recipe, data)
+            data["slug"] = allocate_recipe_slug(data["title"])
 
         return data
 
@@ -167,6 +167,17 @@ class RecipeRetrieveSerializer(BaseRecipeSerializer):
         )
 
 
+class SimilarRecipeSerializer(BaseRecipeListSerializer):
+    """
+    Serializer for similar recipes with their similarity score
+    """
+
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(BaseRecipeListSerializer.Meta):
+        fields = BaseRecipeListSerializer.Meta.fields + ("score",)
+
+
 class RecipeCreateSerializer(BaseRecipeSerializer):
     """
     Create recipe serializer
@@ -190,10 +201,7 @@ class RecipeCreateSerializer(BaseRecipeSerializer):
         if category_data:
             recipe.category.set(category_data)
 
-        ingredients_instance = create_ingredients_in_recipe(recipe, ingredients_data)
-
-        if ingredients_instance:
-            recipe.ingredients.set(ingredients_instance)
+        create_ingredients_in_recipe(recipe, ingredients_data)
         return recipe
 
 
@@ -230,11 +238,6 @@ class RecipeUpdateSerializer(BaseRecipeSerializer):
         if category_data:
             instance.category.set(category_data)
         if ingredients_data:
-            instance.ingredients.clear()
-            ingredients_instance = create_ingredients_in_recipe(
-                instance, ingredients_data
-            )
-            if ingredients_instance:
-                instance.ingredients.set(ingredients_instance)
+            create_ingredients_in_recipe(instance, ingredients_data)
 
         return super().update(instance, validated_data)
@@ -0,0 +1,294 @@
+from datetime import datetime, timedelta
+from hashlib import md5
+from typing import Iterable, List, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.text import slugify
+from unidecode import unidecode
+
+from config.settings import ACTIVITY_INTERVAL
+from src.apps.comments.models import Comment
+from src.apps.favorite.models import Favorite
+from src.apps.reactions.models import Reaction
+from src.apps.view.models import ViewRecipes
+from src.base.services import bump_cache_version, count_subquery, get_cache_version
+from .models import Recipe, RecipeSlugCounter, RecipeStats
+
+ACTIVITY_COUNTERS = ("comments", "views", "reactions")
+TOTAL_FIELDS = {
+    "comments_count": "comments_total",
+    "views_count": "views_total",
+    "reactions_count": "reactions_total",
+    "favorites_count": "favorites_total",
+}
+STATS_FIELDS = (
+    "comments_count",
+    "views_count",
+    "reactions_count",
+    "favorites_count",
+    "latest_comments_count",
+    "latest_views_count",
+    "latest_reactions_count",
+    "activity_count",
+    "rebuilt_at",
+)
+RECIPE_DETAIL_COUNTERS = ("reactions_count", "views_count")
+
+
+def get_activity_threshold() -> datetime:
+    """Start of the interval counted in activity_count"""
+
+    return timezone.now() - timedelta(days=ACTIVITY_INTERVAL)
+
+
+def update_recipe_stats(
+    recipe_id: int, counter: str, delta: int, created_at: Optional[datetime] = None
+) -> None:
+    """
+    Atomically shift one of the recipe counters by delta.
+
+    For comments, views and reactions the latest counter and activity_count
+    are shifted too, when the object was created inside the activity interval.
+    Missing statistics are rebuilt on increments only, decrements may come
+    from deleting the recipe.
+    """
+
+    values: dict = {
+        f"{counter}_count": Greatest(F(f"{counter}_count") + delta, Value(0))
+    }
+    if counter in ACTIVITY_COUNTERS and (
+        created_at is None or created_at >= get_activity_threshold()
+    ):
+        values[f"latest_{counter}_count"] = Greatest(
+            F(f"latest_{counter}_count") + delta, Value(0)
+        )
+        values["activity_count"] = Greatest(F("activity_count") + delta, Value(0))
+
+    updated = RecipeStats.objects.filter(recipe_id=recipe_id).update(**values)
+    if not updated and delta > 0:
+        rebuild_recipe_stats([recipe_id])
+
+
+def _annotate_counts(queryset, threshold: datetime):
+    """Annotate recipes queryset with recounted totals and latest activity"""
+
+    reactions = Reaction.objects.filter(
+        content_type=ContentType.objects.get_for_model(Recipe), is_deleted=False
+    )
+    return queryset.annotate(
+        comments_total=count_subquery(Comment.objects.all(), "recipe"),
+        views_total=count_subquery(ViewRecipes.objects.all(), "recipe"),
+        reactions_total=count_subquery(reactions, "object_id"),
+        favorites_total=count_subquery(Favorite.objects.all(), "recipe"),
+        latest_comments=count_subquery(
+            Comment.objects.filter(pub_date__gte=threshold), "recipe"
+        ),
+        latest_views=count_subquery(
+            ViewRecipes.objects.filter(created_at__gte=threshold), "recipe"
+        ),
+        latest_reactions=count_subquery(
+            reactions.filter(pub_date__gte=threshold), "object_id"
+        ),
+    )
+
+
+def rebuild_recipe_stats(
+    recipe_ids: Optional[Iterable[int]] = None, chunk_size: int = 500
+) -> int:
+    """
+    Recount statistics of the given recipes (all recipes by default) in chunks
+    and upsert them into RecipeStats. Returns the number of rebuilt rows.
+    """
+
+    queryset = Recipe.objects.order_by("pk")
+    if recipe_ids is not None:
+        queryset = queryset.filter(pk__in=list(recipe_ids))
+
+    threshold: datetime = get_activity_threshold()
+    now: datetime = timezone.now()
+    rebuilt: int = 0
+    last_id: int = 0
+
+    while True:
+        chunk = _annotate_counts(queryset.filter(pk__gt=last_id), threshold).values(
+            "pk",
+            "comments_total",
+            "views_total",
+            "reactions_total",
+            "favorites_total",
+            "latest_comments",
+            "latest_views",
+            "latest_reactions",
+        )[:chunk_size]
+        stats: List[RecipeStats] = [
+            RecipeStats(
+                recipe_id=row["pk"],
+                comments_count=row["comments_total"],
+                views_count=row["views_total"],
+                reactions_count=row["reactions_total"],
+                favorites_count=row["favorites_total"],
+                latest_comments_count=row["latest_comments"],
+                latest_views_count=row["latest_views"],
+                latest_reactions_count=row["latest_reactions"],
+                activity_count=row["latest_comments"]
+                + row["latest_views"]
+                + row["latest_reactions"],
+                rebuilt_at=now,
+            )
+            for row in chunk
+        ]
+        if not stats:
+            return rebuilt
+
+        RecipeStats.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=["recipe"],
+            update_fields=STATS_FIELDS,
+        )
+        rebuilt += len(stats)
+        last_id = stats[-1].recipe_id
+
+
+def find_inconsistent_recipe_stats(chunk_size: int = 500) -> List[int]:
+    """
+    Recount totals in chunks and return ids of recipes whose stored counters
+    differ from the recount or whose statistics are missing.
+    """
+
+    queryset = Recipe.objects.order_by("pk").annotate(
+        **{f"stored_{field}": F(f"stats__{field}") for field in TOTAL_FIELDS}
+    )
+    threshold: datetime = get_activity_threshold()
+    inconsistent: List[int] = []
+    last_id: int = 0
+
+    while True:
+        chunk = list(
+            _annotate_counts(queryset.filter(pk__gt=last_id), threshold).values(
+                "pk",
+                *TOTAL_FIELDS.values(),
+                *(f"stored_{field}" for field in TOTAL_FIELDS),
+            )[:chunk_size]
+        )
+        if not chunk:
+            return inconsistent
+
+        inconsistent += [
+            row["pk"]
+            for row in chunk
+            if any(
+                row[f"stored_{field}"] != row[total]
+                for field, total in TOTAL_FIELDS.items()
+            )
+        ]
+        last_id = chunk[-1]["pk"]
+
+
+def get_slug_number(slug: str, base_slug: str) -> int:
+    """Number of a slug allocated for base_slug, 0 if it is not one of them"""
+
+    if slug == base_slug:
+        return 1
+    suffix = slug[len(base_slug) + 1 :]
+    return int(suffix) if slug.startswith(f"{base_slug}_") and suffix.isdigit() else 0
+
+
+def _next_slug_number(base_slug: str) -> int:
+    """
+    Atomically increment the counter of base_slug and return its new value.
+    The counter of a new base slug is seeded from already existing slugs.
+    """
+
+    counters = RecipeSlugCounter.objects.filter(base_slug=base_slug)
+    with transaction.atomic():
+        if counters.update(last_number=F("last_number") + 1):
+            return counters.values_list("last_number", flat=True).get()
+
+    existing = Recipe.objects.filter(
+        Q(slug=base_slug) | Q(slug__startswith=f"{base_slug}_")
+    ).values_list("slug", flat=True)
+    number = max((get_slug_number(slug, base_slug) for slug in existing), default=0)
+    try:
+        with transaction.atomic():
+            RecipeSlugCounter.objects.create(
+                base_slug=base_slug, last_number=number + 1
+            )
+        return number + 1
+    except IntegrityError:
+        # the counter was created by a parallel request
+        return _next_slug_number(base_slug)
+
+
+def allocate_recipe_slug(title: str) -> str:
+    """
+    Allocate a unique recipe slug for the title: "<base_slug>" for the first
+    recipe and "<base_slug>_<n>" for the following ones.
+    """
+
+    base_slug: str = slugify(unidecode(title))
+    while True:
+        number = _next_slug_number(base_slug)
+        slug = base_slug if number == 1 else f"{base_slug}_{number}"
+        # a title ending with "_<n>" may have taken the slug of another base
+        if not Recipe.objects.filter(slug=slug).exists():
+            return slug
+
+
+def _get_recipe_detail_version_key(recipe_id: int) -> str:
+    return f"recipe_detail_version:{recipe_id}"
+
+
+def _get_author_detail_version_key(author_id: int) -> str:
+    return f"recipe_detail_author_version:{author_id}"
+
+
+INGREDIENT_NAMES_VERSION_KEY = "recipe_detail_ingredient_names_version"
+
+
+def bump_recipe_detail_version(recipe_id: int) -> None:
+    """Invalidate the cached recipe detail by incrementing its content version"""
+
+    bump_cache_version(_get_recipe_detail_version_key(recipe_id))
+
+
+def bump_author_detail_version(author_id: int) -> None:
+    """Invalidate cached details of all recipes of the author"""
+
+    bump_cache_version(_get_author_detail_version_key(author_id))
+
+
+def bump_ingredient_names_version() -> None:
+    """Invalidate cached details of all recipes after a rename of ingredients"""
+
+    bump_cache_version(INGREDIENT_NAMES_VERSION_KEY)
+
+
+def get_recipe_detail_cache_key(recipe: Recipe, base_url: str) -> str:
+    """
+    Cache key of the recipe detail response by slug and content versions.
+
+    Saves of the recipe change updated_at, changes of related rows bump the
+    version of the recipe. The author and ingredient and unit names are
+    embedded too, so their saves bump the version of the author and the
+    version of all names. The base url is hashed in, because image urls are
+    absolute.
+    """
+
+    versions = ":".join(
+        str(get_cache_version(key))
+        for key in (
+            _get_recipe_detail_version_key(recipe.id),
+            _get_author_detail_version_key(recipe.author_id),
+            INGREDIENT_NAMES_VERSION_KEY,
+        )
+    )
+    host: str = md5(base_url.encode("utf-8")).hexdigest()
+    return (
+        f"recipe_detail:{recipe.slug}:{versions}:"
+        f"{recipe.updated_at.timestamp()}:{host}"
+    )
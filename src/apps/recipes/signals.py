@@ -0,0 +1,144 @@
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.comments.models import Comment
+from src.apps.favorite.models import Favorite
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe, Unit
+from src.apps.reactions.models import Reaction
+from src.apps.reactions.services import get_reaction_delta
+from src.apps.view.models import ViewRecipes
+from .models import Category, Recipe, RecipeStats
+from .services import (
+    bump_author_detail_version,
+    bump_ingredient_names_version,
+    bump_recipe_detail_version,
+    update_recipe_stats,
+)
+
+# fields of the author embedded into the cached recipe detail
+AUTHOR_DETAIL_FIELDS = {"username", "display_name", "avatar"}
+
+
+def is_recipe_reaction(reaction: Reaction) -> bool:
+    """Check whether a reaction was made on a recipe"""
+
+    return reaction.content_type_id == ContentType.objects.get_for_model(Recipe).id
+
+
+def invalidate_recipe_details(recipe_ids) -> None:
+    """Bump cached detail versions of the recipes after the commit"""
+
+    recipe_ids = set(recipe_ids)
+
+    def bump_versions():
+        for recipe_id in recipe_ids:
+            bump_recipe_detail_version(recipe_id)
+
+    transaction.on_commit(bump_versions)
+
+
+@receiver(post_save, sender=Recipe)
+def create_recipe_stats(sender, instance, created, raw=False, **kwargs):
+    """Create empty statistics for a new recipe"""
+
+    if created and not raw:
+        RecipeStats.objects.get_or_create(recipe=instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.recipe_id:
+        update_recipe_stats(instance.recipe_id, "comments", 1, instance.pub_date)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if instance.recipe_id:
+        update_recipe_stats(instance.recipe_id, "comments", -1, instance.pub_date)
+
+
+@receiver(post_save, sender=ViewRecipes)
+def count_created_view(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_recipe_stats(instance.recipe_id, "views", 1, instance.created_at)
+
+
+@receiver(post_delete, sender=ViewRecipes)
+def count_deleted_view(sender, instance, **kwargs):
+    update_recipe_stats(instance.recipe_id, "views", -1, instance.created_at)
+
+
+@receiver(post_save, sender=Reaction)
+def count_saved_reaction(sender, instance, created, raw=False, **kwargs):
+    delta = get_reaction_delta(instance, created)
+    if delta and not raw and is_recipe_reaction(instance):
+        update_recipe_stats(instance.object_id, "reactions", delta, instance.pub_date)
+
+
+@receiver(post_delete, sender=Reaction)
+def count_deleted_reaction(sender, instance, **kwargs):
+    if not instance.is_deleted and is_recipe_reaction(instance):
+        update_recipe_stats(instance.object_id, "reactions", -1, instance.pub_date)
+
+
+@receiver(post_save, sender=Favorite)
+def count_created_favorite(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_recipe_stats(instance.recipe_id, "favorites", 1)
+
+
+@receiver(post_delete, sender=Favorite)
+def count_deleted_favorite(sender, instance, **kwargs):
+    update_recipe_stats(instance.recipe_id, "favorites", -1)
+
+
+@receiver(post_save, sender=IngredientInRecipe)
+@receiver(post_delete, sender=IngredientInRecipe)
+def invalidate_ingredient_recipe(sender, instance, raw=False, **kwargs):
+    if not raw and instance.recipe_id:
+        invalidate_recipe_details([instance.recipe_id])
+
+
+@receiver(m2m_changed, sender=Recipe.category.through)
+@receiver(m2m_changed, sender=Recipe.tag.through)
+def invalidate_recipe_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if isinstance(instance, Recipe) and action in (
+            "post_add",
+            "post_remove",
+            "post_clear",
+        ):
+            invalidate_recipe_details([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        invalidate_recipe_details(pk_set)
+    elif action == "pre_clear" and isinstance(instance, Category):
+        invalidate_recipe_details(instance.recipes.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_recipes(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        invalidate_recipe_details(instance.recipes.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_author_recipes(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    if created or raw:
+        return
+    if update_fields is not None and not AUTHOR_DETAIL_FIELDS & set(update_fields):
+        return
+    transaction.on_commit(lambda: bump_author_detail_version(instance.pk))
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=Unit)
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=Unit)
+def invalidate_ingredient_names(sender, instance, created=False, raw=False, **kwargs):
+    if not created and not raw:
+        transaction.on_commit(bump_ingredient_names_version)
@@ -0,0 +1,230 @@
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from src.apps.favorite.models import Favorite
+from src.apps.reactions.models import Reaction
+from .models import Recipe, RecipeSimilarity
+
+FAVORITE_WEIGHT = 1.0
+REACTION_WEIGHT = 0.5
+
+
+class InteractionMatrix(NamedTuple):
+    """
+    Sparse user × recipe matrix of interaction weights, stored both by rows
+    (user → recipes) and by columns (recipe → users) in CSR layout.
+
+    Attrs:
+    • user_ids (ndarray): user id of every row.
+    • recipe_ids (ndarray): recipe id of every column.
+    • user_indptr, user_recipes, user_weights (ndarray): rows of users.
+    • recipe_indptr, recipe_users, recipe_weights (ndarray): columns of recipes.
+    • norms (ndarray): euclidean norm of every column.
+    """
+
+    user_ids: np.ndarray
+    recipe_ids: np.ndarray
+    user_indptr: np.ndarray
+    user_recipes: np.ndarray
+    user_weights: np.ndarray
+    recipe_indptr: np.ndarray
+    recipe_users: np.ndarray
+    recipe_weights: np.ndarray
+    norms: np.ndarray
+
+
+def load_pairs(
+    queryset, fields: Tuple[str, ...], chunk_size: int, dtype=np.int64
+) -> np.ndarray:
+    """Load rows of numeric fields of the queryset in keyset chunks"""
+
+    chunks: List[np.ndarray] = []
+    last_id: int = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", *fields)[:chunk_size]
+        )
+        if not rows:
+            break
+        chunks.append(np.array(rows, dtype=dtype)[:, 1:])
+        last_id = rows[-1][0]
+    return np.concatenate(chunks) if chunks else np.empty((0, len(fields)), dtype)
+
+
+def compress(
+    rows: np.ndarray, columns: np.ndarray, weights: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Group (row, column, weight) entries by row into CSR arrays"""
+
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, columns[order], weights[order]
+
+
+def build_interaction_matrix(chunk_size: int = 5000) -> InteractionMatrix:
+    """
+    Build the user × recipe matrix from favorites and recipe reactions.
+    A favorite weighs FAVORITE_WEIGHT, a reaction REACTION_WEIGHT, the
+    heaviest interaction of a user with a recipe is kept.
+    """
+
+    favorites = load_pairs(
+        Favorite.objects.all(), ("author_id", "recipe_id"), chunk_size
+    )
+    reactions = load_pairs(
+        Reaction.objects.filter(
+            content_type=ContentType.objects.get_for_model(Recipe), is_deleted=False
+        ),
+        ("author_id", "object_id"),
+        chunk_size,
+    )
+    pairs = np.concatenate([favorites, reactions])
+    weights = np.concatenate(
+        [
+            np.full(len(favorites), FAVORITE_WEIGHT),
+            np.full(len(reactions), REACTION_WEIGHT),
+        ]
+    )
+
+    # reactions are generic relations and may outlive their recipe
+    existing = np.fromiter(Recipe.objects.values_list("pk", flat=True), np.int64)
+    known = np.isin(pairs[:, 1], existing)
+    pairs, weights = pairs[known], weights[known]
+
+    users, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    recipe_ids, recipe_index = np.unique(pairs[:, 1], return_inverse=True)
+    cells, cell_index = np.unique(
+        user_index * len(recipe_ids) + recipe_index, return_inverse=True
+    )
+    cell_weights = np.zeros(len(cells))
+    np.maximum.at(cell_weights, cell_index, weights)
+    user_index, recipe_index = np.divmod(cells, len(recipe_ids))
+
+    user_indptr, user_recipes, user_weights = compress(
+        user_index, recipe_index, cell_weights, len(users)
+    )
+    recipe_indptr, recipe_users, recipe_weights = compress(
+        recipe_index, user_index, cell_weights, len(recipe_ids)
+    )
+    norms = np.sqrt(
+        np.bincount(recipe_index, cell_weights**2, minlength=len(recipe_ids))
+    )
+    return InteractionMatrix(
+        users,
+        recipe_ids,
+        user_indptr,
+        user_recipes,
+        user_weights,
+        recipe_indptr,
+        recipe_users,
+        recipe_weights,
+        norms,
+    )
+
+
+def expand_rows(indptr: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entries of the given CSR rows: returns the length of every row, to repeat
+    per-row values with np.repeat, and positions of the entries of all rows.
+    """
+
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.arange(lengths.sum()) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    return lengths, np.repeat(starts, lengths) + offsets
+
+
+def top_per_group(groups: np.ndarray, scores: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of at most limit highest scores of every group, grouped in order"""
+
+    order = np.lexsort((-scores, groups))
+    _, group_starts, group_index = np.unique(
+        groups[order], return_index=True, return_inverse=True
+    )
+    return order[np.arange(len(order)) - group_starts[group_index] < limit]
+
+
+def compute_neighbours(
+    matrix: InteractionMatrix, start: int, stop: int, neighbours: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top neighbours by cosine similarity of the columns start:stop.
+
+    Every interaction of the chunk is expanded into the row of its user, the
+    products are summed per (recipe, neighbour) pair, so the work depends on
+    the number of co-interactions and not on the size of the matrix.
+    Returns recipe ids, neighbour ids and scores.
+    """
+
+    first, last = matrix.recipe_indptr[start], matrix.recipe_indptr[stop]
+    recipes = np.repeat(
+        np.arange(start, stop), np.diff(matrix.recipe_indptr[start : stop + 1])
+    )
+    users = matrix.recipe_users[first:last]
+    weights = matrix.recipe_weights[first:last]
+
+    lengths, positions = expand_rows(matrix.user_indptr, users)
+    recipes = np.repeat(recipes, lengths)
+    similar = matrix.user_recipes[positions]
+    products = np.repeat(weights, lengths) * matrix.user_weights[positions]
+
+    other = recipes != similar
+    size = len(matrix.recipe_ids)
+    pairs, pair_index = np.unique(
+        recipes[other] * size + similar[other], return_inverse=True
+    )
+    dot = np.bincount(pair_index, products[other], minlength=len(pairs))
+    recipes, similar = np.divmod(pairs, size)
+    scores = dot / (matrix.norms[recipes] * matrix.norms[similar])
+
+    top = top_per_group(recipes, scores, neighbours)
+    return matrix.recipe_ids[recipes[top]], matrix.recipe_ids[similar[top]], scores[top]
+
+
+def rebuild_recipe_similarities(
+    chunk_size: int = 500, neighbours: int = settings.RECIPE_SIMILAR_COUNT
+) -> int:
+    """
+    Recompute top neighbours of all recipes in chunks of chunk_size recipes
+    and upsert them into RecipeSimilarity, rows of the previous rebuild that
+    were not refreshed are deleted. Returns the number of stored rows.
+    """
+
+    computed_at = timezone.now()
+    matrix = build_interaction_matrix()
+    stored: int = 0
+
+    for start in range(0, len(matrix.recipe_ids), chunk_size):
+        stop = min(start + chunk_size, len(matrix.recipe_ids))
+        recipe_ids, similar_ids, scores = compute_neighbours(
+            matrix, start, stop, neighbours
+        )
+        RecipeSimilarity.objects.bulk_create(
+            [
+                RecipeSimilarity(
+                    recipe_id=recipe_id,
+                    similar_recipe_id=similar_id,
+                    score=score,
+                    computed_at=computed_at,
+                )
+                for recipe_id, similar_id, score in zip(
+                    recipe_ids.tolist(), similar_ids.tolist(), scores.tolist()
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["recipe", "similar_recipe"],
+            update_fields=["score", "computed_at"],
+        )
+        stored += len(recipe_ids)
+
+    RecipeSimilarity.objects.filter(computed_at__lt=computed_at).delete()
+    return stored
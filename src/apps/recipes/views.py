@@ -1,4 +1,7 @@
-from django.db.models import Count
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, prefetch_related_objects
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import action
@@ -23,16 +26,31 @@ from src.base.code_text import (
     LIST_OF_FAVORITES_IS_EMPTY,
 )
 from src.apps.favorite.models import Favorite
-from src.apps.view.models import ViewRecipes
-from src.base.paginators import FeedPagination
+from src.apps.view.recorder import record_view
+from src.base.paginators import FavoritesPagination
 from src.base.permissions import IsOwnerOrStaffOrReadOnly
-from src.base.services import increment_view_count
 from .models import Recipe
+from .services import RECIPE_DETAIL_COUNTERS, get_recipe_detail_cache_key
 from .serializers import (
     RecipeRetrieveSerializer,
     RecipeCreateSerializer,
     RecipeUpdateSerializer,
     BaseRecipeListSerializer,
+    SimilarRecipeSerializer,
+)
+
+RECIPE_LIST_FIELDS = (
+    "id",
+    "title",
+    "slug",
+    "preview_image",
+    "short_text",
+    "cooking_time",
+    "pub_date",
+    "author__id",
+    "author__username",
+    "author__display_name",
+    "author__avatar",
 )
 
 
@@ -52,23 +70,26 @@ class RecipeViewSet(
         if "favorites" in self.request.path:
             queryset = (
                 Recipe.objects.filter(favorite__author=self.request.user)
-                .order_by("-pub_date")
-                .prefetch_related("tag", "reactions", "comments", "views")
                 .annotate(
-                    reactions_count=Count("reactions", distinct=True),
-                    views_count=Count("views", distinct=True),
-                    comments_count=Count("comments", distinct=True),
+                    favorited_at=F("favorite__pub_date"),
+                    reactions_count=Coalesce(F("stats__reactions_count"), 0),
+                    views_count=Coalesce(F("stats__views_count"), 0),
+                    comments_count=Coalesce(F("stats__comments_count"), 0),
                 )
+                .only(*RECIPE_LIST_FIELDS)
+                .select_related("author")
+                .prefetch_related("tag")
+                .order_by("-favorited_at", "-id")
             )
             return queryset
         slug = self.kwargs.get("slug")
         queryset = (
             Recipe.objects.filter(slug=slug)
             .select_related("author")
-            .prefetch_related("ingredients", "category", "tag", "reactions", "views")
+            .prefetch_related("ingredients", "category", "tag")
             .annotate(
-                reactions_count=Count("reactions", distinct=True),
-                views_count=Count("views", distinct=True),
+                reactions_count=Coalesce(F("stats__reactions_count"), 0),
+                views_count=Coalesce(F("stats__views_count"), 0),
             )
         )
         return queryset
@@ -91,11 +112,38 @@ class RecipeViewSet(
         return super(RecipeViewSet, self).get_serializer_class()
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        increment_view_count(ViewRecipes, instance, request)
+        """Recipe detail.
+
+        The serialized recipe is cached by slug and content versions, only the
+        counters are read from statistics on every request. Relations are
+        loaded only on a cache miss.
+        """
+
+        recipe = get_object_or_404(
+            Recipe.objects.select_related("author").annotate(
+                reactions_count=Coalesce(F("stats__reactions_count"), 0),
+                views_count=Coalesce(F("stats__views_count"), 0),
+            ),
+            slug=kwargs["slug"],
+        )
+        self.check_object_permissions(request, recipe)
+
+        key = get_recipe_detail_cache_key(recipe, request.build_absolute_uri("/"))
+        data = cache.get(key)
+        if data is None:
+            prefetch_related_objects(
+                [recipe],
+                "ingredients__ingredient",
+                "ingredients__unit",
+                "category",
+                "tag",
+            )
+            data = dict(self.get_serializer(recipe).data)
+            cache.set(key, data, settings.RECIPE_DETAIL_CACHE_TTL)
+        record_view(recipe, request)
 
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        data.update({field: getattr(recipe, field) for field in RECIPE_DETAIL_COUNTERS})
+        return Response(data)
 
     def destroy(self, request, *args, **kwargs):
         """Delete recipe"""
@@ -107,21 +155,48 @@ class RecipeViewSet(
         methods=[
             "get",
         ],
-        pagination_class=FeedPagination,
+        pagination_class=FavoritesPagination,
     )
     def favorites(self, request):
-        """Getting a list of favorite user's recipes with pagination."""
+        """Getting a list of favorite user's recipes with pagination.
 
-        queryset = self.get_queryset()
-        if not queryset:
+        Recipes are ordered by the date they were added to favorites,
+        ?pagination=cursor switches to keyset pagination on this date.
+        """
+
+        page = self.paginate_queryset(self.get_queryset())
+        if not page and not self.paginator.is_keyset_requested(request):
             return Response(LIST_OF_FAVORITES_IS_EMPTY)
 
-        serializer = BaseRecipeListSerializer
-        page = self.paginate_queryset(queryset)
-        serializer = serializer(page, many=True)
+        serializer = BaseRecipeListSerializer(page, many=True)
 
         return self.get_paginated_response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def similar(self, request, slug=None):
+        """Recipes favorited or reacted to by the same users, most similar first.
+
+        Neighbours are precomputed by the `rebuild_recipe_similarities` command.
+        """
+
+        recipes = list(
+            Recipe.objects.filter(similar_to__recipe__slug=slug)
+            .annotate(
+                score=F("similar_to__score"),
+                reactions_count=Coalesce(F("stats__reactions_count"), 0),
+                views_count=Coalesce(F("stats__views_count"), 0),
+                comments_count=Coalesce(F("stats__comments_count"), 0),
+            )
+            .only(*RECIPE_LIST_FIELDS)
+            .select_related("author")
+            .prefetch_related("tag")
+            .order_by("-score", "id")[: settings.RECIPE_SIMILAR_COUNT]
+        )
+        if not recipes:
+            get_object_or_404(Recipe, slug=slug)
+
+        return Response(SimilarRecipeSerializer(recipes, many=True).data)
+
     def add_to_favorites(self, request, slug):
         recipe = get_object_or_404(Recipe, slug=slug)
         favorite_recipe, created = Favorite.objects.get_or_create(
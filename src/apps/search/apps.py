@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "src.apps.search"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .signals import setup_search_index
+
+        # the app has no models, so post_migrate is not sent with it as sender
+        post_migrate.connect(setup_search_index, dispatch_uid="setup_search_index")
@@ -0,0 +1,336 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count, F, QuerySet, Value
+from django.db.models.functions import Coalesce
+from taggit.models import Tag, TaggedItem
+
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe
+from src.apps.recipes.models import Recipe
+
+
+class Suggestion(NamedTuple):
+    key: int
+    texts: Tuple[str, ...]
+    weight: int
+    payload: dict
+
+
+def get_prefixes(text: str) -> List[str]:
+    """Normalized text and its suffixes starting with every following word"""
+
+    words = text.casefold().split()
+    return [" ".join(words[position:]) for position in range(len(words))]
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index over a sorted array of (prefix, key) pairs.
+
+    Every text is indexed from the start of each of its words. Suggestions
+    for a prefix are found by binary search, top-k by weight of prefixes up
+    to cached_length characters are precomputed on build. Top-k of other
+    searched prefixes, including short ones invalidated by writes, are kept
+    in a bounded LRU.
+
+    Attrs:
+    • limit (int): number of suggestions kept for a cached prefix.
+    • cached_length (int): maximum length of a prefix with precomputed top-k.
+    • max_memo (int): maximum number of remembered searched prefixes.
+    """
+
+    def __init__(self, limit: int, cached_length: int, max_memo: int = 10_000):
+        self.limit = limit
+        self.cached_length = cached_length
+        self.max_memo = max_memo
+        self._items: List[Tuple[str, int]] = []
+        self._suggestions: Dict[int, Suggestion] = {}
+        self._top: Dict[str, List[int]] = {}
+        self._memo: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._suggestions)
+
+    def build(self, suggestions: Iterable[Suggestion]) -> None:
+        items: List[Tuple[str, int]] = []
+        heaps: Dict[str, List[Tuple[int, int]]] = {}
+        by_key: Dict[int, Suggestion] = {}
+        for suggestion in suggestions:
+            by_key[suggestion.key] = suggestion
+            cached = set()
+            for text in suggestion.texts:
+                for prefix in get_prefixes(text):
+                    items.append((prefix, suggestion.key))
+                    for length in range(1, min(len(prefix), self.cached_length) + 1):
+                        cached.add(prefix[:length])
+            for prefix in cached:
+                heap = heaps.setdefault(prefix, [])
+                entry = (suggestion.weight, -suggestion.key)
+                if len(heap) < self.limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        items.sort()
+        top = {
+            prefix: [-key for _, key in sorted(heap, reverse=True)]
+            for prefix, heap in heaps.items()
+        }
+        with self._lock:
+            self._items, self._suggestions, self._top = items, by_key, top
+            self._memo.clear()
+
+    def _scan(self, prefix: str, limit: int) -> List[int]:
+        """Top keys by weight of all texts starting with the prefix"""
+
+        keys = set()
+        position = bisect_left(self._items, (prefix,))
+        while position < len(self._items) and self._items[position][0].startswith(
+            prefix
+        ):
+            keys.add(self._items[position][1])
+            position += 1
+        return heapq.nlargest(
+            limit, keys, key=lambda key: (self._suggestions[key].weight, -key)
+        )
+
+    def _drop_cached(self, suggestion: Suggestion) -> None:
+        for text in suggestion.texts:
+            for prefix in get_prefixes(text):
+                for length in range(1, len(prefix) + 1):
+                    self._top.pop(prefix[:length], None)
+                    self._memo.pop(prefix[:length], None)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            suggestion = self._suggestions.pop(key, None)
+            if suggestion is None:
+                return
+            for text in suggestion.texts:
+                for prefix in get_prefixes(text):
+                    position = bisect_left(self._items, (prefix, key))
+                    if self._items[position : position + 1] == [(prefix, key)]:
+                        del self._items[position]
+            self._drop_cached(suggestion)
+
+    def upsert(self, suggestion: Suggestion) -> None:
+        """
+        Add or replace a suggestion. Cached top-k of its prefixes are
+        recomputed lazily on the next search.
+        """
+
+        with self._lock:
+            self.remove(suggestion.key)
+            self._suggestions[suggestion.key] = suggestion
+            for text in suggestion.texts:
+                for prefix in get_prefixes(text):
+                    insort(self._items, (prefix, suggestion.key))
+            self._drop_cached(suggestion)
+
+    def get(self, key: int) -> Optional[Suggestion]:
+        return self._suggestions.get(key)
+
+    def search(self, prefix: str, limit: int) -> List[dict]:
+        prefix = " ".join(prefix.casefold().split())
+        if not prefix:
+            return []
+
+        with self._lock:
+            if limit > self.limit:
+                keys = self._scan(prefix, limit)
+            elif prefix in self._top:
+                keys = self._top[prefix]
+            else:
+                keys = self._memo.get(prefix)
+                if keys is None:
+                    keys = self._memo[prefix] = self._scan(prefix, self.limit)
+                    if len(self._memo) > self.max_memo:
+                        self._memo.popitem(last=False)
+                self._memo.move_to_end(prefix)
+            return [self._suggestions[key].payload for key in keys[:limit]]
+
+
+def by_keys(queryset: QuerySet, keys: Optional[Iterable[int]]) -> QuerySet:
+    return queryset if keys is None else queryset.filter(pk__in=keys)
+
+
+def load_recipes(keys: Optional[Iterable[int]] = None) -> Iterable[Suggestion]:
+    """Recipe titles weighted by engagement"""
+
+    queryset = Recipe.objects.annotate(
+        weight=Coalesce(
+            F("stats__favorites_count")
+            + F("stats__reactions_count")
+            + F("stats__comments_count")
+            + F("stats__views_count"),
+            Value(0),
+        )
+    )
+    for recipe in by_keys(queryset, keys).values("id", "title", "slug", "weight"):
+        yield Suggestion(
+            recipe["id"],
+            (recipe["title"],),
+            recipe["weight"],
+            {"title": recipe["title"], "slug": recipe["slug"]},
+        )
+
+
+def load_tags(keys: Optional[Iterable[int]] = None) -> Iterable[Suggestion]:
+    """Tags weighted by the number of tagged objects"""
+
+    queryset = Tag.objects.annotate(weight=Count("taggit_taggeditem_items"))
+    for tag in by_keys(queryset, keys).values("id", "name", "weight"):
+        yield Suggestion(
+            tag["id"], (tag["name"],), tag["weight"], {"name": tag["name"]}
+        )
+
+
+def load_ingredients(keys: Optional[Iterable[int]] = None) -> Iterable[Suggestion]:
+    """Ingredients weighted by the number of recipes using them"""
+
+    queryset = Ingredient.objects.annotate(weight=Count("ingredientsinrecipe"))
+    for ingredient in by_keys(queryset, keys).values("id", "name", "weight"):
+        yield Suggestion(
+            ingredient["id"],
+            (ingredient["name"],),
+            ingredient["weight"],
+            {"name": ingredient["name"]},
+        )
+
+
+def load_users(keys: Optional[Iterable[int]] = None) -> Iterable[Suggestion]:
+    """Active users weighted by the denormalized number of followers"""
+
+    queryset = (
+        get_user_model()
+        .objects.filter(is_active=True, is_banned=False, username__isnull=False)
+        .annotate(weight=Coalesce(F("stats__followers_count"), 0))
+    )
+    for user in by_keys(queryset, keys).values(
+        "id", "username", "display_name", "weight"
+    ):
+        texts = (user["username"], user["display_name"] or "")
+        yield Suggestion(
+            user["id"],
+            tuple(text for text in texts if text),
+            user["weight"],
+            {"username": user["username"], "display_name": user["display_name"]},
+        )
+
+
+class AutocompleteSource:
+    """
+    Prefix index of one entity type. It is built by the loader on first use
+    and rebuilt after ttl seconds to refresh weights and pick up writes of
+    other processes, writes of the process are applied incrementally.
+
+    Only the first build blocks searches. A stale index keeps being served,
+    while a single background thread rebuilds it. Objects refreshed during a
+    build are reloaded after the built index is swapped in.
+    """
+
+    def __init__(self, loader: Callable[..., Iterable[Suggestion]], ttl: float):
+        self.loader = loader
+        self.ttl = ttl
+        self.index = PrefixIndex(
+            settings.AUTOCOMPLETE_LIMIT, settings.AUTOCOMPLETE_CACHED_PREFIX_LENGTH
+        )
+        self._built_at: float = 0
+        self._pending: Optional[Set[int]] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.rebuild_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_built(self) -> bool:
+        return bool(self._built_at)
+
+    def reset(self) -> None:
+        """Drop the index, it is rebuilt on the next search"""
+
+        self._built_at = 0
+        self.index.build([])
+
+    def _build(self) -> None:
+        with self._lock:
+            self._pending = set()
+        try:
+            self.index.build(self.loader())
+            self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+        self.refresh(pending)
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self._build()
+        finally:
+            # the thread has its own database connection
+            connection.close()
+            self._build_lock.release()
+
+    def search(self, prefix: str, limit: int) -> List[dict]:
+        if not self._built_at:
+            with self._build_lock:
+                if not self._built_at:
+                    self._build()
+        elif time.monotonic() - self._built_at >= self.ttl:
+            if self._build_lock.acquire(blocking=False):
+                self.rebuild_thread = threading.Thread(
+                    target=self._rebuild_in_background, daemon=True
+                )
+                self.rebuild_thread.start()
+        return self.index.search(prefix, limit)
+
+    def refresh(self, keys: Iterable[int]) -> None:
+        """Reload suggestions of written or deleted objects, if built"""
+
+        keys = set(keys)
+        with self._lock:
+            if self._pending is not None:
+                self._pending |= keys
+        if not self.is_built or not keys:
+            return
+        loaded = {suggestion.key: suggestion for suggestion in self.loader(keys)}
+        for key in keys:
+            if key in loaded:
+                self.index.upsert(loaded[key])
+            else:
+                self.index.remove(key)
+
+
+AUTOCOMPLETE_SOURCES: Dict[str, AutocompleteSource] = {
+    "recipes": AutocompleteSource(load_recipes, settings.AUTOCOMPLETE_TTL),
+    "tags": AutocompleteSource(load_tags, settings.AUTOCOMPLETE_TTL),
+    "ingredients": AutocompleteSource(load_ingredients, settings.AUTOCOMPLETE_TTL),
+    "users": AutocompleteSource(load_users, settings.AUTOCOMPLETE_TTL),
+}
+
+
+def refresh_recipe_suggestions(recipe_id: int) -> None:
+    """Refresh the recipe, its tags and its ingredients in built indexes"""
+
+    AUTOCOMPLETE_SOURCES["recipes"].refresh([recipe_id])
+    if AUTOCOMPLETE_SOURCES["tags"].is_built:
+        AUTOCOMPLETE_SOURCES["tags"].refresh(
+            TaggedItem.objects.filter(
+                content_type__app_label="recipes",
+                content_type__model="recipe",
+                object_id=recipe_id,
+            ).values_list("tag_id", flat=True)
+        )
+    if AUTOCOMPLETE_SOURCES["ingredients"].is_built:
+        AUTOCOMPLETE_SOURCES["ingredients"].refresh(
+            IngredientInRecipe.objects.filter(
+                recipe_id=recipe_id, ingredient__isnull=False
+            ).values_list("ingredient_id", flat=True)
+        )
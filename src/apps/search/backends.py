@@ -0,0 +1,194 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Iterable, List
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from src.apps.recipes.models import Recipe
+
+SEARCH_FIELDS = ("title", "short_text", "full_text", "tags", "ingredients")
+
+
+def get_search_terms(query: str) -> List[str]:
+    """Split a user query into words"""
+
+    return re.findall(r"\w+", query)
+
+
+class BaseSearchBackend(ABC):
+    """
+    Interface of a recipe search index.
+
+    Documents are dicts with the recipe "id" and text of SEARCH_FIELDS.
+    """
+
+    @abstractmethod
+    def setup(self) -> None:
+        """Create the index storage if it does not exist"""
+
+    @abstractmethod
+    def index(self, documents: Iterable[dict]) -> None:
+        """Add or replace documents in the index"""
+
+    @abstractmethod
+    def remove(self, recipe_ids: Iterable[int]) -> None:
+        """Remove documents from the index"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all documents from the index"""
+
+    @abstractmethod
+    def search(self, query: str, offset: int, limit: int) -> List[int]:
+        """Ids of matching recipes ordered by rank"""
+
+    @abstractmethod
+    def count(self, query: str) -> int:
+        """Number of matching recipes"""
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    Inverted index in a SQLite FTS5 virtual table, rowid is the recipe id.
+    Every word of the query must match a prefix of a word in the document,
+    results are ranked by bm25 with higher weights of title, tags and
+    ingredients.
+    """
+
+    table = "search_recipe_index"
+    weights = {
+        "title": 10.0,
+        "short_text": 2.0,
+        "full_text": 1.0,
+        "tags": 5.0,
+        "ingredients": 4.0,
+    }
+
+    def setup(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"{', '.join(SEARCH_FIELDS)}, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def index(self, documents: Iterable[dict]) -> None:
+        documents = list(documents)
+        if not documents:
+            return
+        self.remove(document["id"] for document in documents)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s{', %s' * len(SEARCH_FIELDS)})",
+                [
+                    [document["id"], *(document[field] for field in SEARCH_FIELDS)]
+                    for document in documents
+                ],
+            )
+
+    def remove(self, recipe_ids: Iterable[int]) -> None:
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN "
+                f"({', '.join(['%s'] * len(recipe_ids))})",
+                recipe_ids,
+            )
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def get_match_expression(self, query: str) -> str:
+        return " ".join(f'"{term}"*' for term in get_search_terms(query))
+
+    def search(self, query: str, offset: int, limit: int) -> List[int]:
+        expression = self.get_match_expression(query)
+        if not expression:
+            return []
+        weights = ", ".join(str(self.weights[field]) for field in SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, {weights}), rowid DESC "
+                "LIMIT %s OFFSET %s",
+                [expression, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query: str) -> int:
+        expression = self.get_match_expression(query)
+        if not expression:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {self.table} MATCH %s",
+                [expression],
+            )
+            return cursor.fetchone()[0]
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Fallback for databases without FTS5: icontains lookups over recipe fields,
+    recipes matching the query in the title go first. Keeps no index, so
+    index writes are no-ops.
+    """
+
+    def setup(self) -> None:
+        pass
+
+    def index(self, documents: Iterable[dict]) -> None:
+        pass
+
+    def remove(self, recipe_ids: Iterable[int]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def get_queryset(self, query: str):
+        terms = get_search_terms(query)
+        if not terms:
+            return Recipe.objects.none()
+
+        queryset = Recipe.objects.all()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term)
+                | Q(short_text__icontains=term)
+                | Q(full_text__icontains=term)
+                | Q(tag__name__icontains=term)
+                | Q(ingredientsinrecipe__ingredient__name__icontains=term)
+            )
+        return queryset.distinct()
+
+    def search(self, query: str, offset: int, limit: int) -> List[int]:
+        terms = get_search_terms(query)
+        queryset = self.get_queryset(query).annotate(
+            in_title=Case(
+                When(Q(*(Q(title__icontains=term) for term in terms)), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        return list(
+            queryset.order_by("-in_title", "-pub_date", "-id").values_list(
+                "id", flat=True
+            )[offset : offset + limit]
+        )
+
+    def count(self, query: str) -> int:
+        return self.get_queryset(query).count()
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """Backend suitable for the database in use"""
+
+    if connection.vendor == "sqlite":
+        return SQLiteFTS5Backend()
+    return DatabaseSearchBackend()
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from src.apps.ingredients.models import IngredientInRecipe
+
+
+class IngredientMatch(NamedTuple):
+    recipe_id: int
+    matched: int
+    missing: int
+
+
+def iter_bits(bitset: int) -> Iterable[int]:
+    """Positions of set bits from the lowest"""
+
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+def to_bitset(positions: Iterable[int]) -> int:
+    """Bitset with the given positions set, built in one pass"""
+
+    positions = list(positions)
+    if not positions:
+        return 0
+    bits = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+class IngredientIndex:
+    """
+    Process-local inverted index of ingredient id → bitset of recipe ids,
+    where bit n is set when the recipe with id n uses the ingredient.
+
+    Recipes are grouped into bitsets by the number of their ingredients, so a
+    query is a few bitwise operations over the postings of the given
+    ingredients. The index is built from IngredientInRecipe on first use,
+    updated on recipe writes of the process and fully rebuilt after ttl
+    seconds to pick up writes of other processes. Only the first build blocks
+    searches, a stale index keeps being served while a single background
+    thread rebuilds it. Recipes written during a build are reloaded after the
+    built index is swapped in, so the build does not lose their updates.
+
+    Attrs:
+    • ttl (float): seconds after which the index is rebuilt.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._postings: Dict[int, int] = {}
+        self._sizes: Dict[int, int] = {}
+        self._recipes: Dict[int, Set[int]] = {}
+        self._built_at: float = 0
+        self._pending: Optional[Set[int]] = None
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self.rebuild_thread: Optional[threading.Thread] = None
+
+    def _add(self, recipe_id: int, ingredient_ids: Set[int]) -> None:
+        bit = 1 << recipe_id
+        for ingredient_id in ingredient_ids:
+            self._postings[ingredient_id] = self._postings.get(ingredient_id, 0) | bit
+        self._sizes[len(ingredient_ids)] = self._sizes.get(len(ingredient_ids), 0) | bit
+        self._recipes[recipe_id] = ingredient_ids
+
+    def _remove(self, recipe_id: int) -> None:
+        ingredient_ids = self._recipes.pop(recipe_id, None)
+        if ingredient_ids is None:
+            return
+        mask = ~(1 << recipe_id)
+        for ingredient_id in ingredient_ids:
+            self._postings[ingredient_id] &= mask
+        self._sizes[len(ingredient_ids)] &= mask
+
+    def _record(self, recipe_ids: Set[int]) -> None:
+        """Remember recipes written while the index is being built"""
+
+        with self._lock:
+            if self._pending is not None:
+                self._pending |= recipe_ids
+
+    def build(self) -> None:
+        """Build the index from all ingredients in recipes"""
+
+        with self._lock:
+            self._pending = set()
+        try:
+            postings, sizes, recipes = self._load()
+            with self._lock:
+                self._postings, self._sizes, self._recipes = postings, sizes, recipes
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+        self.update_recipes(pending)
+
+    def _load(self) -> Tuple[Dict[int, int], Dict[int, int], Dict[int, Set[int]]]:
+        """Postings, recipes by size and ingredients of all recipes"""
+
+        recipes: Dict[int, Set[int]] = defaultdict(set)
+        for recipe_id, ingredient_id in IngredientInRecipe.objects.filter(
+            ingredient__isnull=False
+        ).values_list("recipe_id", "ingredient_id"):
+            recipes[recipe_id].add(ingredient_id)
+
+        by_ingredient: Dict[int, List[int]] = defaultdict(list)
+        by_size: Dict[int, List[int]] = defaultdict(list)
+        for recipe_id, ingredient_ids in recipes.items():
+            for ingredient_id in ingredient_ids:
+                by_ingredient[ingredient_id].append(recipe_id)
+            by_size[len(ingredient_ids)].append(recipe_id)
+        postings = {key: to_bitset(ids) for key, ids in by_ingredient.items()}
+        sizes = {key: to_bitset(ids) for key, ids in by_size.items()}
+        return postings, sizes, dict(recipes)
+
+    def reset(self) -> None:
+        """Drop the index, it is rebuilt on the next search"""
+
+        with self._lock:
+            self._postings, self._sizes, self._recipes = {}, {}, {}
+            self._built_at = 0
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self.build()
+        finally:
+            # the thread has its own database connection
+            connection.close()
+            self._build_lock.release()
+
+    def ensure_built(self) -> None:
+        if not self._built_at:
+            with self._build_lock:
+                if not self._built_at:
+                    self.build()
+        elif time.monotonic() - self._built_at >= self.ttl:
+            if self._build_lock.acquire(blocking=False):
+                self.rebuild_thread = threading.Thread(
+                    target=self._rebuild_in_background, daemon=True
+                )
+                self.rebuild_thread.start()
+
+    def update_recipes(self, recipe_ids: Iterable[int]) -> None:
+        """Reload ingredients of written recipes, if the index is built"""
+
+        recipe_ids = set(recipe_ids)
+        self._record(recipe_ids)
+        if not self._built_at or not recipe_ids:
+            return
+
+        recipes: Dict[int, Set[int]] = defaultdict(set)
+        for recipe_id, ingredient_id in IngredientInRecipe.objects.filter(
+            recipe_id__in=recipe_ids, ingredient__isnull=False
+        ).values_list("recipe_id", "ingredient_id"):
+            recipes[recipe_id].add(ingredient_id)
+
+        with self._lock:
+            for recipe_id in recipe_ids:
+                self._remove(recipe_id)
+                if recipes[recipe_id]:
+                    self._add(recipe_id, recipes[recipe_id])
+
+    def remove_recipes(self, recipe_ids: Iterable[int]) -> None:
+        recipe_ids = set(recipe_ids)
+        with self._lock:
+            self._record(recipe_ids)
+            for recipe_id in recipe_ids:
+                self._remove(recipe_id)
+
+    def search(self, ingredient_ids: Iterable[int], max_missing: int = 0):
+        """
+        Recipes using at least one of the ingredients and missing at most
+        max_missing other ingredients. Sorted by the number of missing
+        ingredients, then by the number of matched ones, newest first.
+        """
+
+        self.ensure_built()
+        with self._lock:
+            postings = [
+                self._postings.get(ingredient_id, 0)
+                for ingredient_id in set(ingredient_ids)
+            ]
+            sizes = dict(self._sizes)
+
+        # bit-sliced counters: bit n of counters[i] is bit i of the number
+        # of given ingredients used by the recipe n
+        counters: List[int] = []
+        candidates: int = 0
+        for posting in postings:
+            candidates |= posting
+            carry = posting
+            for position, counter in enumerate(counters):
+                counters[position], carry = counter ^ carry, counter & carry
+                if not carry:
+                    break
+            if carry:
+                counters.append(carry)
+
+        matches: List[IngredientMatch] = []
+        for missing in range(max_missing + 1):
+            for matched in range(len(postings), 0, -1):
+                if matched >> len(counters):
+                    continue
+                recipes = candidates & sizes.get(matched + missing, 0)
+                for position, counter in enumerate(counters):
+                    recipes &= counter if matched >> position & 1 else ~counter
+                    if not recipes:
+                        break
+                matches += [
+                    IngredientMatch(recipe_id, matched, missing)
+                    for recipe_id in sorted(iter_bits(recipes), reverse=True)
+                ]
+        return matches
+
+
+ingredient_index = IngredientIndex(settings.INGREDIENT_INDEX_TTL)
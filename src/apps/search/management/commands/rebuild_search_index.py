@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.search.services import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Recreate the full-text recipe search index.
+
+    Should be run after loading fixtures or renaming tags and ingredients.
+    """
+
+    help = "Rebuild recipe search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of recipes indexed per query",
+        )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} recipes"))
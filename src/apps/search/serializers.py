@@ -0,0 +1,18 @@
+from rest_framework.serializers import IntegerField
+
+from src.apps.feed.serializers import FeedSerializer
+
+
+class IngredientSearchSerializer(FeedSerializer):
+    """
+    Recipe found by ingredients with counts of matched and missing ingredients
+    """
+
+    matched_ingredients = IntegerField(read_only=True)
+    missing_ingredients = IntegerField(read_only=True)
+
+    class Meta(FeedSerializer.Meta):
+        fields = FeedSerializer.Meta.fields + (
+            "matched_ingredients",
+            "missing_ingredients",
+        )
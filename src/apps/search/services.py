@@ -0,0 +1,132 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.db.models import QuerySet
+from taggit.models import TaggedItem
+
+from src.apps.ingredients.models import IngredientInRecipe
+from src.apps.recipes.models import Recipe
+from .backends import BaseSearchBackend, get_search_backend
+from .ingredient_index import IngredientMatch
+
+
+def build_documents(recipe_ids: Iterable[int]) -> List[dict]:
+    """Search documents of recipes with names of their tags and ingredients"""
+
+    recipe_ids = list(recipe_ids)
+    tags: Dict[int, List[str]] = defaultdict(list)
+    for recipe_id, name in TaggedItem.objects.filter(
+        content_type__app_label="recipes",
+        content_type__model="recipe",
+        object_id__in=recipe_ids,
+    ).values_list("object_id", "tag__name"):
+        tags[recipe_id].append(name)
+
+    ingredients: Dict[int, List[str]] = defaultdict(list)
+    for recipe_id, name in IngredientInRecipe.objects.filter(
+        recipe_id__in=recipe_ids, ingredient__isnull=False
+    ).values_list("recipe_id", "ingredient__name"):
+        ingredients[recipe_id].append(name)
+
+    return [
+        {
+            "id": recipe["id"],
+            "title": recipe["title"],
+            "short_text": recipe["short_text"] or "",
+            "full_text": recipe["full_text"],
+            "tags": " ".join(tags[recipe["id"]]),
+            "ingredients": " ".join(ingredients[recipe["id"]]),
+        }
+        for recipe in Recipe.objects.filter(id__in=recipe_ids).values(
+            "id", "title", "short_text", "full_text"
+        )
+    ]
+
+
+def index_recipes(recipe_ids: Iterable[int]) -> None:
+    """Add or replace recipes in the search index"""
+
+    get_search_backend().index(build_documents(recipe_ids))
+
+
+def remove_recipes(recipe_ids: Iterable[int]) -> None:
+    get_search_backend().remove(recipe_ids)
+
+
+def rebuild_search_index(chunk_size: int = 500) -> int:
+    """Recreate the search index of all recipes in chunks"""
+
+    backend = get_search_backend()
+    backend.setup()
+    backend.clear()
+    indexed: int = 0
+    last_id: int = 0
+
+    while True:
+        recipe_ids = list(
+            Recipe.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not recipe_ids:
+            return indexed
+
+        backend.index(build_documents(recipe_ids))
+        indexed += len(recipe_ids)
+        last_id = recipe_ids[-1]
+
+
+class SearchResults:
+    """
+    Lazy ranked search results, sliced by the paginator.
+    Only the recipes of the requested page are fetched from the queryset.
+    """
+
+    def __init__(self, query: str, queryset: QuerySet, backend: BaseSearchBackend):
+        self.query = query
+        self.queryset = queryset
+        self.backend = backend
+
+    def count(self) -> int:
+        return self.backend.count(self.query)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, page: slice) -> List[Recipe]:
+        if page.stop <= page.start:
+            return []
+        recipe_ids = self.backend.search(self.query, page.start, page.stop - page.start)
+        recipes = self.queryset.in_bulk(recipe_ids)
+        return [recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes]
+
+
+class IngredientSearchResults:
+    """
+    Recipes matched by ingredients, sliced by the paginator.
+    Recipes of a page get matched_ingredients and missing_ingredients counts.
+    """
+
+    def __init__(self, matches: List[IngredientMatch], queryset: QuerySet):
+        self.matches = matches
+        self.queryset = queryset
+
+    def count(self) -> int:
+        return len(self.matches)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, page: slice) -> List[Recipe]:
+        matches = self.matches[page]
+        if not matches:
+            return []
+        recipes = self.queryset.in_bulk([match.recipe_id for match in matches])
+        page_recipes: List[Recipe] = []
+        for match in matches:
+            recipe = recipes.get(match.recipe_id)
+            if recipe is not None:
+                recipe.matched_ingredients = match.matched
+                recipe.missing_ingredients = match.missing
+                page_recipes.append(recipe)
+        return page_recipes
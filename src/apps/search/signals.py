@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag
+
+from src.apps.ingredients.models import Ingredient
+from src.apps.recipes.models import Recipe
+from .autocomplete import AUTOCOMPLETE_SOURCES, refresh_recipe_suggestions
+from .backends import get_search_backend
+from .ingredient_index import ingredient_index
+from .services import index_recipes, remove_recipes
+
+
+def setup_search_index(sender, **kwargs):
+    get_search_backend().setup()
+
+
+@receiver(post_save, sender=Recipe)
+def index_saved_recipe(sender, instance, raw=False, **kwargs):
+    """Index after commit, when tags and ingredients of the recipe are saved"""
+
+    if not raw:
+        transaction.on_commit(lambda: index_recipes([instance.id]))
+        transaction.on_commit(lambda: ingredient_index.update_recipes([instance.id]))
+        transaction.on_commit(lambda: refresh_recipe_suggestions(instance.id))
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_deleted_recipe(sender, instance, **kwargs):
+    recipe_id = instance.id
+    transaction.on_commit(lambda: remove_recipes([recipe_id]))
+    transaction.on_commit(lambda: ingredient_index.remove_recipes([recipe_id]))
+    transaction.on_commit(lambda: AUTOCOMPLETE_SOURCES["recipes"].refresh([recipe_id]))
+
+
+# fields the suggestions are built from, other saves (e.g. of last_login)
+# do not touch the indexes
+INDEXED_FIELDS = {
+    Tag: {"name"},
+    Ingredient: {"name"},
+    get_user_model(): {"username", "display_name", "is_active", "is_banned"},
+}
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def refresh_suggestion(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Apply written or deleted users, tags and ingredients to autocomplete"""
+
+    if update_fields is not None and not INDEXED_FIELDS[sender] & update_fields:
+        return
+
+    source = AUTOCOMPLETE_SOURCES[
+        {Tag: "tags", Ingredient: "ingredients"}.get(sender, "users")
+    ]
+    key = instance.pk
+    if not raw:
+        transaction.on_commit(lambda: source.refresh([key]))
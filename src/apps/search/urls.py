@@ -0,0 +1,12 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import AutocompleteViewSet, IngredientSearchList, RecipeSearchList
+
+router = DefaultRouter()
+router.register(
+    r"search/ingredients", IngredientSearchList, basename="ingredient-search"
+)
+router.register(r"search", RecipeSearchList, basename="search")
+router.register(r"autocomplete", AutocompleteViewSet, basename="autocomplete")
+
+urlpatterns = router.urls
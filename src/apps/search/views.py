@@ -0,0 +1,126 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from src.apps.feed.views import FeedUserList
+from src.apps.ingredients.models import Ingredient
+from src.apps.ingredients.services import get_ids
+from src.base.code_text import (
+    EMPTY_SEARCH_QUERY,
+    EMPTY_INGREDIENTS_QUERY,
+    TOO_MANY_INGREDIENTS_IN_QUERY,
+    INVALID_MISSING_INGREDIENTS,
+    INVALID_AUTOCOMPLETE_TYPE,
+)
+from src.base.paginators import SearchPagination
+from .autocomplete import AUTOCOMPLETE_SOURCES
+from .backends import get_search_backend
+from .ingredient_index import ingredient_index
+from .serializers import IngredientSearchSerializer
+from .services import IngredientSearchResults, SearchResults
+
+
+class RecipeSearchList(FeedUserList):
+    """
+    Full-text search of recipes by title, texts, tags and ingredients,
+    ranked by relevance
+    """
+
+    pagination_class = SearchPagination
+    filter_backends = []
+
+    def list(self, request, *args, **kwargs):
+        """Getting a page of recipes matching ?q= ordered by relevance"""
+
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError(EMPTY_SEARCH_QUERY, code="empty_query")
+
+        results = SearchResults(query, self.get_queryset(), get_search_backend())
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+
+class IngredientSearchList(FeedUserList):
+    """
+    Recipes, that can be cooked with the given ingredients, ranked by coverage
+    """
+
+    pagination_class = SearchPagination
+    serializer_class = IngredientSearchSerializer
+    filter_backends = []
+
+    def get_max_missing(self):
+        try:
+            max_missing = int(self.request.query_params.get("missing", 0))
+        except ValueError:
+            max_missing = -1
+        if max_missing < 0:
+            raise ValidationError(INVALID_MISSING_INGREDIENTS, code="invalid_missing")
+        return min(max_missing, settings.INGREDIENT_SEARCH_MAX_MISSING)
+
+    def list(self, request, *args, **kwargs):
+        """Getting recipes using ?ingredients= (comma-separated names).
+
+        Recipes missing at most ?missing= other ingredients are included,
+        ones with fewer missing and more matched ingredients go first.
+        """
+
+        names = {
+            name.strip()
+            for name in request.query_params.get("ingredients", "").split(",")
+            if name.strip()
+        }
+        if not names:
+            raise ValidationError(EMPTY_INGREDIENTS_QUERY, code="empty_query")
+        if len(names) > settings.INGREDIENT_SEARCH_MAX_NAMES:
+            raise ValidationError(TOO_MANY_INGREDIENTS_IN_QUERY, code="too_many")
+
+        matches = ingredient_index.search(
+            get_ids(Ingredient, names).values(), self.get_max_missing()
+        )
+        results = IngredientSearchResults(matches, self.get_queryset())
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+
+class AutocompleteViewSet(GenericViewSet):
+    """
+    Suggestions for a prefix from in-memory indexes, the most popular first.
+
+    Query params:
+    • q (str): typed prefix.
+    • types (str): comma separated recipes, tags, ingredients, users (all by default).
+    • limit (int): number of suggestions of every type.
+    """
+
+    permission_classes = [AllowAny]
+    swagger_tags = ["Search"]
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", 0))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= settings.AUTOCOMPLETE_LIMIT:
+            return settings.AUTOCOMPLETE_LIMIT
+        return limit
+
+    def list(self, request, *args, **kwargs):
+        types = [
+            name for name in request.query_params.get("types", "").split(",") if name
+        ] or list(AUTOCOMPLETE_SOURCES)
+        if any(name not in AUTOCOMPLETE_SOURCES for name in types):
+            raise ValidationError(INVALID_AUTOCOMPLETE_TYPE, code="invalid_type")
+
+        prefix = request.query_params.get("q", "")
+        limit = self.get_limit()
+        return Response(
+            {name: AUTOCOMPLETE_SOURCES[name].search(prefix, limit) for name in types}
+        )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import CustomUser
+from .models import CustomUser, UserStats
 
 
 @admin.register(CustomUser)
@@ -8,3 +8,15 @@ class CustomUserAdmin(admin.ModelAdmin):
     list_display = ("id", "username", "email", "is_banned")
     list_filter = ("is_admin", "is_staff", "is_banned")
     search_fields = ("username", "email")
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "recipes_count",
+        "followers_count",
+        "following_count",
+        "rebuilt_at",
+    )
+    readonly_fields = ("rebuilt_at",)
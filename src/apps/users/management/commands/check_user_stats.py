@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.users.services import find_inconsistent_user_stats, rebuild_user_stats
+
+
+class Command(BaseCommand):
+    """
+    Compare stored user counters with a recount and optionally repair them.
+    """
+
+    help = "Check consistency of denormalized user counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of users recounted per query",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild counters of inconsistent users",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = find_inconsistent_user_stats(chunk_size=options["chunk_size"])
+        if not user_ids:
+            self.stdout.write(self.style.SUCCESS("User counters are consistent"))
+            return
+
+        self.stdout.write(
+            self.style.WARNING(
+                f"Inconsistent counters of {len(user_ids)} users: "
+                f"{', '.join(map(str, user_ids[:100]))}"
+            )
+        )
+        if options["fix"]:
+            rebuild_user_stats(user_ids, chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS("Inconsistent counters rebuilt"))
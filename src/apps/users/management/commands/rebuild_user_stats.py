@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.users.services import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    """
+    Recount (backfill) user counters used by the users list.
+    """
+
+    help = "Rebuild materialized user statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of users recounted per query",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_user_stats(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats of {rebuilt} users"))
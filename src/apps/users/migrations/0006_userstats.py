@@ -0,0 +1,74 @@
+# Generated by Django 4.2.6 on 2026-10-18 20:07
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_user_stats(apps, schema_editor):
+    CustomUser = apps.get_model("users", "CustomUser")
+    Recipe = apps.get_model("recipes", "Recipe")
+    Follow = apps.get_model("follow", "Follow")
+    UserStats = apps.get_model("users", "UserStats")
+
+    def count_by(queryset, field):
+        return dict(queryset.order_by().values_list(field).annotate(count=Count("pk")))
+
+    recipes = count_by(Recipe.objects.all(), "author_id")
+    followers = count_by(Follow.objects.all(), "author_id")
+    following = count_by(Follow.objects.all(), "user_id")
+    UserStats.objects.bulk_create(
+        [
+            UserStats(
+                user_id=user_id,
+                recipes_count=recipes.get(user_id, 0),
+                followers_count=followers.get(user_id, 0),
+                following_count=following.get(user_id, 0),
+            )
+            for user_id in CustomUser.objects.values_list("pk", flat=True)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_alter_customuser_options_alter_customuser_managers_and_more"),
+        ("recipes", "0015_recipesimilarity"),
+        ("follow", "0002_follow_same_follower_constraint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("recipes_count", models.PositiveIntegerField(default=0)),
+                ("followers_count", models.PositiveIntegerField(default=0)),
+                ("following_count", models.PositiveIntegerField(default=0)),
+                ("rebuilt_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "User stats",
+                "verbose_name_plural": "User stats",
+                "indexes": [
+                    models.Index(
+                        fields=["recipes_count", "user"],
+                        name="users_users_recipes_c86613_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_user_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.6 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_userstats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UsernameSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Username sequence",
+                "verbose_name_plural": "Username sequences",
+            },
+        ),
+    ]
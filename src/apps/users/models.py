@@ -2,12 +2,21 @@ from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
 from django.core.validators import FileExtensionValidator, RegexValidator
+from django.db import IntegrityError
 from django.db.models import (
+    F,
     Max,
+    CASCADE,
+    BigIntegerField,
     CharField,
     EmailField,
     BooleanField,
     ImageField,
+    Index,
+    Model,
+    OneToOneField,
+    PositiveIntegerField,
+    DateTimeField,
     Q,
     CheckConstraint,
     UniqueConstraint,
@@ -15,11 +24,7 @@ from django.db.models import (
 from django.db.transaction import atomic
 from phonenumber_field.modelfields import PhoneNumberField
 
-from src.base.services import (
-    validate_avatar_size,
-    user_avatar_path,
-    generate_username,
-)
+from src.base.services import validate_avatar_size, user_avatar_path
 
 
 class CustomUserManager(BaseUserManager):
@@ -33,16 +38,38 @@ class CustomUserManager(BaseUserManager):
         """
         with atomic():
             email = self.normalize_email(email)
-
-            max_id = CustomUser.objects.aggregate(Max("id"))["id__max"] or 0
-            username_postfix = max_id + 1
-            username = generate_username(username_postfix, CustomUser)
+            username = self.allocate_username()
 
             user = self.model(email=email, username=username, **extra_fields)
             user.set_password(password)
             user.save(using=self._db)
             return user
 
+    def allocate_username(self) -> str:
+        """
+        Allocate a unique "user<n>" username from the username sequence.
+
+        If the next username is taken (e.g. renamed by an admin), a batch of
+        numbers is reserved and probed with a single IN query.
+        """
+
+        username = f"user{UsernameSequence.next_value()}"
+        if not self.filter(username=username).exists():
+            return username
+
+        while True:
+            last = UsernameSequence.next_value(settings.USERNAME_PROBE_BATCH)
+            candidates = [
+                f"user{number}"
+                for number in range(last - settings.USERNAME_PROBE_BATCH + 1, last + 1)
+            ]
+            taken = set(
+                self.filter(username__in=candidates).values_list("username", flat=True)
+            )
+            for candidate in candidates:
+                if candidate not in taken:
+                    return candidate
+
     def create_superuser(self, email, username=None, password=None, **extra_fields):
         """
         Create and save a SuperUser with the given email and password.
@@ -56,6 +83,50 @@ class CustomUserManager(BaseUserManager):
         return self.create_user(email, username, password, **extra_fields)
 
 
+class UsernameSequence(Model):
+    """
+    Sequence of numbers of generated usernames. A single row is incremented
+    atomically, so parallel signups never get the same number.
+
+    Attrs:
+    • name (CharField): name of the sequence.
+    • last_value (BigIntegerField): last allocated number.
+    """
+
+    DEFAULT_NAME = "username"
+
+    name = CharField(max_length=50, unique=True)
+    last_value = BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Username sequence"
+        verbose_name_plural = "Username sequences"
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
+
+    @classmethod
+    def next_value(cls, step: int = 1, name: str = DEFAULT_NAME) -> int:
+        """
+        Atomically increment the sequence by step and return its new value.
+        A new sequence is seeded from the largest user id.
+        """
+
+        sequence = cls.objects.filter(name=name)
+        with atomic():
+            if sequence.update(last_value=F("last_value") + step):
+                return sequence.values_list("last_value", flat=True).get()
+
+        last_value = CustomUser.objects.aggregate(Max("id"))["id__max"] or 0
+        try:
+            with atomic():
+                cls.objects.create(name=name, last_value=last_value + step)
+            return last_value + step
+        except IntegrityError:
+            # the sequence was created by a parallel signup
+            return cls.next_value(step, name)
+
+
 class CustomUser(AbstractUser, PermissionsMixin):
     """
     Custom user model.
@@ -156,3 +227,35 @@ class CustomUser(AbstractUser, PermissionsMixin):
         """
 
         return self.username
+
+
+class UserStats(Model):
+    """
+    User counters materialized from recipes and subscriptions. Kept up to date
+    by signals and rebuilt by the `rebuild_user_stats` management command.
+
+    Attrs:
+    • user (OneToOneField): user the statistics belong to.
+    • recipes_count (PositiveIntegerField): count of recipes of the user.
+    • followers_count (PositiveIntegerField): count of users following the user.
+    • following_count (PositiveIntegerField): count of authors the user follows.
+    • rebuilt_at (DateTimeField): last time the statistics were fully recounted.
+    """
+
+    user = OneToOneField(
+        CustomUser, on_delete=CASCADE, primary_key=True, related_name="stats"
+    )
+    recipes_count = PositiveIntegerField(default=0)
+    followers_count = PositiveIntegerField(default=0)
+    following_count = PositiveIntegerField(default=0)
+    rebuilt_at = DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            Index(fields=["recipes_count", "user"]),
+        ]
+        verbose_name = "User stats"
+        verbose_name_plural = "User stats"
+
+    def __str__(self):
+        return f"Stats of {self.user_id}"
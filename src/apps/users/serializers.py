@@ -43,6 +43,12 @@ class CustomUserSerializer(serializers.ModelSerializer):
     is_staff = serializers.BooleanField(required=False, read_only=True)
     is_admin = serializers.BooleanField(required=False, read_only=True)
     date_joined = serializers.DateTimeField(read_only=True)
+    followers_count = serializers.IntegerField(
+        source="stats.followers_count", read_only=True
+    )
+    following_count = serializers.IntegerField(
+        source="stats.following_count", read_only=True
+    )
 
     class Meta:
         model = get_user_model()
@@ -62,6 +68,8 @@ class CustomUserSerializer(serializers.ModelSerializer):
             "is_active",
             "is_staff",
             "is_admin",
+            "followers_count",
+            "following_count",
         ]
 
 
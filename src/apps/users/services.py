@@ -0,0 +1,135 @@
+from typing import Iterable, List, Optional
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from src.base.services import count_subquery
+from .models import CustomUser, UserStats
+
+USER_STATS_FIELDS = (
+    "recipes_count",
+    "followers_count",
+    "following_count",
+    "rebuilt_at",
+)
+
+
+def update_user_stats(user_id: int, counter: str, delta: int) -> None:
+    """
+    Atomically shift one of the user counters by delta. Missing statistics are
+    rebuilt on increments only, decrements may come from deleting the user.
+    """
+
+    updated = UserStats.objects.filter(user_id=user_id).update(
+        **{f"{counter}_count": Greatest(F(f"{counter}_count") + delta, Value(0))}
+    )
+    if not updated and delta > 0:
+        rebuild_user_stats([user_id])
+
+
+def update_follow_stats(user_id: int, author_ids: List[int], delta: int) -> None:
+    """
+    Shift counters of the user subscribed to (delta=1) or unsubscribed from
+    (delta=-1) the given authors, with one update of all authors.
+    """
+
+    if not author_ids:
+        return
+    updated = UserStats.objects.filter(user_id__in=author_ids).update(
+        followers_count=Greatest(F("followers_count") + delta, Value(0))
+    )
+    if updated < len(author_ids) and delta > 0:
+        rebuild_user_stats(author_ids)
+    update_user_stats(user_id, "following", delta * len(author_ids))
+
+
+def rebuild_user_stats(
+    user_ids: Optional[Iterable[int]] = None, chunk_size: int = 500
+) -> int:
+    """
+    Recount statistics of the given users (all users by default) in chunks
+    and upsert them into UserStats. Returns the number of rebuilt rows.
+    """
+
+    queryset = CustomUser.objects.order_by("pk").annotate(
+        recipes_total=count_subquery(Recipe.objects.all(), "author"),
+        followers_total=count_subquery(Follow.objects.all(), "author"),
+        following_total=count_subquery(Follow.objects.all(), "user"),
+    )
+    if user_ids is not None:
+        queryset = queryset.filter(pk__in=list(user_ids))
+
+    now = timezone.now()
+    rebuilt: int = 0
+    last_id: int = 0
+
+    while True:
+        stats: List[UserStats] = [
+            UserStats(
+                user_id=row["pk"],
+                recipes_count=row["recipes_total"],
+                followers_count=row["followers_total"],
+                following_count=row["following_total"],
+                rebuilt_at=now,
+            )
+            for row in queryset.filter(pk__gt=last_id).values(
+                "pk", "recipes_total", "followers_total", "following_total"
+            )[:chunk_size]
+        ]
+        if not stats:
+            return rebuilt
+
+        UserStats.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=USER_STATS_FIELDS,
+        )
+        rebuilt += len(stats)
+        last_id = stats[-1].user_id
+
+
+def find_inconsistent_user_stats(chunk_size: int = 500) -> List[int]:
+    """
+    Recount counters in chunks and return ids of users whose stored counters
+    differ from the recount or whose statistics are missing.
+    """
+
+    queryset = CustomUser.objects.order_by("pk").annotate(
+        recipes_total=count_subquery(Recipe.objects.all(), "author"),
+        followers_total=count_subquery(Follow.objects.all(), "author"),
+        following_total=count_subquery(Follow.objects.all(), "user"),
+        stored_recipes=F("stats__recipes_count"),
+        stored_followers=F("stats__followers_count"),
+        stored_following=F("stats__following_count"),
+    )
+    inconsistent: List[int] = []
+    last_id: int = 0
+
+    while True:
+        chunk = list(
+            queryset.filter(pk__gt=last_id).values(
+                "pk",
+                "recipes_total",
+                "followers_total",
+                "following_total",
+                "stored_recipes",
+                "stored_followers",
+                "stored_following",
+            )[:chunk_size]
+        )
+        if not chunk:
+            return inconsistent
+
+        inconsistent += [
+            row["pk"]
+            for row in chunk
+            if any(
+                row[f"stored_{counter}"] != row[f"{counter}_total"]
+                for counter in ("recipes", "followers", "following")
+            )
+        ]
+        last_id = chunk[-1]["pk"]
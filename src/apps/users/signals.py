@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from src.base.authentication import invalidate_auth_user
+from .models import CustomUser, UserStats
+from .services import update_user_stats
+
+
+@receiver(post_save, sender=CustomUser)
+def create_user_stats(sender, instance, created, raw=False, **kwargs):
+    """Create empty statistics for a new user"""
+
+    if created and not raw:
+        UserStats.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, raw=False, **kwargs):
+    """
+    Drop the cached authenticated user now and once more after the commit,
+    in case a parallel request cached the old row in between
+    """
+
+    if not raw:
+        invalidate_auth_user(instance.pk)
+        transaction.on_commit(lambda: invalidate_auth_user(instance.pk))
+
+
+@receiver(post_save, sender=Recipe)
+def count_created_recipe(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_user_stats(instance.author_id, "recipes", 1)
+
+
+@receiver(post_delete, sender=Recipe)
+def count_deleted_recipe(sender, instance, **kwargs):
+    update_user_stats(instance.author_id, "recipes", -1)
+
+
+@receiver(post_save, sender=Follow)
+def count_created_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_user_stats(instance.author_id, "followers", 1)
+        update_user_stats(instance.user_id, "following", 1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_deleted_follow(sender, instance, **kwargs):
+    update_user_stats(instance.author_id, "followers", -1)
+    update_user_stats(instance.user_id, "following", -1)
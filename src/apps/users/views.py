@@ -1,4 +1,4 @@
-from django.db.models import Count, Exists, OuterRef
+from django.db.models import Exists, F, OuterRef
 from djoser.views import UserViewSet
 from rest_framework.mixins import (
     ListModelMixin,
@@ -28,6 +28,13 @@ class CustomUserMeViewSet(UserViewSet):
     swagger_tags = ["CustomUser"]
     http_method_names = ["get", "post"]
 
+    def get_queryset(self):
+        """
+        Users with denormalized counters of the profile
+        """
+
+        return super().get_queryset().select_related("stats")
+
     def get_serializer_class(self):
         """
         Get serializer class for action 'me'
@@ -55,11 +62,18 @@ class ListUsersViewSet(GenericViewSet, ListModelMixin):
     def get_queryset(self):
         """
         Get all users with recipes_count, is_follow, and is_follower fields.
+
+        Users are ordered by the denormalized recipes_count, so a page is an
+        index range scan over UserStats, ?pagination=cursor switches to keyset
+        pagination. Every user has statistics: they are created with the user
+        and backfilled by the migration, `rebuild_user_stats` restores them
+        after loaddata.
         """
 
         user = self.request.user
-        queryset = CustomUser.objects.all().annotate(
-            recipes_count=Count("recipe"),
+        queryset = CustomUser.objects.filter(stats__isnull=False).annotate(
+            recipes_count=F("stats__recipes_count"),
+            stats_id=F("stats__user_id"),
         )
 
         queryset = queryset.annotate(
@@ -67,7 +81,7 @@ class ListUsersViewSet(GenericViewSet, ListModelMixin):
             is_follower=Exists(Follow.objects.filter(author=user, user=OuterRef("pk"))),
         )
 
-        return queryset.order_by("-recipes_count")
+        return queryset.order_by("-recipes_count", "-stats_id")
 
 
 class CustomUserViewSet(
@@ -88,4 +102,6 @@ class CustomUserViewSet(
         Queryset for get, update and delete user
         """
 
-        return CustomUser.objects.filter(username=self.kwargs.get("username"))
+        return CustomUser.objects.filter(
+            username=self.kwargs.get("username")
+        ).select_related("stats")
@@ -0,0 +1,157 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.transaction import atomic
+from django.http import HttpRequest
+
+from src.apps.recipes.models import Recipe
+from src.apps.recipes.services import update_recipe_stats
+from src.base.services import get_viewer_id, increment_view_count
+from .models import ViewRecipes
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedViewRecorder:
+    """
+    Write-behind recorder of recipe views.
+
+    Deduplicates views of the same viewer within TIME_FROM_VIEW_RECIPE minutes
+    in a bounded in-memory LRU and writes buffered views with bulk_create when
+    the buffer reaches batch_size or flush_interval seconds have passed. A
+    background timer flushes the buffer flush_interval seconds after the first
+    buffered view, so views are written without further traffic. Views of a
+    failed flush are put back into the buffer, the oldest views over
+    max_pending are dropped.
+
+    Attrs:
+    • batch_size (int): number of buffered views that triggers a flush.
+    • flush_interval (float): seconds after which buffered views are flushed.
+    • max_keys (int): maximum number of remembered (viewer, recipe) pairs.
+    • dedup_window (float): seconds during which a repeated view is ignored.
+    • max_pending (int): maximum number of buffered views.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.VIEW_BUFFER_SIZE,
+        flush_interval: float = settings.VIEW_BUFFER_FLUSH_INTERVAL,
+        max_keys: int = settings.VIEW_DEDUP_MAX_KEYS,
+        dedup_window: float = settings.TIME_FROM_VIEW_RECIPE * 60,
+        max_pending: int = settings.VIEW_BUFFER_MAX_PENDING,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        self.dedup_window = dedup_window
+        self.max_pending = max_pending
+        self._seen: OrderedDict = OrderedDict()
+        self._pending: List[ViewRecipes] = []
+        self._last_flush: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def _schedule_flush(self) -> None:
+        """Start the flush timer, if views are buffered. Called under the lock"""
+
+        if self._timer is None and self._pending:
+            self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # the timer thread has its own database connection
+            connection.close()
+
+    def record(self, viewer_id: str, recipe_id: int) -> bool:
+        """Buffer a view, returns False if it is a duplicate inside the window"""
+
+        now = time.monotonic()
+        key = (viewer_id, recipe_id)
+
+        with self._lock:
+            seen_at = self._seen.get(key)
+            if seen_at is not None and now - seen_at < self.dedup_window:
+                return False
+
+            self._seen[key] = now
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+
+            self._pending.append(ViewRecipes(user=viewer_id, recipe_id=recipe_id))
+            should_flush = (
+                len(self._pending) >= self.batch_size
+                or now - self._last_flush >= self.flush_interval
+            )
+            if not should_flush:
+                self._schedule_flush()
+
+        if should_flush:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write buffered views and shift recipe counters, returns views count"""
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return 0
+
+        try:
+            with atomic():
+                existing_ids = set(
+                    Recipe.objects.filter(
+                        pk__in={view.recipe_id for view in pending}
+                    ).values_list("pk", flat=True)
+                )
+                pending = [view for view in pending if view.recipe_id in existing_ids]
+                ViewRecipes.objects.bulk_create(pending, batch_size=self.batch_size)
+                for recipe_id, count in Counter(v.recipe_id for v in pending).items():
+                    update_recipe_stats(recipe_id, "views", count)
+        except DatabaseError:
+            logger.exception("Failed to flush %s buffered recipe views", len(pending))
+            self._requeue(pending)
+            return 0
+        return len(pending)
+
+    def _requeue(self, views: List[ViewRecipes]) -> None:
+        """Put views of a failed flush back before the views buffered since"""
+
+        for view in views:
+            view.pk = None
+        with self._lock:
+            self._pending[:0] = views
+            dropped = len(self._pending) - self.max_pending
+            if dropped > 0:
+                logger.warning("Dropped %s buffered recipe views", dropped)
+                del self._pending[:dropped]
+            self._schedule_flush()
+
+
+view_recorder = BufferedViewRecorder()
+atexit.register(view_recorder.flush)
+
+
+def record_view(recipe: Recipe, request: HttpRequest) -> None:
+    """Record a recipe view through the buffer or synchronously"""
+
+    if settings.VIEW_BUFFER_ENABLED:
+        view_recorder.record(get_viewer_id(request), recipe.id)
+    else:
+        increment_view_count(ViewRecipes, recipe, request)
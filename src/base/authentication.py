@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from src.base.services import (
+    bump_cache_version,
+    get_cache_version,
+    is_shared_cache,
+)
+
+
+def _get_auth_user_version_key(user_id) -> str:
+    return f"auth_user_version:{user_id}"
+
+
+def get_auth_user_cache_key(user_id) -> str:
+    """Cache key of an authenticated user stamped with the user's version"""
+
+    version: int = get_cache_version(_get_auth_user_version_key(user_id))
+    return f"auth_user:{user_id}:{version}"
+
+
+def invalidate_auth_user(user_id) -> None:
+    """Drop the cached user by incrementing the user's version"""
+
+    bump_cache_version(_get_auth_user_version_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication, that keeps users resolved from tokens in the cache
+    for AUTH_USER_CACHE_TTL seconds. Saving or deleting a user (including a
+    ban or a password change) bumps the user's version, so the next request
+    loads the user from the database again. Users are not cached, when the
+    cache is local to the process.
+    """
+
+    def get_user(self, validated_token):
+        if not is_shared_cache():
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = get_auth_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.AUTH_USER_CACHE_TTL)
+            return user
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
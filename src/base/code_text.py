@@ -27,6 +27,7 @@ DONT_HAVE_PERMISSIONS: dict = {
     "detail": "У вас недостаточно прав для выполнения данного действия."
 }
 INVALID_ID_FORMAT: dict = {"detail": "Неверный формат id."}
+INVALID_CURSOR: dict = {"detail": "Неверный курсор."}
 
 # Comment status
 COMMENT_NOT_FOUND: dict = {"detail": "Комментарий не найден."}
@@ -37,6 +38,9 @@ CANT_EDIT_COMMENT: dict = {
 }
 
 SUCCESSFUL_APPRECIATED_COMMENT: dict = {"message": "Вы оценили комментарий!"}
+INVALID_COMMENT_DEPTH: dict = {
+    "detail": "Глубина должна быть неотрицательным целым числом."
+}
 
 # User status
 USER_DOES_NOT_EXIST: dict = {"detail": "Пользователь не существует."}
@@ -53,6 +57,11 @@ SUCCESSFUL_UNSUBSCRIBE_FROM_THE_AUTHOR: dict = {
 ALREADY_SUBSCRIBED_TO_THIS_AUTHOR: dict = {
     "message": ["Вы уже подписаны на этого автора."]
 }
+CANNOT_SUBSCRIBE_TO_YOURSELF: dict = {
+    "non_field_errors": ["Нельзя подписаться на самого себя."]
+}
+INVALID_AUTHORS_LIST: dict = {"detail": "Передайте список имён авторов."}
+TOO_MANY_AUTHORS: dict = {"detail": "Слишком много авторов в одном запросе."}
 
 # Reaction status
 REACTION_ALREADY_SET: dict = {"detail": "Вы уже поставили такую реакцию."}
@@ -61,6 +70,7 @@ SUCCESSFUL_LIKED_THE_RECIPE: dict = {"message": "Вы оценили рецеп
 REACTION_CANCELLED: dict = {"message": "Реакция отменена!"}
 ALREADY_RATED_THIS_COMMENT: dict = {"detail": "Вы уже оценили данный комментарий."}
 SUCCESSFUL_RATED_COMMENT: dict = {"message": "Вы оценили комментарий!"}
+TOO_MANY_REACTION_OBJECTS: dict = {"detail": "Слишком много объектов в одном запросе."}
 
 # Recipes status
 SUCCESSFUL_APPRECIATED_RECIPE: dict = {"message": "Вы оценили рецепт!"}
@@ -86,3 +96,17 @@ CANT_ADD_TWO_SIMILAR_INGREDIENT: dict = {
 
 # Favorites status
 LIST_OF_FAVORITES_IS_EMPTY: dict = {"detail": "Список избранных рецептов пуст."}
+
+# Search status
+EMPTY_SEARCH_QUERY: dict = {"detail": "Введите поисковый запрос."}
+EMPTY_INGREDIENTS_QUERY: dict = {"detail": "Укажите хотя бы один ингредиент."}
+TOO_MANY_INGREDIENTS_IN_QUERY: dict = {
+    "detail": "Слишком много ингредиентов в одном запросе."
+}
+INVALID_AUTOCOMPLETE_TYPE: dict = {
+    "detail": "Допустимые типы подсказок: recipes, tags, ingredients, users."
+}
+INVALID_MISSING_INGREDIENTS: dict = {
+    "detail": "Количество недостающих ингредиентов должно быть неотрицательным "
+    "целым числом."
+}
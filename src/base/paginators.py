@@ -1,14 +1,190 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
+from src.base.code_text import INVALID_CURSOR
 
-class UserListPagination(PageNumberPagination):
-    page_size = settings.USER_LIST_PAGE_SIZE
-    page_size_query_param = "page_size"
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination by the first ordering field of the queryset with a
+    tiebreak on a unique field (id by default).
+
+    The cursor keeps the ordering value and id of the last row of the page, so
+    the next page is fetched with a WHERE clause instead of OFFSET and no
+    COUNT(*) query is made.
+
+    Attrs:
+    • page_size (int): number of objects on a page.
+    • cursor_query_param (str): name of query param with the cursor.
+    • cursor_fields (dict): allowed ordering fields mapped to value parsers.
+    • tiebreak_field (str): unique field ordering rows with equal values.
+    • tiebreak_fields (dict): ordering fields mapped to their own tiebreak, e.g.
+      a column of the same index.
+    """
+
+    page_size = None
+    cursor_query_param = "cursor"
+    cursor_fields = {}
+    tiebreak_field = "id"
+    tiebreak_fields = {}
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.field, self.descending = self.get_ordering(queryset)
+        self.tiebreak_field = self.tiebreak_fields.get(self.field, self.tiebreak_field)
+
+        queryset = queryset.order_by(*self.get_order_by())
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_seek_filter(*cursor))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_ordering(self, queryset):
+        """Return the ordering field and its direction"""
+
+        ordering = [str(field) for field in queryset.query.order_by]
+        field = ordering[0] if ordering else "-pk"
+        name = field.lstrip("-")
+        if name not in self.cursor_fields:
+            raise NotFound(INVALID_CURSOR, code="invalid_ordering")
+        return name, field.startswith("-")
+
+    def get_order_by(self):
+        prefix = "-" if self.descending else ""
+        return f"{prefix}{self.field}", f"{prefix}{self.tiebreak_field}"
+
+    def get_seek_filter(self, value, last_id):
+        """
+        Rows placed after (value, last_id) in the current ordering. The extra
+        non-strict bound on the field lets the database seek the index.
+        """
+
+        lookup = "lt" if self.descending else "gt"
+        return Q(**{f"{self.field}__{lookup}e": value}) & (
+            Q(**{f"{self.field}__{lookup}": value})
+            | Q(**{self.field: value, f"{self.tiebreak_field}__{lookup}": last_id})
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            value, last_id = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            return self.cursor_fields[self.field](value), int(last_id)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(INVALID_CURSOR, code="invalid_cursor")
+
+    def encode_cursor(self, instance):
+        value = getattr(instance, self.field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        position = json.dumps([value, getattr(instance, self.tiebreak_field)])
+        return urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+def parse_cursor_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+class FeedKeysetPagination(KeysetPagination):
+    page_size = settings.FEED_PAGE_SIZE
+    cursor_fields = {"pub_date": parse_cursor_datetime, "activity_count": int}
+    tiebreak_fields = {"activity_count": "stats_id"}
 
 
 class FeedPagination(PageNumberPagination):
+    """
+    Page number pagination for feed with an opt-in cursor mode
+    (?pagination=cursor), that switches to keyset pagination.
+    """
+
+    page_size = settings.FEED_PAGE_SIZE
+    mode_query_param = "pagination"
+    keyset_class = FeedKeysetPagination
+
+    def is_keyset_requested(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.is_keyset_requested(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class ForYouPagination(PageNumberPagination):
+    page_size = settings.FEED_PAGE_SIZE
+
+
+class FavoritesKeysetPagination(KeysetPagination):
     page_size = settings.FEED_PAGE_SIZE
+    cursor_fields = {"favorited_at": parse_cursor_datetime}
+
+
+class FavoritesPagination(FeedPagination):
+    keyset_class = FavoritesKeysetPagination
+
+
+class UserListKeysetPagination(KeysetPagination):
+    page_size = settings.USER_LIST_PAGE_SIZE
+    cursor_fields = {"recipes_count": int}
+    tiebreak_field = "stats_id"
+
+
+class UserListPagination(FeedPagination):
+    page_size = settings.USER_LIST_PAGE_SIZE
+    page_size_query_param = "page_size"
+    keyset_class = UserListKeysetPagination
 
 
 class FollowerPagination(PageNumberPagination):
@@ -17,3 +193,7 @@ class FollowerPagination(PageNumberPagination):
 
 class CommentPagination(PageNumberPagination):
     page_size = settings.COMMENT_PAGE_SIZE
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = settings.SEARCH_PAGE_SIZE
@@ -1,21 +1,31 @@
+import time
 from datetime import timedelta
-from typing import List, Any, Set
+from typing import Dict, List, Any, Optional
 
-from random import sample
 from typing import Type
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
 from rest_framework.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Count, Model
+from django.db.models import (
+    Count,
+    IntegerField,
+    Model,
+    OuterRef,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.http import HttpRequest
 from django.utils import timezone
-from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
-from unidecode import unidecode
 
 from config.settings import SHORT_RECIPE_SYMBOLS, TIME_FROM_VIEW_RECIPE
 from src.apps.ingredients.models import Ingredient, Unit, IngredientInRecipe
+from src.apps.ingredients.services import get_or_create_ids
+from src.apps.reactions.models import ReactionCounter
 from src.base.code_text import (
     CANT_ADD_TWO_SIMILAR_INGREDIENT,
 )
@@ -53,84 +63,93 @@ def shorten_text(full_text: str, n: int) -> str:
     return short_text
 
 
-def bulk_get_or_create(
-    model: Type[Model], objs: List[Model], match_field: str
-) -> List[Model]:
-    """
-    Bulk get or create objects
+def create_ingredients_in_recipe(recipe: Model, ingredients_data: List[dict]) -> None:
     """
+    Create or update ingredients in recipe.
 
-    match_values: List[Any] = [getattr(obj, match_field) for obj in objs]
-    existing_objs: List[Model] = model.objects.filter(
-        **{f"{match_field}__in": match_values}
-    )
-
-    existing_map: dict = {getattr(obj, match_field): obj for obj in existing_objs}
-
-    objs_to_create: List[Model] = [
-        obj for obj in objs if getattr(obj, match_field) not in existing_map
-    ]
-
-    created_objs: List[Model] = model.objects.bulk_create(objs_to_create)
-    existing_map.update({getattr(obj, match_field): obj for obj in created_objs})
-    return [existing_map[value] for value in match_values]
-
-
-def create_ingredients_in_recipe(
-    recipe: Model, ingredients_data: List[dict]
-) -> List[Model]:
-    """
-    Create or update ingredients in recipe
+    Ingredients of the recipe are diffed with the data by name: missing rows
+    are inserted, rows with another amount or unit are updated and rows absent
+    in the data are deleted, one bulk statement each. Unchanged rows are not
+    touched.
     """
 
     ingredient_names: List[str] = [data["name"] for data in ingredients_data]
     if len(ingredient_names) != len(set(ingredient_names)):
         raise ValidationError(CANT_ADD_TWO_SIMILAR_INGREDIENT, code="unique_ingredient")
 
-    existing_ingredients: List[IngredientInRecipe] = IngredientInRecipe.objects.filter(
-        recipe=recipe
-    )
-    existing_ingredient_names: Set = set(
-        existing_ingredients.values_list("ingredient__name", flat=True)
-    )
-
-    ingredients_to_remove: Set = existing_ingredient_names - set(ingredient_names)
-    existing_ingredients.filter(ingredient__name__in=ingredients_to_remove).delete()
-
-    existing_ingredients: List[str] = IngredientInRecipe.objects.filter(
-        recipe=recipe, ingredient__name__in=ingredient_names
-    ).values_list("ingredient__name", flat=True)
+    existing: Dict[str, IngredientInRecipe] = {}
+    ids_to_delete: List[int] = []
+    for row in IngredientInRecipe.objects.filter(recipe=recipe).select_related(
+        "ingredient", "unit"
+    ):
+        name: Optional[str] = row.ingredient.name if row.ingredient else None
+        if name in existing or name not in ingredient_names:
+            ids_to_delete.append(row.id)
+        else:
+            existing[name] = row
 
     new_ingredients: List[dict] = [
-        data for data in ingredients_data if data["name"] not in existing_ingredients
+        data for data in ingredients_data if data["name"] not in existing
     ]
-
-    ingredient_objs: List[Ingredient] = [
-        Ingredient(name=data["name"]) for data in new_ingredients
+    changed_ingredients: List[dict] = [
+        data
+        for data in ingredients_data
+        if data["name"] in existing
+        and (
+            existing[data["name"]].amount != data["amount"]
+            or existing[data["name"]].unit is None
+            or existing[data["name"]].unit.name != data["unit"]
+        )
     ]
-    unit_names: Set[str] = {data["unit"] for data in new_ingredients}
-    unit_objs: List[Unit] = [Unit(name=name) for name in unit_names]
+    if not (ids_to_delete or new_ingredients or changed_ingredients):
+        return
 
     with transaction.atomic():
-        ingredients: dict = {
-            ingredient.name: ingredient
-            for ingredient in bulk_get_or_create(Ingredient, ingredient_objs, "name")
-        }
-        units: dict = {
-            unit.name: unit for unit in bulk_get_or_create(Unit, unit_objs, "name")
-        }
-
-    ingredients_in_recipe_objs: List[IngredientInRecipe] = [
-        IngredientInRecipe(
-            recipe=recipe,
-            ingredient=ingredients[ingredient_data["name"]],
-            unit=units[ingredient_data["unit"]],
-            amount=ingredient_data["amount"],
+        ingredients: Dict[str, int] = get_or_create_ids(
+            Ingredient, [data["name"] for data in new_ingredients]
         )
-        for ingredient_data in new_ingredients
-    ]
-    IngredientInRecipe.objects.bulk_create(ingredients_in_recipe_objs)
-    return IngredientInRecipe.objects.filter(recipe=recipe)
+        units: Dict[str, int] = get_or_create_ids(
+            Unit, [data["unit"] for data in new_ingredients + changed_ingredients]
+        )
+
+        if ids_to_delete:
+            IngredientInRecipe.objects.filter(id__in=ids_to_delete).delete()
+
+        rows_to_update: List[IngredientInRecipe] = []
+        for data in changed_ingredients:
+            row = existing[data["name"]]
+            row.amount, row.unit_id = data["amount"], units[data["unit"]]
+            rows_to_update.append(row)
+        if rows_to_update:
+            IngredientInRecipe.objects.bulk_update(rows_to_update, ["amount", "unit"])
+
+        rows_to_create: List[IngredientInRecipe] = [
+            IngredientInRecipe(
+                recipe=recipe,
+                ingredient_id=ingredients[data["name"]],
+                unit_id=units[data["unit"]],
+                amount=data["amount"],
+            )
+            for data in new_ingredients
+        ]
+        if rows_to_create:
+            IngredientInRecipe.objects.bulk_create(rows_to_create)
+            recipe.ingredients.through.objects.bulk_create(
+                [
+                    recipe.ingredients.through(
+                        recipe_id=recipe.id, ingredientinrecipe_id=row.id
+                    )
+                    for row in rows_to_create
+                ]
+            )
+
+
+def get_viewer_id(request: HttpRequest) -> str:
+    """Identify a recipe viewer by username or by IP for anonymous users"""
+
+    if request.user.is_authenticated:
+        return str(request.user)
+    return f"Anonymous-{request.META.get('REMOTE_ADDR')}"
 
 
 def increment_view_count(
@@ -138,11 +157,7 @@ def increment_view_count(
 ) -> None:
     """Increment view count"""
 
-    user_id: str = (
-        request.user
-        if request.user.is_authenticated
-        else f"Anonymous-{request.META.get('REMOTE_ADDR')}"
-    )
+    user_id: str = get_viewer_id(request)
     time_threshold: timezone.datetime = timezone.now() - timedelta(
         minutes=TIME_FROM_VIEW_RECIPE
     )
@@ -155,61 +170,15 @@ def increment_view_count(
         model.objects.create(user=user_id, recipe=recipe)
 
 
-def create_recipe_slug(model: Type[Model], data: dict, num: int = 1) -> dict:
-    """Create recipe slug"""
-
-    with transaction.atomic():
-        same_recipes: int = model.objects.filter(
-            title__startswith=data["title"]
-        ).count()
-        slug_str: str = unidecode(
-            f"{data['title']}_{same_recipes + num}" if same_recipes else data["title"]
-        )
-        data["slug"]: str = slugify(slug_str)
-
-        if model.objects.filter(slug=data["slug"]).exists():
-            num += 1
-            create_recipe_slug(model, data, num)
-
-    return data
-
-
-def generate_username(user_id: int, model: Type[Model]) -> str:
-    """
-    Generate a unique username for a user.
-
-    Args:
-        user_id (int): The ID of the user.
-        model (Type[CustomUser]): The CustomUser model class.
-
-    Returns:
-        str: A unique username for the user.
-    """
-
-    base_username: str = f"user{user_id}"
-
-    if not model.objects.filter(username=base_username).exists():
-        return base_username
-    else:
-
-        random_numbers = sample(range(100000, 1000000), 100)
-        for random_number in random_numbers:
-            new_username = f"user{random_number}"
-            if not model.objects.filter(username=new_username).exists():
-                return new_username
-
-        return generate_username(user_id, model)
-
-
 def count_reactions_on_objects(instance: Model) -> dict:
     """Count reactions made on an object by their emoji"""
 
-    reactions_queryset = (
-        instance.reactions.values("emoji")
-        .filter(is_deleted=False)
-        .annotate(count=Count("emoji"))
-    )
-    return {reaction["emoji"]: reaction["count"] for reaction in reactions_queryset}
+    counters_queryset = ReactionCounter.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.id,
+        count__gt=0,
+    ).values_list("emoji", "count")
+    return dict(counters_queryset)
 
 
 def show_user_reactions(user: Model, instance: Model) -> list:
@@ -237,3 +206,54 @@ def get_or_none(instance: Model, **kwargs):
         return instance.objects.get(**kwargs)
     except instance.DoesNotExist:
         return None
+
+
+def count_subquery(queryset: QuerySet, field: str) -> Coalesce:
+    """Correlated COUNT(*) over queryset grouped by field"""
+
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def is_shared_cache() -> bool:
+    """
+    Whether the default cache is seen by all worker processes. Entries that
+    are invalidated by version keys must not be cached in a per-process
+    LocMemCache, other workers would never see the bumped version.
+    """
+
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def get_cache_version(key: str) -> int:
+    """
+    Version stored in the cache under key, used to stamp keys of cached
+    entries. A missing version starts from the current time, so an evicted
+    version never matches older entries.
+    """
+
+    version: Optional[int] = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_cache_version(key: str) -> None:
+    """
+    Replace the version stored in the cache under key with a new one. The
+    version is set instead of incremented, because incr is not atomic in the
+    file based cache and concurrent increments could leave the same version.
+    """
+
+    cache.set(key, time.time_ns(), timeout=None)
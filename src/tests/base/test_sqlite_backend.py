@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+from django.conf import settings
+from django.db.utils import ConnectionHandler
+
+
+@pytest.fixture
+def production_connection(tmp_path, django_db_blocker):
+    """
+    Connection of the sqlite-production profile to a temporary database
+    """
+
+    handler = ConnectionHandler(
+        {
+            "default": {
+                **settings.DATABASE_PROFILES["sqlite-production"],
+                "NAME": tmp_path / "production.sqlite3",
+            }
+        }
+    )
+    connection = handler["default"]
+    with django_db_blocker.unblock():
+        yield connection
+        connection.close()
+
+
+class TestSQLiteProductionProfile:
+    """
+    Tests for the SQLite backend of the sqlite-production database profile
+    """
+
+    def get_pragma(self, connection, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_on_connect(self, production_connection):
+        """
+        Every new connection gets the pragmas of the profile
+        """
+
+        assert self.get_pragma(production_connection, "journal_mode") == "wal"
+        assert self.get_pragma(production_connection, "synchronous") == 1
+        assert self.get_pragma(production_connection, "busy_timeout") == 5000
+        assert self.get_pragma(production_connection, "temp_store") == 2
+        assert self.get_pragma(production_connection, "cache_size") == -64 * 1024
+        assert self.get_pragma(production_connection, "foreign_keys") == 1
+
+    def test_transactions_take_the_write_lock(self, production_connection):
+        """
+        Transactions begin with BEGIN IMMEDIATE, so other writers wait
+        before the first statement of the transaction
+        """
+
+        name = production_connection.settings_dict["NAME"]
+        with production_connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+
+        production_connection.set_autocommit(
+            False, force_begin_transaction_with_broken_autocommit=True
+        )
+        try:
+            other = sqlite3.connect(name, timeout=0)
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("INSERT INTO item DEFAULT VALUES")
+            other.close()
+        finally:
+            production_connection.rollback()
+            production_connection.set_autocommit(True)
+
+    def test_profile_keeps_connections(self):
+        """
+        Connections of the profile are persistent
+        """
+
+        profile = settings.DATABASE_PROFILES["sqlite-production"]
+
+        assert profile["CONN_MAX_AGE"] > 0
+        assert profile["ENGINE"] == "src.base.sqlite"
@@ -0,0 +1,103 @@
+import pytest
+from django.core.management import call_command
+
+from src.base.code_text import INVALID_COMMENT_DEPTH
+from src.apps.comments.models import Comment
+from src.apps.comments.services import create_comment
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestCommentTree:
+    """
+    Tests for threaded comments
+    [GET] http://127.0.0.1:8000/api/v1/recipe/{slug}/comments/?threaded=true
+    """
+
+    @pytest.fixture
+    def thread(self, new_user, new_recipe):
+        root = create_comment(new_user, new_recipe, "root")
+        reply = create_comment(new_user, new_recipe, "reply", parent=root)
+        nested = create_comment(new_user, new_recipe, "nested", parent=reply)
+        other_root = create_comment(new_user, new_recipe, "other root")
+        return root, reply, nested, other_root
+
+    def test_create_reply_sets_path(self, api_client, new_user, new_recipe):
+        """
+        Replies created through the API store the path of their ancestors
+        """
+
+        url = f"/api/v1/recipe/{new_recipe.slug}/comments/"
+        api_client.force_authenticate(user=new_user)
+        root_id = api_client.post(url, {"text": "root"}, format="json").data["id"]
+        reply_id = api_client.post(
+            url, {"text": "reply", "parent": root_id}, format="json"
+        ).data["id"]
+
+        root, reply = Comment.objects.get(id=root_id), Comment.objects.get(id=reply_id)
+        assert (root.path, root.depth) == ("", 0)
+        assert (reply.path, reply.depth) == (f"{root_id:010d}/", 1)
+
+    def test_threaded_list(self, client, new_recipe, thread, django_assert_num_queries):
+        """
+        Root comments are returned with nested replies in a fixed number of queries
+        """
+
+        root, reply, nested, other_root = thread
+        with django_assert_num_queries(4):
+            response = client.get(
+                f"/api/v1/recipe/{new_recipe.slug}/comments/?threaded=true"
+            )
+
+        assert response.status_code == 200
+        assert response.data["count"] == 2
+        results = {comment["id"]: comment for comment in response.data["results"]}
+        assert results[other_root.id]["replies"] == []
+        replies = results[root.id]["replies"]
+        assert [comment["id"] for comment in replies] == [reply.id]
+        assert replies[0]["parent"] == root.id
+        assert [comment["id"] for comment in replies[0]["replies"]] == [nested.id]
+
+    def test_threaded_list_depth(self, client, new_recipe, thread):
+        """
+        Replies deeper than ?depth are not returned, invalid depth returns 400
+        """
+
+        root, reply, *_ = thread
+        url = f"/api/v1/recipe/{new_recipe.slug}/comments/?threaded=true"
+        response = client.get(f"{url}&depth=1")
+        results = {comment["id"]: comment for comment in response.data["results"]}
+
+        assert [comment["id"] for comment in results[root.id]["replies"]] == [reply.id]
+        assert results[root.id]["replies"][0]["replies"] == []
+
+        response = client.get(f"{url}&depth=-1")
+        assert response.status_code == 400
+        assert response.data == INVALID_COMMENT_DEPTH
+
+    def test_delete_parent_detaches_replies(self, thread):
+        """
+        Replies of a deleted comment become roots of their own threads
+        """
+
+        root, reply, nested, _ = thread
+        root.delete()
+        reply.refresh_from_db()
+        nested.refresh_from_db()
+
+        assert (reply.parent, reply.path, reply.depth) == (None, "", 0)
+        assert (nested.path, nested.depth) == (f"{reply.id:010d}/", 1)
+
+    def test_rebuild_comment_paths(self, new_user, new_recipe):
+        """
+        Paths of comments created bypassing the API are rebuilt by the command
+        """
+
+        root = Comment.objects.create(author=new_user, recipe=new_recipe, text="1")
+        reply = Comment.objects.create(
+            author=new_user, recipe=new_recipe, text="2", parent=root
+        )
+        call_command("rebuild_comment_paths")
+        reply.refresh_from_db()
+
+        assert (reply.path, reply.depth) == (f"{root.id:010d}/", 1)
@@ -19,6 +19,15 @@ def django_db_setup(django_db_setup, django_db_blocker):
         call_command("migrate")
 
 
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """
+    Uploaded files are saved into a temporary MEDIA_ROOT.
+    """
+
+    settings.MEDIA_ROOT = tmp_path / "media"
+
+
 @pytest.fixture
 def api_client():
     """
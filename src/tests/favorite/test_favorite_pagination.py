@@ -0,0 +1,75 @@
+import pytest
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+from src.base.code_text import LIST_OF_FAVORITES_IS_EMPTY
+from src.apps.favorite.models import Favorite
+from src.tests.factories.factories import RecipeFactory
+
+
+@pytest.mark.favorite
+@pytest.mark.api
+@pytest.mark.django_db
+class TestFavoritesPagination:
+    """
+    Tests for favorites ordering and pagination
+    [GET] http://127.0.0.1:8000/api/v1/recipe/favorites/
+    """
+
+    page_size = settings.FEED_PAGE_SIZE
+
+    @pytest.fixture
+    def favorites(self, new_user):
+        now = timezone.now()
+        recipes = RecipeFactory.create_batch(self.page_size * 2 + 1)
+        favorites = [
+            Favorite.objects.create(author=new_user, recipe=recipe)
+            for recipe in recipes
+        ]
+        for position, favorite in enumerate(favorites):
+            favorite.pub_date = now - timedelta(minutes=position % 3)
+        Favorite.objects.bulk_update(favorites, ["pub_date"])
+        return sorted(favorites, key=lambda item: (item.pub_date, item.recipe_id))[::-1]
+
+    def test_ordered_by_date_added(self, api_client, new_user, favorites):
+        """
+        Recipes go in the order they were added to favorites
+        """
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.get("/api/v1/recipe/favorites/")
+
+        assert response.data["count"] == len(favorites)
+        assert [recipe["id"] for recipe in response.data["results"]] == [
+            favorite.recipe_id for favorite in favorites[: self.page_size]
+        ]
+
+    def test_cursor_pagination(
+        self, api_client, new_user, favorites, django_assert_max_num_queries
+    ):
+        """
+        Cursor mode walks all favorites in fixed number of queries per page
+        """
+
+        api_client.force_authenticate(user=new_user)
+        url, seen = "/api/v1/recipe/favorites/?pagination=cursor", []
+        while url:
+            with django_assert_max_num_queries(3):
+                response = api_client.get(url)
+            assert "count" not in response.data
+            seen += [recipe["id"] for recipe in response.data["results"]]
+            url = response.data["next"]
+
+        assert seen == [favorite.recipe_id for favorite in favorites]
+
+    def test_empty_cursor_page(self, api_client, new_user):
+        """
+        Cursor mode returns an empty page instead of the empty list message
+        """
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.get("/api/v1/recipe/favorites/?pagination=cursor")
+
+        assert response.data == {"next": None, "results": []}
+        assert response.data != LIST_OF_FAVORITES_IS_EMPTY
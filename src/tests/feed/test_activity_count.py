@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 import pytest
+from django.core.management import call_command
 from django.utils.timezone import make_aware
 
 from config.settings import ACTIVITY_INTERVAL
@@ -36,6 +37,7 @@ class TestFeedResponseFields:
             )
 
         Reaction.objects.bulk_update(old_reaction, ["pub_date"], batch_size=100)
+        call_command("rebuild_recipe_stats")
 
         url = "/api/v1/feed/?ordering=-activity_count"
 
@@ -53,6 +55,7 @@ class TestFeedResponseFields:
             )
 
         ViewRecipes.objects.bulk_update(old_view, ["created_at"], batch_size=100)
+        call_command("rebuild_recipe_stats")
 
         response = api_client.get(url)
 
@@ -72,6 +75,7 @@ class TestFeedResponseFields:
             )
 
         Comment.objects.bulk_update(old_comment, ["pub_date"], batch_size=100)
+        call_command("rebuild_recipe_stats")
 
         response = api_client.get(url)
 
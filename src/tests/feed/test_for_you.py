@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from src.apps.favorite.models import Favorite
+from src.apps.feed.models import UserTagAffinity
+from src.apps.feed.ranking import (
+    get_candidate_ids,
+    rank_for_you,
+    rebuild_tag_affinities,
+)
+from src.apps.follow.models import Follow
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction
+from src.apps.recipes.models import Recipe
+from src.tests.factories.factories import RecipeFactory, UserFactory
+
+
+@pytest.mark.feed
+@pytest.mark.django_db
+class TestForYouFeed:
+    """
+    Tests for the personal feed ranked by follows, tag affinity and recency
+    [GET] http://127.0.0.1:8000/api/v1/feed/for-you/
+    """
+
+    url = "/api/v1/feed/for-you/"
+
+    def like(self, user, recipe):
+        Favorite.objects.create(author=user, recipe=recipe)
+
+    def react(self, user, recipe):
+        Reaction.objects.create(
+            author=user,
+            content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=recipe.id,
+            emoji=EmojyChoice.LIKE,
+        )
+
+    @pytest.fixture
+    def soup_lover(self, new_user):
+        """
+        A user who favorited a hot soup and reacted to another soup
+        """
+
+        hot_soup, soup = RecipeFactory.create_batch(2)
+        hot_soup.tag.add("soup", "hot")
+        soup.tag.add("soup")
+        self.like(new_user, hot_soup)
+        self.react(new_user, soup)
+        rebuild_tag_affinities()
+        return new_user
+
+    def test_rebuild_affinities(self, soup_lover):
+        """
+        Affinities are relative to the strongest tag of the user
+        """
+
+        affinities = dict(
+            UserTagAffinity.objects.filter(user=soup_lover).values_list(
+                "tag__name", "weight"
+            )
+        )
+
+        assert affinities == {"soup": pytest.approx(1.0), "hot": pytest.approx(2 / 3)}
+
+    def test_rank_by_follow_affinity_and_recency(self, soup_lover, new_author):
+        """
+        Recipes of followed authors go first, then ones with favorite tags,
+        older recipes lose score
+        """
+
+        Follow.objects.create(user=soup_lover, author=new_author)
+        followed = RecipeFactory(author=new_author)
+        tagged = RecipeFactory()
+        tagged.tag.add("soup")
+        plain = RecipeFactory()
+        old = RecipeFactory()
+        old.tag.add("soup")
+        Recipe.objects.filter(id=old.id).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        RecipeFactory(author=soup_lover)
+
+        ranked = rank_for_you(soup_lover.id)
+        expected = [followed.id, tagged.id, plain.id, old.id]
+
+        assert [recipe_id for recipe_id in ranked if recipe_id in expected] == expected
+        assert not Recipe.objects.filter(id__in=ranked, author=soup_lover).exists()
+
+    def test_candidates_are_bounded(self, soup_lover):
+        """
+        Candidate generation stops at the limit
+        """
+
+        RecipeFactory.create_batch(5)
+
+        assert len(get_candidate_ids(soup_lover.id, [], limit=3)) == 3
+
+    def test_endpoint(self, api_client, soup_lover, new_author):
+        """
+        The endpoint returns a page of ranked recipes to authenticated users
+        """
+
+        assert api_client.get(self.url).status_code == 401
+
+        followed = RecipeFactory(author=new_author)
+        Follow.objects.create(user=soup_lover, author=new_author)
+        api_client.force_authenticate(user=soup_lover)
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response.data["count"] == Recipe.objects.count()
+        assert response.data["results"][0]["id"] == followed.id
+
+    def test_affinities_of_the_previous_run_are_removed(self, soup_lover):
+        """
+        Tags the user no longer interacts with are removed on rebuild
+        """
+
+        Favorite.objects.all().delete()
+        Reaction.objects.all().delete()
+
+        assert rebuild_tag_affinities() == 0
+        assert not UserTagAffinity.objects.exists()
@@ -1,7 +1,10 @@
 import pytest
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from src.apps.recipes.models import Recipe
+from src.apps.view.models import ViewRecipes
 
 
 @pytest.mark.feed
@@ -52,3 +55,69 @@ class TestFeedPagination:
             next_page_url = response.data["next"]
             assert next_page_url is None
             assert len(response.data["results"]) == recipes_to_see
+
+    @pytest.mark.parametrize("ordering", ["-pub_date", "-activity_count"])
+    def test_feed_cursor_pagination(self, api_client, new_user, ordering):
+        """
+        Cursor mode walks the whole feed without duplicates and count query
+        """
+
+        recipes_num = TestFeedPagination.page_size * 2 + 2
+        recipes = [
+            Recipe.objects.create(
+                author=new_user,
+                title=f"recipe_{i}",
+                slug=f"recipe_{i}",
+                full_text="recipe full text",
+                cooking_time=10,
+            )
+            for i in range(recipes_num)
+        ]
+        for recipe in recipes[:3]:
+            ViewRecipes.objects.create(user=new_user, recipe=recipe)
+
+        next_page_url = f"/api/v1/feed/?ordering={ordering}&pagination=cursor"
+        seen_ids = []
+
+        while next_page_url:
+            response = api_client.get(next_page_url)
+            assert response.status_code == 200
+            assert "count" not in response.data
+            assert len(response.data["results"]) <= TestFeedPagination.page_size
+            seen_ids += [recipe["id"] for recipe in response.data["results"]]
+            next_page_url = response.data["next"]
+
+        assert len(seen_ids) == len(set(seen_ids)) == recipes_num
+        assert set(seen_ids[:3]) == (
+            {recipe.id for recipe in recipes[:3]}
+            if ordering == "-activity_count"
+            else {recipe.id for recipe in recipes[-3:]}
+        )
+
+    def test_activity_page_is_an_index_scan(self, api_client, new_recipe):
+        """
+        Recipes ordered by activity_count are read in the order of the
+        RecipeStats index without sorting
+        """
+
+        with CaptureQueriesContext(connection) as context:
+            api_client.get("/api/v1/feed/?ordering=-activity_count&pagination=cursor")
+        sql = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "ORDER BY" in query["sql"] and "recipes_recipestats" in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+
+        assert "recipes_recipestats USING" in plan and "INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_feed_invalid_cursor(self, api_client):
+        """
+        Invalid cursor returns 404
+        """
+
+        response = api_client.get("/api/v1/feed/?cursor=invalid")
+        assert response.status_code == 404
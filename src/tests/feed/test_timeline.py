@@ -0,0 +1,68 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+
+from src.apps.feed import services
+from src.apps.feed.models import TimelineEntry
+from src.apps.feed.services import get_timeline_recipe_ids
+from src.apps.follow.models import Follow
+from src.tests.factories.factories import RecipeFactory, UserFactory
+
+
+@pytest.mark.feed
+@pytest.mark.django_db
+class TestSubscriptionsTimeline:
+    """
+    Tests for precomputed subscriptions timelines
+    """
+
+    def test_fan_out_on_publish(self, new_user, new_author):
+        """
+        A new recipe is pushed to timelines of the author's followers
+        """
+
+        Follow.objects.create(user=new_user, author=new_author)
+        recipe = RecipeFactory(author=new_author)
+        RecipeFactory(author=UserFactory())
+
+        assert get_timeline_recipe_ids(new_user.id) == [recipe.id]
+
+    def test_backfill_and_remove_on_follow(self, new_user, new_author):
+        """
+        Following backfills the timeline, unfollowing removes author's recipes
+        """
+
+        recipes = RecipeFactory.create_batch(3, author=new_author)
+
+        follow = Follow.objects.create(user=new_user, author=new_author)
+        assert set(get_timeline_recipe_ids(new_user.id)) == {r.id for r in recipes}
+
+        follow.delete()
+        assert get_timeline_recipe_ids(new_user.id) == []
+
+    def test_timeline_is_bounded(self, new_user, new_author, monkeypatch):
+        """
+        Timeline keeps only FEED_TIMELINE_SIZE latest recipes
+        """
+
+        monkeypatch.setattr(services, "FEED_TIMELINE_SIZE", 2)
+        Follow.objects.create(user=new_user, author=new_author)
+        recipes = RecipeFactory.create_batch(4, author=new_author)
+
+        assert get_timeline_recipe_ids(new_user.id) == [r.id for r in recipes[:-3:-1]]
+        assert TimelineEntry.objects.filter(user=new_user).count() == 2
+
+    def test_migration_fills_timelines(self, new_user, new_author):
+        """
+        The data migration fills timelines of existing followers
+        """
+
+        Follow.objects.create(user=new_user, author=new_author)
+        recipes = RecipeFactory.create_batch(2, author=new_author)
+        RecipeFactory(author=UserFactory())
+        TimelineEntry.objects.all().delete()
+
+        migration = import_module("src.apps.feed.migrations.0003_fill_timelineentry")
+        migration.fill_timelines(apps, None)
+        assert set(get_timeline_recipe_ids(new_user.id)) == {r.id for r in recipes}
@@ -0,0 +1,157 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.feed.models import TimelineEntry
+from src.apps.follow.models import Follow
+from src.apps.users.models import UserStats
+from src.base.code_text import (
+    AUTHOR_IS_MISSING,
+    CANNOT_SUBSCRIBE_TO_YOURSELF,
+    INVALID_AUTHORS_LIST,
+    TOO_MANY_AUTHORS,
+)
+from src.tests.factories.factories import RecipeFactory, UserFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestSingleStatementSubscriptions:
+    """
+    Tests for single statement subscribe/unsubscribe and bulk subscriptions
+    [POST, DELETE] http://127.0.0.1:8000/api/v1/subscribe/bulk/
+    """
+
+    url = "/api/v1/subscribe/bulk/"
+
+    def get_follow_queries(self, context):
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if Follow._meta.db_table in query["sql"]
+        ]
+
+    def test_subscribe_is_one_statement(self, api_client, new_user, new_author):
+        """
+        Subscribing and unsubscribing touch the follow table once
+        """
+
+        recipe = RecipeFactory(author=new_author)
+        api_client.force_authenticate(user=new_user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(
+                "/api/v1/subscribe/", {"author": new_author.username}, format="json"
+            )
+        assert response.status_code == 201
+        assert len(self.get_follow_queries(context)) == 1
+        assert TimelineEntry.objects.filter(user=new_user, recipe=recipe).exists()
+        assert UserStats.objects.get(user=new_author).followers_count == 1
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.delete(
+                "/api/v1/unsubscribe/", {"author": new_author.username}, format="json"
+            )
+        assert response.status_code == 204
+        assert len(self.get_follow_queries(context)) == 1
+        assert not TimelineEntry.objects.filter(user=new_user).exists()
+        assert UserStats.objects.get(user=new_author).followers_count == 0
+
+    def test_subscribe_to_yourself(self, api_client, new_user):
+        """
+        Subscribing to yourself returns 400
+        """
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.post(
+            "/api/v1/subscribe/", {"author": new_user.username}, format="json"
+        )
+
+        assert response.status_code == 400
+        assert response.data == CANNOT_SUBSCRIBE_TO_YOURSELF
+
+    @pytest.mark.parametrize(
+        "method, url",
+        [("post", "/api/v1/subscribe/"), ("delete", "/api/v1/unsubscribe/")],
+    )
+    @pytest.mark.parametrize("author", [None, "", ["test2"], 1])
+    def test_invalid_author(self, api_client, new_user, method, url, author):
+        """
+        The author must be a username, otherwise subscribing and
+        unsubscribing return 400
+        """
+
+        api_client.force_authenticate(user=new_user)
+        response = getattr(api_client, method)(url, {"author": author}, format="json")
+
+        assert response.status_code == 400
+        assert response.data == AUTHOR_IS_MISSING
+
+    def test_bulk_subscribe(self, api_client, new_user, new_author):
+        """
+        Unknown authors, the user and existing subscriptions are skipped
+        """
+
+        authors = UserFactory.create_batch(2)
+        Follow.objects.create(user=new_user, author=new_author)
+        api_client.force_authenticate(user=new_user)
+        usernames = [
+            authors[1].username,
+            "unknown",
+            new_user.username,
+            new_author.username,
+            authors[0].username,
+        ]
+
+        response = api_client.post(self.url, {"authors": usernames}, format="json")
+
+        assert response.status_code == 200
+        assert response.data == {"authors": [authors[1].username, authors[0].username]}
+        assert Follow.objects.filter(user=new_user).count() == 3
+        assert UserStats.objects.get(user=new_user).following_count == 3
+
+    def test_bulk_unsubscribe(self, api_client, new_user, new_author):
+        """
+        Only existing subscriptions are removed and listed
+        """
+
+        author = UserFactory()
+        Follow.objects.create(user=new_user, author=new_author)
+        api_client.force_authenticate(user=new_user)
+
+        response = api_client.delete(
+            self.url,
+            {"authors": [new_author.username, author.username]},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data == {"authors": [new_author.username]}
+        assert not Follow.objects.filter(user=new_user).exists()
+        assert UserStats.objects.get(user=new_user).following_count == 0
+
+    @pytest.mark.parametrize("authors", [None, [], "test2", [1, 2]])
+    def test_bulk_invalid_list(self, api_client, new_user, authors):
+        """
+        Authors must be a non-empty list of usernames
+        """
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.post(self.url, {"authors": authors}, format="json")
+
+        assert response.status_code == 400
+        assert response.data == INVALID_AUTHORS_LIST
+
+    def test_bulk_too_many_authors(self, api_client, new_user, settings):
+        """
+        The list of authors is limited
+        """
+
+        settings.FOLLOW_BULK_MAX_AUTHORS = 2
+        api_client.force_authenticate(user=new_user)
+        response = api_client.post(
+            self.url, {"authors": ["a", "b", "c"]}, format="json"
+        )
+
+        assert response.status_code == 400
+        assert response.data == TOO_MANY_AUTHORS
@@ -0,0 +1,113 @@
+import pytest
+
+from src.apps.favorite.models import Favorite
+from src.apps.feed.ranking import rebuild_tag_affinities
+from src.apps.follow.models import Follow, FollowSuggestion
+from src.apps.follow.suggestions import rebuild_follow_suggestions
+from src.tests.factories.factories import RecipeFactory, UserFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestFollowSuggestions:
+    """
+    Tests for "who to follow" suggestions
+    [GET] http://127.0.0.1:8000/api/v1/suggestions/
+    """
+
+    url = "/api/v1/suggestions/"
+
+    @pytest.fixture
+    def graph(self, new_user):
+        """
+        The user follows a and b, a and b both follow c, b follows d
+        """
+
+        a, b, c, d = UserFactory.create_batch(4)
+        for user, author in (
+            (new_user, a),
+            (new_user, b),
+            (a, c),
+            (b, c),
+            (b, d),
+        ):
+            Follow.objects.create(user=user, author=author)
+        return a, b, c, d
+
+    def get_suggestions(self, user):
+        return list(
+            FollowSuggestion.objects.filter(user=user)
+            .order_by("-score", "suggested_user_id")
+            .values_list("suggested_user_id", "mutual_count")
+        )
+
+    def test_friends_of_friends(self, new_user, graph):
+        """
+        Friends of friends are ordered by the count of mutual follows,
+        followed authors and the user are not suggested
+        """
+
+        a, b, c, d = graph
+
+        rebuild_follow_suggestions(chunk_size=2)
+
+        assert self.get_suggestions(new_user) == [(c.id, 2), (d.id, 1)]
+        assert self.get_suggestions(c) == []
+
+    def test_popular_authors_of_favorite_tags(self, new_user, graph):
+        """
+        Popular authors of the user's tags are suggested without mutual follows
+        """
+
+        chef = UserFactory()
+        soup = RecipeFactory(author=chef)
+        soup.tag.add("soup")
+        for fan in UserFactory.create_batch(2):
+            Favorite.objects.create(author=fan, recipe=soup)
+        liked = RecipeFactory()
+        liked.tag.add("soup")
+        Favorite.objects.create(author=new_user, recipe=liked)
+        rebuild_tag_affinities()
+
+        rebuild_follow_suggestions()
+
+        suggestions = dict(self.get_suggestions(new_user))
+        assert suggestions[chef.id] == 0
+        assert suggestions[graph[2].id] == 2
+
+    def test_remove_stale(self, new_user, graph):
+        """
+        Suggestions of the previous rebuild are replaced
+        """
+
+        rebuild_follow_suggestions()
+        Follow.objects.filter(author=graph[3]).delete()
+
+        rebuild_follow_suggestions(limit=5)
+
+        assert self.get_suggestions(new_user) == [(graph[2].id, 2)]
+
+    def test_endpoint(self, api_client, new_user, graph):
+        """
+        The endpoint returns stored suggestions and skips authors followed
+        since the rebuild
+        """
+
+        a, b, c, d = graph
+        rebuild_follow_suggestions()
+        Follow.objects.create(user=new_user, author=d)
+        api_client.force_authenticate(user=new_user)
+
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert [row["suggested_user"]["id"] for row in response.data] == [c.id]
+        assert response.data[0]["mutual_count"] == 2
+        assert response.data[0]["subscribers_count"] == 2
+
+    def test_endpoint_unauthorized(self, api_client):
+        """
+        Anonymous users get 401
+        """
+
+        assert api_client.get(self.url).status_code == 401
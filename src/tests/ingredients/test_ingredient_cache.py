@@ -0,0 +1,102 @@
+import pytest
+
+from src.apps.ingredients.models import Ingredient, Unit
+from src.apps.ingredients.services import (
+    NameIdCache,
+    get_or_create_ids,
+    ingredient_ids,
+    unit_ids,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_name_caches():
+    ingredient_ids.invalidate()
+    unit_ids.invalidate()
+    yield
+    ingredient_ids.invalidate()
+    unit_ids.invalidate()
+
+
+@pytest.mark.django_db
+class TestIngredientNameCache:
+    """
+    Test process-local cache of ingredient and unit ids
+    """
+
+    def test_cached_names_skip_database(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        """
+        Ids of committed names are read from the cache without queries
+        """
+
+        salt = Ingredient.objects.create(name="Соль")
+        with django_capture_on_commit_callbacks(execute=True):
+            ids = get_or_create_ids(Ingredient, ["Соль", "Перец"])
+
+        assert ids["Соль"] == salt.id
+        with django_assert_num_queries(0):
+            assert get_or_create_ids(Ingredient, ["Соль", "Перец"]) == ids
+
+    def test_rolled_back_ids_are_not_cached(self):
+        """
+        Ids are cached only after commit
+        """
+
+        get_or_create_ids(Unit, ["Грамм"])
+
+        assert unit_ids.get_many(["Грамм"]) == {"Грамм": None}
+
+    def test_negative_entries(self, django_assert_num_queries):
+        """
+        A missing name is remembered and inserted without a lookup,
+        an insert of the name drops the negative entry
+        """
+
+        with django_assert_num_queries(3):
+            get_or_create_ids(Unit, ["Литр"])
+        assert unit_ids.get_many(["Литр"]) == {"Литр": None}
+
+        unit_ids.set_many({"Ложка": None})
+        with django_assert_num_queries(2):
+            ids = get_or_create_ids(Unit, ["Ложка"])
+        assert ids == {"Ложка": Unit.objects.get(name="Ложка").id}
+
+        unit_ids.set_many({"Щепотка": None})
+        Unit.objects.create(name="Щепотка")
+        assert unit_ids.get_many(["Щепотка"]) == {}
+
+    def test_cache_is_bounded(self):
+        """
+        The least recently used names are evicted
+        """
+
+        cache = NameIdCache(max_size=2, ttl=60)
+        cache.set_many({"a": 1, "b": 2})
+        cache.get_many(["a"])
+        cache.set_many({"c": 3})
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+    def test_recipe_create_uses_cache(
+        self,
+        api_client,
+        new_author,
+        recipe_data,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        Ingredients and units of a created recipe are cached
+        """
+
+        api_client.force_authenticate(user=new_author)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post("/api/v1/recipe/", recipe_data, format="json")
+
+        assert response.status_code == 201
+        names = [ingredient["name"] for ingredient in recipe_data["ingredients"]]
+        cached = ingredient_ids.get_many(names)
+        assert cached == dict(
+            Ingredient.objects.filter(name__in=names).values_list("name", "id")
+        )
@@ -0,0 +1,83 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction, ReactionCounter
+from src.apps.reactions.services import rebuild_reaction_counters
+from src.base.services import count_reactions_on_objects
+from src.tests.factories.factories import UserFactory
+
+
+@pytest.mark.reactions
+@pytest.mark.django_db
+class TestReactionCounters:
+    """
+    Tests for per-emoji reaction counters
+    """
+
+    def create_reaction(self, recipe, emoji=EmojyChoice.LIKE):
+        return Reaction.objects.create(
+            author=UserFactory(),
+            object_id=recipe.id,
+            content_type=ContentType.objects.get_for_model(recipe),
+            emoji=emoji,
+        )
+
+    def test_counters_follow_reactions(self, new_recipe):
+        """
+        Creating, soft deleting, restoring and deleting shift the counters
+        """
+
+        reaction = self.create_reaction(new_recipe)
+        self.create_reaction(new_recipe)
+        self.create_reaction(new_recipe, EmojyChoice.FIRE)
+        assert count_reactions_on_objects(new_recipe) == {"Like": 2, "Fire": 1}
+
+        reaction.is_deleted = True
+        reaction.save()
+        assert count_reactions_on_objects(new_recipe) == {"Like": 1, "Fire": 1}
+
+        reaction.is_deleted = False
+        reaction.save()
+        assert count_reactions_on_objects(new_recipe) == {"Like": 2, "Fire": 1}
+
+        reaction.delete()
+        assert count_reactions_on_objects(new_recipe) == {"Like": 1, "Fire": 1}
+
+    def test_api_soft_delete_updates_counter(self, api_client, new_user, new_recipe):
+        """
+        Reactions API create and destroy shift the counters
+        """
+
+        url = f"/api/v1/recipe/{new_recipe.slug}/reactions/"
+        api_client.force_authenticate(user=new_user)
+        api_client.post(url, data={"emoji": "Heart"}, format="json")
+        assert api_client.get(url).data["reactions"] == {"Heart": 1}
+
+        reaction = Reaction.objects.get(author=new_user)
+        api_client.delete(f"{url}{reaction.id}/")
+        assert api_client.get(url).data["reactions"] == {}
+
+    def test_rebuild_reaction_counters(self, new_recipe):
+        """
+        Rebuild recounts counters from reactions
+        """
+
+        self.create_reaction(new_recipe)
+        self.create_reaction(new_recipe, EmojyChoice.HEART)
+        ReactionCounter.objects.all().delete()
+
+        assert rebuild_reaction_counters() == 2
+        assert count_reactions_on_objects(new_recipe) == {"Like": 1, "Heart": 1}
+
+    def test_missing_counter_is_recounted(self, new_recipe):
+        """
+        A reaction on an object without a counter counts earlier reactions
+        """
+
+        self.create_reaction(new_recipe)
+        self.create_reaction(new_recipe)
+        ReactionCounter.objects.all().delete()
+
+        self.create_reaction(new_recipe)
+        assert count_reactions_on_objects(new_recipe) == {"Like": 3}
@@ -0,0 +1,95 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+
+from src.base.code_text import INVALID_ID_FORMAT, TOO_MANY_REACTION_OBJECTS
+from src.apps.comments.models import Comment
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction
+from src.tests.factories.factories import RecipeFactory
+
+
+@pytest.mark.reactions
+@pytest.mark.api
+@pytest.mark.django_db
+class TestBatchReactions:
+    """
+    Tests for reactions on many recipes and comments in one request
+    [GET] http://127.0.0.1:8000/api/v1/reactions/?recipes=...&comments=...
+    """
+
+    def react(self, user, instance, emoji=EmojyChoice.LIKE):
+        return Reaction.objects.create(
+            author=user,
+            object_id=instance.id,
+            content_type=ContentType.objects.get_for_model(instance),
+            emoji=emoji,
+        )
+
+    def test_batch_reactions(
+        self, api_client, new_user, new_recipe, django_assert_num_queries
+    ):
+        """
+        Counts and user reactions of all objects with a fixed number of queries
+        """
+
+        other_recipe = RecipeFactory()
+        comments = [
+            Comment.objects.create(author=new_user, recipe=new_recipe, text=f"{i}")
+            for i in range(3)
+        ]
+        reaction = self.react(new_user, new_recipe)
+        self.react(new_user, other_recipe, EmojyChoice.FIRE)
+        comment_reaction = self.react(new_user, comments[0], EmojyChoice.HEART)
+
+        api_client.force_authenticate(user=new_user)
+        slugs = f"{new_recipe.slug},{other_recipe.slug},missing-recipe"
+        ids = ",".join(str(comment.id) for comment in comments)
+        with django_assert_num_queries(6):
+            response = api_client.get(
+                f"/api/v1/reactions/?recipes={slugs}&comments={ids}"
+            )
+
+        assert response.status_code == 200
+        assert response.data["recipes"][new_recipe.slug] == {
+            "reactions": {"Like": 1},
+            "user_reactions": [{"type": "Like", "id": reaction.id}],
+        }
+        assert response.data["recipes"][other_recipe.slug]["reactions"] == {"Fire": 1}
+        assert "missing-recipe" not in response.data["recipes"]
+        assert response.data["comments"][str(comments[0].id)] == {
+            "reactions": {"Heart": 1},
+            "user_reactions": [{"type": "Heart", "id": comment_reaction.id}],
+        }
+        assert response.data["comments"][str(comments[1].id)] == {
+            "reactions": {},
+            "user_reactions": [],
+        }
+
+    def test_batch_reactions_anonymous(self, api_client, new_user, new_recipe):
+        """
+        Anonymous users get counts without user reactions
+        """
+
+        self.react(new_user, new_recipe)
+        response = api_client.get(f"/api/v1/reactions/?recipes={new_recipe.slug}")
+
+        assert response.status_code == 200
+        assert response.data["recipes"][new_recipe.slug] == {
+            "reactions": {"Like": 1},
+            "user_reactions": [],
+        }
+        assert response.data["comments"] == {}
+
+    def test_batch_reactions_validation(self, api_client, settings):
+        """
+        Invalid comment ids and too many objects return 400
+        """
+
+        response = api_client.get("/api/v1/reactions/?comments=1,abc")
+        assert response.status_code == 400
+        assert response.data == INVALID_ID_FORMAT
+
+        ids = ",".join(str(i) for i in range(101))
+        response = api_client.get(f"/api/v1/reactions/?comments={ids}")
+        assert response.status_code == 400
+        assert response.data == TOO_MANY_REACTION_OBJECTS
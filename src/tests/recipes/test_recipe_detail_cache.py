@@ -0,0 +1,157 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.recipes import signals
+from src.apps.recipes.models import RecipeStats
+
+
+@pytest.mark.django_db
+@pytest.mark.recipes
+class TestRecipeDetailCache:
+    """
+    Tests for the cached recipe detail
+    """
+
+    def get_url(self, recipe):
+        return f"/api/v1/recipe/{recipe.slug}/"
+
+    def test_cached_detail_skips_relations(self, api_client, new_ingredient_in_recipe):
+        """
+        A repeated request does not query ingredients of the recipe
+        """
+
+        recipe = new_ingredient_in_recipe.recipe
+        recipe.ingredients.add(new_ingredient_in_recipe)
+        first = api_client.get(self.get_url(recipe))
+
+        with CaptureQueriesContext(connection) as context:
+            second = api_client.get(self.get_url(recipe))
+
+        assert second.status_code == 200
+        assert second.data["ingredients"] == first.data["ingredients"] != []
+        assert not any(
+            "ingredientinrecipe" in query["sql"] for query in context.captured_queries
+        )
+
+    def test_counters_are_not_cached(self, api_client, new_recipe):
+        """
+        Counters are read from statistics on every request
+        """
+
+        api_client.get(self.get_url(new_recipe))
+        RecipeStats.objects.filter(recipe=new_recipe).update(
+            views_count=10, reactions_count=3
+        )
+
+        response = api_client.get(self.get_url(new_recipe))
+
+        assert response.data["views_count"] == 10
+        assert response.data["reactions_count"] == 3
+
+    def test_invalidate_on_recipe_save(self, api_client, new_recipe):
+        """
+        Saving the recipe changes the cached detail
+        """
+
+        api_client.get(self.get_url(new_recipe))
+        new_recipe.full_text = "Updated text"
+        new_recipe.save()
+
+        response = api_client.get(self.get_url(new_recipe))
+
+        assert response.data["full_text"] == "Updated text"
+
+    def test_invalidate_on_category_change(
+        self, api_client, new_recipe, category_1, django_capture_on_commit_callbacks
+    ):
+        """
+        Adding a category bumps the content version of the recipe
+        """
+
+        api_client.get(self.get_url(new_recipe))
+        with django_capture_on_commit_callbacks(execute=True):
+            new_recipe.category.add(category_1)
+
+        response = api_client.get(self.get_url(new_recipe))
+
+        assert [category["slug"] for category in response.data["category"]] == ["fish"]
+
+    def test_invalidate_on_ingredient_change(
+        self, api_client, new_ingredient_in_recipe, django_capture_on_commit_callbacks
+    ):
+        """
+        Changing an ingredient row bumps the content version of the recipe
+        """
+
+        recipe = new_ingredient_in_recipe.recipe
+        recipe.ingredients.add(new_ingredient_in_recipe)
+        api_client.get(self.get_url(recipe))
+        with django_capture_on_commit_callbacks(execute=True):
+            new_ingredient_in_recipe.amount = 5
+            new_ingredient_in_recipe.save()
+
+        response = api_client.get(self.get_url(recipe))
+
+        assert response.data["ingredients"][0]["amount"] == 5
+
+    def test_invalidate_on_author_save(
+        self, api_client, new_recipe, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """
+        Renaming the author bumps the version of the author's recipes,
+        saves of other fields do not
+        """
+
+        api_client.get(self.get_url(new_recipe))
+        author = new_recipe.author
+        bumped = []
+        with monkeypatch.context() as patch:
+            patch.setattr(signals, "bump_author_detail_version", bumped.append)
+            with django_capture_on_commit_callbacks(execute=True):
+                author.save(update_fields=["last_login"])
+        assert bumped == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            author.display_name = "Renamed"
+            author.save()
+
+        response = api_client.get(self.get_url(new_recipe))
+
+        assert response.data["author"]["display_name"] == "Renamed"
+
+    def test_invalidate_on_ingredient_rename(
+        self, api_client, new_ingredient_in_recipe, django_capture_on_commit_callbacks
+    ):
+        """
+        Renaming an ingredient or a unit bumps the version of all recipes
+        """
+
+        recipe = new_ingredient_in_recipe.recipe
+        recipe.ingredients.add(new_ingredient_in_recipe)
+        api_client.get(self.get_url(recipe))
+        with django_capture_on_commit_callbacks(execute=True):
+            new_ingredient_in_recipe.ingredient.name = "Renamed"
+            new_ingredient_in_recipe.ingredient.save()
+            new_ingredient_in_recipe.unit.name = "Renamed unit"
+            new_ingredient_in_recipe.unit.save()
+
+        response = api_client.get(self.get_url(recipe))
+
+        assert response.data["ingredients"][0]["name"] == "Renamed"
+        assert response.data["ingredients"][0]["unit"] == "Renamed unit"
+
+    def test_cache_miss_reads_the_recipe_once(self, api_client, new_recipe):
+        """
+        A cache miss serializes the already loaded recipe
+        """
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(self.get_url(new_recipe))
+
+        assert response.status_code == 200
+        assert [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('SELECT "recipes_recipe"."id"')
+        ] == [context.captured_queries[0]["sql"]]
@@ -0,0 +1,80 @@
+import pytest
+
+from src.apps.ingredients.models import IngredientInRecipe
+from src.apps.recipes.models import Recipe
+from src.base.services import create_ingredients_in_recipe
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestRecipeIngredientsUpdate:
+    """
+    Tests for diff-based update of recipe ingredients
+    [PATCH] http://127.0.0.1:8000/api/v1/recipe/{slug}/
+    """
+
+    def test_update_ingredients(self, api_client, new_author, recipe_data):
+        """
+        Changed rows are updated in place, unchanged rows are kept,
+        missing rows are deleted and new rows are linked to the recipe
+        """
+
+        api_client.force_authenticate(user=new_author)
+        slug = api_client.post("/api/v1/recipe/", recipe_data, format="json").data[
+            "slug"
+        ]
+        recipe = Recipe.objects.get(slug=slug)
+        rows = {
+            row.ingredient.name: row
+            for row in IngredientInRecipe.objects.filter(recipe=recipe)
+        }
+        ingredients = [
+            {"name": "Яйца", "unit": "Шт", "amount": 3},
+            {"name": "Соль", "unit": "грамм", "amount": 5},
+        ]
+        response = api_client.patch(
+            f"/api/v1/recipe/{slug}/",
+            data={"ingredients": ingredients},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["ingredients"] == ingredients
+        current = {
+            row.ingredient.name: row
+            for row in IngredientInRecipe.objects.filter(recipe=recipe)
+        }
+        assert set(current) == {"Яйца", "Соль"}
+        assert current["Яйца"].id == rows["Яйца"].id
+        assert not IngredientInRecipe.objects.filter(id=rows["Волда"].id).exists()
+        assert set(recipe.ingredients.all()) == set(current.values())
+
+        ingredients[0]["amount"] = 6
+        ingredients[1]["unit"] = "Щепотка"
+        response = api_client.patch(
+            f"/api/v1/recipe/{slug}/",
+            data={"ingredients": ingredients},
+            format="json",
+        )
+
+        assert response.data["ingredients"] == ingredients
+        assert {row.id for row in recipe.ingredients.all()} == {
+            current["Яйца"].id,
+            current["Соль"].id,
+        }
+
+    def test_unchanged_ingredients_are_not_written(
+        self, api_client, new_author, recipe_data, django_assert_num_queries
+    ):
+        """
+        Sending the same ingredients only reads the rows of the recipe
+        """
+
+        api_client.force_authenticate(user=new_author)
+        slug = api_client.post("/api/v1/recipe/", recipe_data, format="json").data[
+            "slug"
+        ]
+        recipe = Recipe.objects.get(slug=slug)
+
+        with django_assert_num_queries(1):
+            create_ingredients_in_recipe(recipe, recipe_data["ingredients"])
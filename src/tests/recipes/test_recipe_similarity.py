@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from src.apps.favorite.models import Favorite
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction
+from src.apps.recipes.models import Recipe, RecipeSimilarity
+from src.apps.recipes.similarity import (
+    FAVORITE_WEIGHT,
+    REACTION_WEIGHT,
+    rebuild_recipe_similarities,
+)
+from src.tests.factories.factories import RecipeFactory, UserFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.recipes
+class TestRecipeSimilarity:
+    """
+    Tests for co-favorite recipe similarities
+    [GET] http://127.0.0.1:8000/api/v1/recipe/{slug}/similar/
+    """
+
+    @pytest.fixture
+    def recipes(self):
+        """
+        Recipes a, b and c favorited by three users, d reacted to by the third
+        """
+
+        first, second, third = UserFactory.create_batch(3)
+        recipes = RecipeFactory.create_batch(4)
+        for user, positions in ((first, (0, 1)), (second, (0, 1, 2)), (third, (2,))):
+            for position in positions:
+                Favorite.objects.create(author=user, recipe=recipes[position])
+        Reaction.objects.create(
+            author=third,
+            content_type=ContentType.objects.get_for_model(Recipe),
+            object_id=recipes[3].id,
+            emoji=EmojyChoice.LIKE,
+        )
+        return recipes
+
+    def get_neighbours(self, recipe):
+        return list(
+            RecipeSimilarity.objects.filter(recipe=recipe)
+            .order_by("-score")
+            .values_list("similar_recipe_id", "score")
+        )
+
+    def test_cosine_scores(self, recipes):
+        """
+        Neighbours are ordered by cosine similarity of their users
+        """
+
+        assert rebuild_recipe_similarities() == 8
+        first, second, third, fourth = recipes
+
+        neighbours = self.get_neighbours(first)
+        assert [recipe_id for recipe_id, _ in neighbours] == [second.id, third.id]
+        assert neighbours[0][1] == pytest.approx(1.0)
+        assert neighbours[1][1] == pytest.approx(0.5)
+        assert self.get_neighbours(fourth) == [(third.id, pytest.approx(0.5**0.5))]
+
+    def test_limit_neighbours_and_remove_stale(self, recipes):
+        """
+        Only the top neighbours are kept, rows of the previous run are deleted
+        """
+
+        RecipeSimilarity.objects.create(
+            recipe=recipes[0],
+            similar_recipe=recipes[3],
+            score=1,
+            computed_at=timezone.now(),
+        )
+
+        rebuild_recipe_similarities(neighbours=1)
+
+        assert self.get_neighbours(recipes[0]) == [(recipes[1].id, pytest.approx(1))]
+        assert RecipeSimilarity.objects.count() == 4
+
+    def test_chunks_match_dense_computation(self):
+        """
+        Chunked sparse computation matches dense cosine similarity
+        """
+
+        generator = np.random.default_rng(7)
+        users = UserFactory.create_batch(8)
+        recipes = RecipeFactory.create_batch(6)
+        matrix = np.zeros((len(users), len(recipes)))
+        for row, user in enumerate(users):
+            for column, recipe in enumerate(recipes):
+                if generator.random() < 0.3:
+                    Favorite.objects.create(author=user, recipe=recipe)
+                    matrix[row, column] = FAVORITE_WEIGHT
+                elif generator.random() < 0.2:
+                    Reaction.objects.create(
+                        author=user,
+                        content_type=ContentType.objects.get_for_model(Recipe),
+                        object_id=recipe.id,
+                        emoji=EmojyChoice.LIKE,
+                    )
+                    matrix[row, column] = REACTION_WEIGHT
+
+        rebuild_recipe_similarities(chunk_size=2, neighbours=len(recipes))
+
+        norms = np.linalg.norm(matrix, axis=0)
+        for column, recipe in enumerate(recipes):
+            expected = {
+                recipes[other].id: matrix[:, column]
+                @ matrix[:, other]
+                / (norms[column] * norms[other])
+                for other in range(len(recipes))
+                if other != column and matrix[:, column] @ matrix[:, other] > 0
+            }
+            assert dict(self.get_neighbours(recipe)) == pytest.approx(expected)
+
+    def test_similar_endpoint(self, api_client, recipes):
+        """
+        The endpoint returns stored neighbours, most similar first
+        """
+
+        rebuild_recipe_similarities()
+
+        response = api_client.get(f"/api/v1/recipe/{recipes[0].slug}/similar/")
+
+        assert response.status_code == 200
+        assert [recipe["id"] for recipe in response.data] == [
+            recipes[1].id,
+            recipes[2].id,
+        ]
+        assert response.data[0]["score"] == pytest.approx(1.0)
+
+    def test_similar_endpoint_not_found(self, api_client):
+        """
+        Unknown slug returns 404
+        """
+
+        response = api_client.get("/api/v1/recipe/unknown/similar/")
+
+        assert response.status_code == 404
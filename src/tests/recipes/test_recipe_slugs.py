@@ -0,0 +1,55 @@
+import pytest
+
+from src.apps.recipes.models import RecipeSlugCounter
+from src.apps.recipes.services import allocate_recipe_slug
+from src.tests.factories.factories import RecipeFactory
+
+
+@pytest.mark.django_db
+class TestRecipeSlugAllocator:
+    """
+    Tests for allocating unique recipe slugs
+    """
+
+    def test_allocate_slugs(self):
+        """
+        Slugs of the same title are numbered by the counter
+        """
+
+        assert allocate_recipe_slug("Варенье яйца") == "varene-iaitsa"
+        assert allocate_recipe_slug("Варенье яйца") == "varene-iaitsa_2"
+        assert RecipeSlugCounter.objects.get(base_slug="varene-iaitsa").last_number == 2
+
+    def test_allocate_slug_queries(self, django_assert_max_num_queries):
+        """
+        Allocation of a known base slug does not depend on the number of recipes
+        """
+
+        for number in range(1, 6):
+            RecipeFactory(slug="pie" if number == 1 else f"pie_{number}")
+        allocate_recipe_slug("Pie")
+
+        with django_assert_max_num_queries(5):
+            assert allocate_recipe_slug("Pie") == "pie_7"
+
+    def test_seed_counter_from_existing_slugs(self):
+        """
+        The counter of a new base slug continues numbering of existing recipes
+        """
+
+        RecipeFactory(slug="soup")
+        RecipeFactory(slug="soup_4")
+        RecipeFactory(slug="soup_spicy")
+
+        assert allocate_recipe_slug("Soup") == "soup_5"
+
+    def test_skip_taken_slug(self):
+        """
+        A slug taken by a title ending with a number is skipped
+        """
+
+        RecipeFactory(slug="cake")
+        RecipeFactory(slug="cake_2")
+        RecipeSlugCounter.objects.create(base_slug="cake", last_number=1)
+
+        assert allocate_recipe_slug("Cake") == "cake_3"
@@ -0,0 +1,158 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.utils import timezone
+
+from src.apps.comments.models import Comment
+from src.apps.favorite.models import Favorite
+from src.apps.reactions.models import Reaction
+from src.apps.recipes.models import RecipeStats
+from src.apps.recipes.services import (
+    find_inconsistent_recipe_stats,
+    rebuild_recipe_stats,
+)
+from src.apps.view.models import ViewRecipes
+
+
+@pytest.mark.recipes
+@pytest.mark.django_db
+class TestRecipeStats:
+    """
+    Tests for materialized recipe statistics
+    """
+
+    def test_stats_created_with_recipe(self, new_recipe):
+        """
+        Empty statistics are created together with a recipe
+        """
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.activity_count == 0
+        assert stats.comments_count == 0
+
+    def test_stats_follow_writes(self, new_recipe, new_user):
+        """
+        Comments, views and reactions shift the counters incrementally
+        """
+
+        comment = Comment.objects.create(
+            author=new_user, recipe=new_recipe, text="comment"
+        )
+        ViewRecipes.objects.create(user=new_user, recipe=new_recipe)
+        reaction = Reaction.objects.create(
+            author=new_user,
+            object_id=new_recipe.id,
+            content_type=ContentType.objects.get_for_model(new_recipe),
+        )
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.comments_count == 1
+        assert stats.views_count == 1
+        assert stats.reactions_count == 1
+        assert stats.activity_count == 3
+
+        reaction.is_deleted = True
+        reaction.save()
+        comment.delete()
+
+        stats.refresh_from_db()
+        assert stats.comments_count == 0
+        assert stats.reactions_count == 0
+        assert stats.activity_count == 1
+
+        reaction.is_deleted = False
+        reaction.save()
+
+        stats.refresh_from_db()
+        assert stats.reactions_count == 1
+        assert stats.activity_count == 2
+
+    def test_rebuild_drops_old_activity(self, new_recipe, new_user):
+        """
+        Rebuild recounts the counters and excludes activity out of the interval
+        """
+
+        for i in range(3):
+            ViewRecipes.objects.create(user=f"user_{i}", recipe=new_recipe)
+        ViewRecipes.objects.filter(user="user_0").update(
+            created_at=timezone.now() - timedelta(days=365)
+        )
+        RecipeStats.objects.filter(recipe=new_recipe).delete()
+
+        assert rebuild_recipe_stats() == 1
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.views_count == 3
+        assert stats.latest_views_count == 2
+        assert stats.activity_count == 2
+        assert stats.rebuilt_at is not None
+
+    def test_favorites_counter(self, new_recipe, new_user):
+        """
+        Favorites shift favorites_count
+        """
+
+        favorite = Favorite.objects.create(author=new_user, recipe=new_recipe)
+        assert RecipeStats.objects.get(recipe=new_recipe).favorites_count == 1
+
+        favorite.delete()
+        assert RecipeStats.objects.get(recipe=new_recipe).favorites_count == 0
+
+    def test_check_recipe_stats(self, new_recipe, new_user):
+        """
+        Consistency checker finds drifted counters and --fix repairs them
+        """
+
+        ViewRecipes.objects.create(user=new_user, recipe=new_recipe)
+        assert find_inconsistent_recipe_stats() == []
+
+        RecipeStats.objects.filter(recipe=new_recipe).update(views_count=10)
+        assert find_inconsistent_recipe_stats() == [new_recipe.id]
+
+        call_command("check_recipe_stats", "--fix", stdout=StringIO())
+        assert find_inconsistent_recipe_stats() == []
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 1
+
+
+@pytest.mark.recipes
+@pytest.mark.django_db(transaction=True)
+class TestRecipeStatsOnDelete:
+    """
+    Tests for statistics of recipes deleted in committed transactions
+    """
+
+    def test_delete_viewed_recipe(self, new_recipe, new_user):
+        """
+        Cascaded views of a deleted recipe do not recreate its statistics
+        """
+
+        ViewRecipes.objects.create(user=new_user, recipe=new_recipe)
+
+        new_recipe.delete()
+
+        assert not RecipeStats.objects.exists()
+
+    def test_delete_author_of_viewed_recipe(self, new_recipe, new_user):
+        """
+        Deleting the author cascades to the viewed recipe
+        """
+
+        ViewRecipes.objects.create(user=new_user, recipe=new_recipe)
+
+        new_recipe.author.delete()
+
+        assert not RecipeStats.objects.exists()
+
+    def test_delete_favorited_recipe(self, new_recipe, new_user):
+        """
+        Cascaded favorites of a deleted recipe do not recreate its statistics
+        """
+
+        Favorite.objects.create(author=new_user, recipe=new_recipe)
+
+        new_recipe.delete()
+
+        assert not RecipeStats.objects.exists()
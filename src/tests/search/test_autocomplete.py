@@ -0,0 +1,242 @@
+import threading
+
+import pytest
+
+from src.base.code_text import INVALID_AUTOCOMPLETE_TYPE
+from src.apps.recipes.models import Recipe
+from src.apps.search.autocomplete import (
+    AUTOCOMPLETE_SOURCES,
+    AutocompleteSource,
+    PrefixIndex,
+    Suggestion,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_autocomplete():
+    for source in AUTOCOMPLETE_SOURCES.values():
+        source.reset()
+    yield
+    for source in AUTOCOMPLETE_SOURCES.values():
+        source.reset()
+
+
+def suggestion(key, text, weight):
+    return Suggestion(key, (text,), weight, {"name": text})
+
+
+class TestPrefixIndex:
+    """
+    Tests for in-memory prefix index
+    """
+
+    def test_top_suggestions_by_weight(self):
+        """
+        Suggestions start with the prefix at any word and go by weight
+        """
+
+        index = PrefixIndex(limit=2, cached_length=2)
+        index.build(
+            [
+                suggestion(1, "Суп гороховый", 5),
+                suggestion(2, "Сырники", 9),
+                suggestion(3, "Куриный суп", 7),
+                suggestion(4, "Салат", 1),
+            ]
+        )
+
+        assert index.search("с", 2) == [{"name": "Сырники"}, {"name": "Куриный суп"}]
+        assert index.search("СУП", 5) == [
+            {"name": "Куриный суп"},
+            {"name": "Суп гороховый"},
+        ]
+        assert index.search("суп гор", 5) == [{"name": "Суп гороховый"}]
+        assert index.search("  ", 5) == []
+
+    def test_upsert_and_remove(self):
+        """
+        Written and removed suggestions are applied to cached prefixes
+        """
+
+        index = PrefixIndex(limit=2, cached_length=2)
+        index.build([suggestion(1, "Борщ", 1), suggestion(2, "Блины", 2)])
+        assert index.search("б", 2) == [{"name": "Блины"}, {"name": "Борщ"}]
+
+        index.upsert(suggestion(3, "Бульон", 5))
+        index.upsert(suggestion(1, "Борщ", 10))
+        assert index.search("б", 2) == [{"name": "Борщ"}, {"name": "Бульон"}]
+
+        index.remove(1)
+        assert index.search("б", 2) == [{"name": "Бульон"}, {"name": "Блины"}]
+        assert len(index) == 2
+
+    def test_searched_prefixes_are_bounded(self):
+        """
+        Short prefixes missing after build and invalidated by writes are
+        remembered in the bounded LRU only
+        """
+
+        index = PrefixIndex(limit=2, cached_length=2, max_memo=2)
+        index.build([suggestion(1, "Борщ", 1)])
+        for prefix in ["а", "в", "г", "д"]:
+            assert index.search(prefix, 2) == []
+        assert set(index._top) == {"б", "бо"}
+
+        index.upsert(suggestion(2, "Блины", 2))
+        assert index.search("б", 2) == [{"name": "Блины"}, {"name": "Борщ"}]
+        assert set(index._top) == {"бо"}
+        assert list(index._memo) == ["д", "б"]
+
+    def test_stale_index_is_served_during_rebuild(self):
+        """
+        After ttl the stale index is served, while one background thread
+        rebuilds it
+        """
+
+        names = iter(["Борщ", "Бульон", "Бульон"])
+        loaded = threading.Event()
+
+        def loader(keys=None):
+            if source.is_built:
+                loaded.wait(5)
+            return [suggestion(1, next(names), 1)]
+
+        source = AutocompleteSource(loader, ttl=0)
+
+        assert source.search("б", 5) == [{"name": "Борщ"}]
+        assert source.search("б", 5) == [{"name": "Борщ"}]
+        rebuild_thread = source.rebuild_thread
+        assert source.search("б", 5) == [{"name": "Борщ"}]
+        assert source.rebuild_thread is rebuild_thread
+
+        loaded.set()
+        rebuild_thread.join()
+        assert source.search("б", 5) == [{"name": "Бульон"}]
+        source.rebuild_thread.join()
+
+    def test_refresh_during_build_is_replayed(self):
+        """
+        Objects refreshed while the index is built are reloaded after the swap
+        """
+
+        names = {1: "Борщ"}
+
+        def loader(keys=None):
+            loaded = [
+                suggestion(key, name, 1)
+                for key, name in names.items()
+                if keys is None or key in keys
+            ]
+            if keys is None and source.is_built:
+                names[2] = "Блины"
+                source.refresh([2])
+            return loaded
+
+        source = AutocompleteSource(loader, ttl=60)
+        assert source.search("б", 5) == [{"name": "Борщ"}]
+
+        source._build()
+        assert source.search("б", 5) == [{"name": "Борщ"}, {"name": "Блины"}]
+
+
+@pytest.mark.search
+@pytest.mark.api
+@pytest.mark.django_db
+class TestAutocomplete:
+    """
+    Tests for autocomplete endpoint
+    [GET] http://127.0.0.1:8000/api/v1/autocomplete/?q=
+    """
+
+    def test_autocomplete(self, api_client, new_recipe, new_user):
+        """
+        Suggestions of all types are returned for a prefix
+        """
+
+        new_recipe.tag.add("Тестовый тег")
+        response = api_client.get("/api/v1/autocomplete/?q=test")
+
+        assert response.status_code == 200
+        assert response.data["recipes"] == [
+            {"title": new_recipe.title, "slug": new_recipe.slug}
+        ]
+        assert set(response.data) == {"recipes", "tags", "ingredients", "users"}
+
+        response = api_client.get("/api/v1/autocomplete/?q=тест&types=tags")
+        assert response.data == {"tags": [{"name": "Тестовый тег"}]}
+
+        response = api_client.get(
+            f"/api/v1/autocomplete/?q={new_user.username[:3]}&types=users"
+        )
+        assert {"username": new_user.username, "display_name": None} in response.data[
+            "users"
+        ]
+
+    def test_unindexed_user_fields_are_ignored(
+        self, api_client, new_user, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """
+        Saving only fields, that are not indexed, does not refresh suggestions
+        """
+
+        source = AUTOCOMPLETE_SOURCES["users"]
+        refreshed = []
+        monkeypatch.setattr(source, "refresh", refreshed.append)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            new_user.save(update_fields=["last_login"])
+        assert refreshed == []
+        monkeypatch.undo()
+        api_client.get(f"/api/v1/autocomplete/?types=users&q={new_user.username}")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            new_user.display_name = "Шеф"
+            new_user.save(update_fields=["display_name"])
+        response = api_client.get("/api/v1/autocomplete/?types=users&q=шеф")
+        assert response.data["users"] == [
+            {"username": new_user.username, "display_name": "Шеф"}
+        ]
+
+    def test_invalid_type(self, api_client):
+        """
+        Unknown suggestion type returns 400
+        """
+
+        response = api_client.get("/api/v1/autocomplete/?q=a&types=posts")
+
+        assert response.status_code == 400
+        assert response.data == INVALID_AUTOCOMPLETE_TYPE
+
+    def test_refresh_on_write(
+        self, api_client, new_author, new_recipe, django_capture_on_commit_callbacks
+    ):
+        """
+        Created, renamed and deleted recipes are applied to a built index
+        """
+
+        url = "/api/v1/autocomplete/?types=recipes&q="
+        assert api_client.get(f"{url}пицца").data["recipes"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe = Recipe.objects.create(
+                author=new_author,
+                title="Пицца",
+                slug="pizza",
+                full_text="Тесто",
+                cooking_time=30,
+            )
+        assert api_client.get(f"{url}пицца").data["recipes"] == [
+            {"title": "Пицца", "slug": "pizza"}
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe.title = "Пирог"
+            recipe.save()
+        assert api_client.get(f"{url}пицца").data["recipes"] == []
+        assert api_client.get(f"{url}пир").data["recipes"] == [
+            {"title": "Пирог", "slug": "pizza"}
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe.delete()
+        assert api_client.get(f"{url}пир").data["recipes"] == []
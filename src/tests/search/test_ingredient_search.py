@@ -0,0 +1,226 @@
+import threading
+import time
+
+import pytest
+
+from src.base.code_text import EMPTY_INGREDIENTS_QUERY, INVALID_MISSING_INGREDIENTS
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe
+from src.apps.recipes.models import Recipe
+from src.apps.search.ingredient_index import IngredientIndex, ingredient_index
+
+
+@pytest.fixture(autouse=True)
+def reset_ingredient_index():
+    ingredient_index.reset()
+    yield
+    ingredient_index.reset()
+
+
+@pytest.mark.search
+@pytest.mark.api
+@pytest.mark.django_db
+class TestIngredientSearch:
+    """
+    Tests for search of recipes by a set of ingredients
+    [GET] http://127.0.0.1:8000/api/v1/search/ingredients/?ingredients=
+    """
+
+    def create_recipe(self, author, slug, ingredients):
+        recipe = Recipe.objects.create(
+            author=author, title=slug, slug=slug, full_text=slug, cooking_time=10
+        )
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(
+                recipe=recipe,
+                ingredient=Ingredient.objects.get_or_create(name=name)[0],
+                amount=1,
+            )
+            for name in ingredients
+        )
+        return recipe
+
+    @pytest.fixture
+    def recipes(self, new_author):
+        return {
+            "omelette": self.create_recipe(new_author, "omelette", ["Яйца", "Молоко"]),
+            "eggs": self.create_recipe(new_author, "eggs", ["Яйца"]),
+            "pancakes": self.create_recipe(
+                new_author, "pancakes", ["Яйца", "Молоко", "Мука"]
+            ),
+            "bread": self.create_recipe(new_author, "bread", ["Мука", "Дрожжи"]),
+        }
+
+    def search(self, api_client, query):
+        response = api_client.get(f"/api/v1/search/ingredients/?{query}")
+        assert response.status_code == 200
+        return [
+            (
+                recipe["slug"],
+                recipe["matched_ingredients"],
+                recipe["missing_ingredients"],
+            )
+            for recipe in response.data["results"]
+        ]
+
+    def test_all_ingredients_present(self, api_client, recipes):
+        """
+        Only recipes with all ingredients present are returned by default
+        """
+
+        assert self.search(api_client, "ingredients=Яйца,Молоко,Сыр") == [
+            ("omelette", 2, 0),
+            ("eggs", 1, 0),
+        ]
+
+    def test_missing_ingredients(self, api_client, recipes):
+        """
+        Recipes missing at most ?missing= ingredients are ranked by coverage
+        """
+
+        assert self.search(api_client, "ingredients=Яйца,Молоко&missing=1") == [
+            ("omelette", 2, 0),
+            ("eggs", 1, 0),
+            ("pancakes", 2, 1),
+        ]
+        assert self.search(api_client, "ingredients=Мука&missing=2") == [
+            ("bread", 1, 1),
+            ("pancakes", 1, 2),
+        ]
+
+    def test_index_is_updated_on_recipe_write(
+        self, api_client, new_author, recipes, django_capture_on_commit_callbacks
+    ):
+        """
+        Written recipes are updated in the built index
+        """
+
+        assert self.search(api_client, "ingredients=Дрожжи,Мука") == [("bread", 2, 0)]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe = self.create_recipe(new_author, "bun", ["Мука", "Дрожжи"])
+            recipe.save()
+            recipes["bread"].delete()
+
+        assert self.search(api_client, "ingredients=Дрожжи,Мука") == [("bun", 2, 0)]
+
+    def test_unknown_ingredient_is_not_remembered(
+        self, api_client, new_author, recipes, django_capture_on_commit_callbacks
+    ):
+        """
+        An ingredient missing at the time of a search is found once created
+        """
+
+        assert self.search(api_client, "ingredients=Сыр") == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.create_recipe(new_author, "toast", ["Сыр"]).save()
+
+        assert self.search(api_client, "ingredients=Сыр") == [("toast", 1, 0)]
+
+    def test_invalid_query(self, api_client):
+        """
+        Empty ingredients and invalid missing count return 400
+        """
+
+        response = api_client.get("/api/v1/search/ingredients/?ingredients=,")
+        assert response.status_code == 400
+        assert response.data == EMPTY_INGREDIENTS_QUERY
+
+        response = api_client.get(
+            "/api/v1/search/ingredients/?ingredients=Яйца&missing=a"
+        )
+        assert response.status_code == 400
+        assert response.data == INVALID_MISSING_INGREDIENTS
+
+    def test_bit_sliced_counts(self):
+        """
+        Counts of matched ingredients are exact for many ingredients
+        """
+
+        index = IngredientIndex(ttl=60)
+        index._built_at = time.monotonic()
+        for recipe_id in range(1, 9):
+            index._add(recipe_id, set(range(1, recipe_id + 1)))
+
+        matches = index.search(range(1, 8), max_missing=1)
+
+        assert [
+            (match.recipe_id, match.matched, match.missing) for match in matches
+        ] == [
+            (7, 7, 0),
+            (6, 6, 0),
+            (5, 5, 0),
+            (4, 4, 0),
+            (3, 3, 0),
+            (2, 2, 0),
+            (1, 1, 0),
+            (8, 7, 1),
+        ]
+
+    def test_stale_index_is_served_during_rebuild(self, monkeypatch):
+        """
+        After ttl the stale index is served, while one background thread
+        rebuilds it
+        """
+
+        index = IngredientIndex(ttl=0)
+        index._built_at = time.monotonic()
+        index._add(1, {1})
+        loaded = threading.Event()
+
+        def build():
+            loaded.wait(5)
+            with index._lock:
+                index._add(2, {1})
+                index._built_at = time.monotonic()
+
+        monkeypatch.setattr(index, "build", build)
+
+        assert [match.recipe_id for match in index.search([1])] == [1]
+        rebuild_thread = index.rebuild_thread
+        assert [match.recipe_id for match in index.search([1])] == [1]
+        assert index.rebuild_thread is rebuild_thread
+
+        loaded.set()
+        rebuild_thread.join()
+        assert [match.recipe_id for match in index.search([1])] == [2, 1]
+        index.rebuild_thread.join()
+
+    def test_build_matches_incremental_updates(self, recipes):
+        """
+        Postings built in one pass equal postings of added recipes
+        """
+
+        built = IngredientIndex(ttl=60)
+        built.build()
+        added = IngredientIndex(ttl=60)
+        for recipe_id, ingredient_ids in built._recipes.items():
+            added._add(recipe_id, ingredient_ids)
+
+        assert built._postings == added._postings
+        assert built._sizes == added._sizes
+
+    def test_writes_during_build_are_replayed(self, new_author, recipes, monkeypatch):
+        """
+        Recipes written while the index is built are reloaded after the swap
+        """
+
+        index = IngredientIndex(ttl=60)
+        load = index._load
+
+        def load_and_write():
+            snapshot = load()
+            written = self.create_recipe(new_author, "scrambled", ["Яйца"])
+            index.update_recipes([written.id])
+            IngredientInRecipe.objects.filter(recipe=recipes["eggs"]).delete()
+            index.update_recipes([recipes["eggs"].id])
+            return snapshot
+
+        monkeypatch.setattr(index, "_load", load_and_write)
+        index.build()
+
+        written = Recipe.objects.get(slug="scrambled")
+        eggs = Ingredient.objects.get(name="Яйца")
+        assert written.id in index._recipes
+        assert recipes["eggs"].id not in index._recipes
+        assert [match.recipe_id for match in index.search([eggs.id])] == [written.id]
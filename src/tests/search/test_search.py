@@ -0,0 +1,104 @@
+import pytest
+from django.core.management import call_command
+
+from src.base.code_text import EMPTY_SEARCH_QUERY
+from src.apps.recipes.models import Recipe
+from src.apps.recipes.services import allocate_recipe_slug
+from src.apps.search.backends import DatabaseSearchBackend
+from src.apps.search.services import SearchResults
+
+
+@pytest.mark.search
+@pytest.mark.api
+@pytest.mark.django_db
+class TestRecipeSearch:
+    """
+    Tests for full-text recipe search
+    [GET] http://127.0.0.1:8000/api/v1/search/?q=
+    """
+
+    def create_recipe(self, author, title, full_text, tags=()):
+        recipe = Recipe.objects.create(
+            author=author,
+            title=title,
+            slug=allocate_recipe_slug(title),
+            full_text=full_text,
+            cooking_time=10,
+        )
+        recipe.tag.set(tags)
+        return recipe
+
+    def test_index_on_create_and_delete(
+        self,
+        api_client,
+        new_author,
+        recipe_data,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        Recipes are indexed after creation by title, tags and ingredients
+        and removed from the index after deletion
+        """
+
+        api_client.force_authenticate(user=new_author)
+        with django_capture_on_commit_callbacks(execute=True):
+            slug = api_client.post("/api/v1/recipe/", recipe_data, format="json").data[
+                "slug"
+            ]
+
+        for query in ("вареные", "ВАРКА", "волда", "Яйц"):
+            response = api_client.get(f"/api/v1/search/?q={query}")
+            assert response.status_code == 200
+            assert [recipe["slug"] for recipe in response.data["results"]] == [slug]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"/api/v1/recipe/{slug}/")
+
+        response = api_client.get("/api/v1/search/?q=вареные")
+        assert response.data["count"] == 0
+
+    def test_ranking_and_pagination(self, api_client, new_author, settings):
+        """
+        Matches in title rank higher than matches in text,
+        all words of the query must match
+        """
+
+        in_text = self.create_recipe(new_author, "Ужин", "Борщ с пампушками")
+        in_title = self.create_recipe(new_author, "Борщ", "Свекла и капуста")
+        self.create_recipe(new_author, "Щи", "Капуста")
+        call_command("rebuild_search_index")
+
+        response = api_client.get("/api/v1/search/?q=борщ")
+        assert response.data["count"] == 2
+        assert [recipe["id"] for recipe in response.data["results"]] == [
+            in_title.id,
+            in_text.id,
+        ]
+        assert "activity_count" in response.data["results"][0]
+
+        response = api_client.get("/api/v1/search/?q=борщ капуста")
+        assert [recipe["id"] for recipe in response.data["results"]] == [in_title.id]
+
+    def test_empty_query(self, api_client):
+        """
+        Search without words returns 400
+        """
+
+        response = api_client.get("/api/v1/search/?q= ")
+
+        assert response.status_code == 400
+        assert response.data == EMPTY_SEARCH_QUERY
+
+    def test_database_backend(self, new_author):
+        """
+        Fallback backend finds recipes by tags and ranks title matches first
+        """
+
+        in_text = self.create_recipe(new_author, "Ужин", "Борщ на обед")
+        tagged = self.create_recipe(new_author, "Суп", "Свекла", tags=["Борщ"])
+        in_title = self.create_recipe(new_author, "Борщ", "Свекла")
+        results = SearchResults("Борщ", Recipe.objects.all(), DatabaseSearchBackend())
+
+        assert results.count() == 3
+        assert results[0:3][0] == in_title
+        assert set(results[0:3]) == {in_text, tagged, in_title}
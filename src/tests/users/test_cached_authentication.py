@@ -0,0 +1,84 @@
+import pytest
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.base.authentication import CachedJWTAuthentication
+
+BASE_URL = "http://127.0.0.1:8000/api/v1"
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """
+    Tests for the cached user lookup of JWT authentication
+    """
+
+    def test_user_is_cached(self, new_user, django_assert_num_queries):
+        """
+        The second lookup of the same user does not query the database
+        """
+
+        authentication = CachedJWTAuthentication()
+        token = AccessToken.for_user(new_user)
+
+        with django_assert_num_queries(1):
+            authentication.get_user(token)
+        with django_assert_num_queries(0):
+            user = authentication.get_user(token)
+
+        assert user == new_user
+
+    def test_process_local_cache(self, new_user, settings, django_assert_num_queries):
+        """
+        Users are not cached in a cache of a single process
+        """
+
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        authentication = CachedJWTAuthentication()
+        token = AccessToken.for_user(new_user)
+
+        authentication.get_user(token)
+        with django_assert_num_queries(1):
+            authentication.get_user(token)
+
+    def test_save_invalidates_user(self, new_user):
+        """
+        Ban, deactivation and password change reload the user
+        """
+
+        authentication = CachedJWTAuthentication()
+        token = AccessToken.for_user(new_user)
+        authentication.get_user(token)
+
+        new_user.is_banned = True
+        new_user.save()
+        assert authentication.get_user(token).is_banned
+
+        new_user.set_password("changed123")
+        new_user.save()
+        assert authentication.get_user(token).check_password("changed123")
+
+        new_user.is_active = False
+        new_user.save()
+        with pytest.raises(AuthenticationFailed):
+            authentication.get_user(token)
+
+    def test_requests_use_cached_user(
+        self, api_client, create_token, django_user_model
+    ):
+        """
+        Requests with the same token authenticate the cached user
+        """
+
+        api_client.credentials(HTTP_AUTHORIZATION=create_token)
+
+        assert api_client.get(f"{BASE_URL}/auth/users/me/").status_code == 200
+        response = api_client.get(f"{BASE_URL}/auth/users/me/")
+
+        assert response.status_code == 200
+        assert (
+            response.json()["id"]
+            == django_user_model.objects.get(email="test@ya.ru").id
+        )
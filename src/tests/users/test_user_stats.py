@@ -0,0 +1,158 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.follow.models import Follow
+from src.apps.users.models import UserStats
+from src.apps.users.services import find_inconsistent_user_stats, rebuild_user_stats
+from src.tests.factories.factories import RecipeFactory, UserFactory
+
+BASE_URL = "http://127.0.0.1:8000/api/v1"
+
+
+@pytest.mark.django_db
+class TestUserStats:
+    """
+    Tests for denormalized user counters and the users list ordering
+    [GET] http://127.0.0.1:8000/api/v1/users/
+    """
+
+    def get_stats(self, user):
+        return UserStats.objects.values_list(
+            "recipes_count", "followers_count", "following_count"
+        ).get(user=user)
+
+    def test_counters_follow_writes(self, new_user, new_author):
+        """
+        Counters are shifted by recipe and subscription writes
+        """
+
+        recipe = RecipeFactory(author=new_author)
+        follow = Follow.objects.create(user=new_user, author=new_author)
+
+        assert self.get_stats(new_author) == (1, 1, 0)
+        assert self.get_stats(new_user) == (0, 0, 1)
+
+        recipe.delete()
+        follow.delete()
+
+        assert self.get_stats(new_author) == (0, 0, 0)
+        assert self.get_stats(new_user) == (0, 0, 0)
+
+    def test_rebuild_user_stats(self, new_user, new_author):
+        """
+        Rebuild recounts counters and restores missing statistics
+        """
+
+        RecipeFactory.create_batch(2, author=new_author)
+        Follow.objects.create(user=new_user, author=new_author)
+        UserStats.objects.filter(user=new_author).delete()
+        UserStats.objects.filter(user=new_user).update(following_count=5)
+
+        assert rebuild_user_stats(chunk_size=1) == UserStats.objects.count()
+        assert self.get_stats(new_author) == (2, 1, 0)
+        assert self.get_stats(new_user) == (0, 0, 1)
+
+    def test_delete_user_with_recipes(self, new_user, new_author):
+        """
+        Deleting a user does not recreate the user's statistics
+        """
+
+        RecipeFactory(author=new_author)
+        Follow.objects.create(user=new_user, author=new_author)
+
+        new_author.delete()
+
+        assert not UserStats.objects.filter(user_id=new_author.id).exists()
+        assert self.get_stats(new_user) == (0, 0, 0)
+
+    def test_users_ordered_by_recipes_count(self, api_client, new_user):
+        """
+        Users with more recipes go first, cursor pages do not overlap
+        """
+
+        UserFactory.create_batch(settings.USER_LIST_PAGE_SIZE)
+        authors = UserFactory.create_batch(3)
+        for count, author in enumerate(authors, start=1):
+            RecipeFactory.create_batch(count, author=author)
+        api_client.force_authenticate(user=new_user)
+
+        response = api_client.get(f"{BASE_URL}/users/", {"page_size": 2})
+        assert [user["username"] for user in response.data["results"]] == [
+            authors[2].username,
+            authors[1].username,
+        ]
+        assert response.data["results"][0]["recipes_count"] == 3
+
+        usernames, pages = [], 0
+        url = f"{BASE_URL}/users/?pagination=cursor"
+        while url:
+            response = api_client.get(url)
+            usernames += [user["username"] for user in response.data["results"]]
+            url = response.data["next"]
+            pages += 1
+        assert pages == 2
+        assert usernames[:3] == [author.username for author in authors[::-1]]
+        assert sorted(usernames) == sorted(
+            UserStats.objects.values_list("user__username", flat=True)
+        )
+
+    def test_users_page_is_an_index_scan(self, api_client, new_user):
+        """
+        Users are read in the order of the UserStats index without sorting
+        """
+
+        api_client.force_authenticate(user=new_user)
+        with CaptureQueriesContext(connection) as context:
+            api_client.get(f"{BASE_URL}/users/?pagination=cursor")
+        sql = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "users_userstats" in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+
+        assert "users_userstats USING COVERING INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_check_user_stats(self, new_user, new_author):
+        """
+        Consistency checker finds drifted counters and --fix repairs them
+        """
+
+        Follow.objects.create(user=new_user, author=new_author)
+        assert find_inconsistent_user_stats() == []
+
+        UserStats.objects.filter(user=new_author).update(followers_count=7)
+        assert find_inconsistent_user_stats() == [new_author.id]
+
+        call_command("check_user_stats", "--fix", stdout=StringIO())
+        assert find_inconsistent_user_stats() == []
+        assert self.get_stats(new_author) == (0, 1, 0)
+
+    def test_subscribe_updates_counts(self, api_client, new_user, new_author):
+        """
+        Subscribing and unsubscribing shift the counts shown by the profile
+        and by the subscription lists
+        """
+
+        api_client.force_authenticate(user=new_user)
+        api_client.post(f"{BASE_URL}/subscribe/", {"author": new_author.username})
+
+        response = api_client.get(f"{BASE_URL}/user/{new_author.username}/")
+        assert response.data["followers_count"] == 1
+        assert response.data["following_count"] == 0
+
+        response = api_client.get(f"{BASE_URL}/user/{new_author.username}/subscribers/")
+        assert response.data["results"][0]["subscribers_count"] == 0
+        assert response.data["results"][0]["subscriptions_count"] == 1
+
+        api_client.delete(f"{BASE_URL}/unsubscribe/", {"author": new_author.username})
+        assert self.get_stats(new_author) == (0, 0, 0)
+        assert self.get_stats(new_user) == (0, 0, 0)
@@ -0,0 +1,61 @@
+import pytest
+
+from src.apps.users.models import CustomUser, UsernameSequence
+from src.tests.factories.factories import UserFactory
+
+
+@pytest.mark.django_db
+class TestUsernameAllocation:
+    """
+    Tests for allocating usernames of new users
+    """
+
+    def create_user(self, number):
+        return CustomUser.objects.create_user(
+            email=f"user{number}@ya.ru", password="changeme123"
+        )
+
+    def test_sequential_usernames(self):
+        """
+        Usernames are numbered by the sequence
+        """
+
+        assert [self.create_user(number).username for number in range(3)] == [
+            "user1",
+            "user2",
+            "user3",
+        ]
+        assert UsernameSequence.objects.get().last_value == 3
+
+    def test_seed_sequence_from_users(self):
+        """
+        A new sequence continues after the largest user id
+        """
+
+        users = UserFactory.create_batch(3)
+
+        assert self.create_user(0).username == f"user{users[-1].id + 1}"
+
+    def test_skip_taken_username(self, settings):
+        """
+        A taken username is skipped with one probe of a reserved batch
+        """
+
+        settings.USERNAME_PROBE_BATCH = 5
+        self.create_user(0)
+        UserFactory(username="user2")
+        UserFactory(username="user3")
+
+        assert self.create_user(1).username == "user4"
+        assert UsernameSequence.objects.get().last_value == 7
+
+    def test_allocation_queries(self, django_assert_max_num_queries):
+        """
+        Allocation does not depend on the number of users
+        """
+
+        self.create_user(0)
+        UserFactory.create_batch(10)
+
+        with django_assert_max_num_queries(5):
+            CustomUser.objects.allocate_username()
@@ -0,0 +1,141 @@
+import threading
+
+import pytest
+from django.db import DatabaseError
+
+from src.apps.recipes.models import RecipeStats
+from src.apps.view import recorder as recorder_module
+from src.apps.view.models import ViewRecipes
+from src.apps.view.recorder import BufferedViewRecorder
+
+
+@pytest.mark.django_db
+class TestBufferedViewRecorder:
+    """
+    Test write-behind recorder of recipe views
+    """
+
+    def test_flush_on_batch_size(self, new_recipe):
+        """
+        Views are written with one batch when the buffer is full
+        """
+
+        recorder = BufferedViewRecorder(batch_size=3, flush_interval=60)
+
+        assert recorder.record("user_1", new_recipe.id)
+        assert recorder.record("user_2", new_recipe.id)
+        assert ViewRecipes.objects.count() == 0
+
+        assert recorder.record("user_3", new_recipe.id)
+        assert ViewRecipes.objects.count() == 3
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 3
+
+    def test_flush_on_interval(self, new_recipe):
+        """
+        A record after flush_interval flushes the buffer
+        """
+
+        recorder = BufferedViewRecorder(batch_size=100, flush_interval=0)
+
+        recorder.record("user_1", new_recipe.id)
+        assert ViewRecipes.objects.count() == 1
+
+    def test_dedup_window(self, new_recipe):
+        """
+        Repeated views inside the window are ignored, after it are recorded
+        """
+
+        recorder = BufferedViewRecorder(batch_size=100, flush_interval=60)
+
+        assert recorder.record("user_1", new_recipe.id)
+        assert not recorder.record("user_1", new_recipe.id)
+        assert recorder.flush() == 1
+
+        recorder.dedup_window = 0
+        assert recorder.record("user_1", new_recipe.id)
+        assert recorder.flush() == 1
+        assert ViewRecipes.objects.count() == 2
+
+    def test_dedup_keys_are_bounded(self, new_recipe):
+        """
+        The oldest remembered viewers are evicted over max_keys
+        """
+
+        recorder = BufferedViewRecorder(batch_size=100, flush_interval=60, max_keys=2)
+
+        for viewer in ("user_1", "user_2", "user_3"):
+            recorder.record(viewer, new_recipe.id)
+
+        assert len(recorder._seen) == 2
+        assert recorder.record("user_1", new_recipe.id)
+        recorder.flush()
+
+    def test_flush_skips_deleted_recipes(self, new_recipe):
+        """
+        Views of recipes deleted before the flush are dropped
+        """
+
+        recorder = BufferedViewRecorder(batch_size=100, flush_interval=60)
+        recorder.record("user_1", new_recipe.id)
+        recorder.record("user_1", new_recipe.id + 1)
+
+        assert recorder.flush() == 1
+        assert recorder.flush() == 0
+
+    def test_flush_on_timer(self, new_recipe, monkeypatch):
+        """
+        Buffered views are flushed by the timer without further records
+        """
+
+        recorder = BufferedViewRecorder(batch_size=100, flush_interval=0.01)
+        flushed = threading.Event()
+        monkeypatch.setattr(recorder, "flush", flushed.set)
+
+        recorder._last_flush += 60
+        recorder.record("user_1", new_recipe.id)
+
+        assert flushed.wait(5)
+
+    def test_failed_flush_is_requeued(self, new_recipe, monkeypatch):
+        """
+        Views of a failed flush are buffered again up to max_pending
+        """
+
+        recorder = BufferedViewRecorder(
+            batch_size=100, flush_interval=60, max_pending=2
+        )
+        for viewer in ("user_1", "user_2", "user_3"):
+            recorder.record(viewer, new_recipe.id)
+
+        def fail(*args, **kwargs):
+            raise DatabaseError("disk I/O error")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(ViewRecipes.objects, "bulk_create", fail)
+            assert recorder.flush() == 0
+
+        assert [view.user for view in recorder._pending] == ["user_2", "user_3"]
+        assert recorder.flush() == 2
+        assert ViewRecipes.objects.count() == 2
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 2
+
+    def test_recipe_views_are_buffered(
+        self, api_client, new_recipe, new_user, settings, monkeypatch
+    ):
+        """
+        With VIEW_BUFFER_ENABLED recipe views go through the buffer
+        """
+
+        settings.VIEW_BUFFER_ENABLED = True
+        recorder = BufferedViewRecorder(batch_size=100, flush_interval=60)
+        monkeypatch.setattr(recorder_module, "view_recorder", recorder)
+        api_client.force_authenticate(user=new_user)
+
+        for _ in range(2):
+            response = api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+            assert response.status_code == 200
+        assert ViewRecipes.objects.count() == 0
+
+        assert recorder.flush() == 1
+        assert new_recipe.views.count() == 1
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 1